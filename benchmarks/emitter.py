@@ -0,0 +1,150 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Times the backend on a large generated program, with every statement the parser knows.
+The C++ is written to a string (translate_tree) and to a file (write_tree), the peak memory of each is measured too.
+
+    python benchmarks/emitter.py
+    python benchmarks/emitter.py --blocks 5000 --ir cfg
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from glwssa_compiler import ErrorStack, Lexer, ParserAST, TreeAnalyzer, TranspilerBackend_cpp
+from glwssa_compiler.log import set_global_tags
+
+
+BLOCK = """    Σ <- Σ + {n}
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΑΝ Ι MOD 2 = 0 ΤΟΤΕ
+            Π[Ι] <- Π[Ι] + Ι * {n}
+        ΑΛΛΙΩΣ_ΑΝ Ι > 5 ΤΟΤΕ
+            Π[Ι] <- Π[Ι] - 1
+        ΑΛΛΙΩΣ
+            Χ <- Χ + Ι / 2
+        ΤΕΛΟΣ_ΑΝ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΕΠΙΛΕΞΕ Σ MOD 4
+        ΠΕΡΙΠΤΩΣΗ 0, 1
+            Λ <- ΟΧΙ Λ
+        ΠΕΡΙΠΤΩΣΗ 2..3
+            Κ <- ΔΙΠΛΟ(Σ)
+        ΠΕΡΙΠΤΩΣΗ ΑΛΛΙΩΣ
+            ΚΑΛΕΣΕ ΑΥΞΗΣΕ(Σ)
+    ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ
+    ΟΣΟ Κ > {n} ΕΠΑΝΑΛΑΒΕ
+        Κ <- Κ DIV 2
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΡΧΗ_ΕΠΑΝΑΛΗΨΗΣ
+        Κ <- Κ + 3
+    ΜΕΧΡΙΣ_ΟΤΟΥ Κ >= {n}
+    ΓΡΑΨΕ "ΒΗΜΑ", {n}, Σ, Κ, Λ
+"""
+
+HEADER = """ΠΡΟΓΡΑΜΜΑ ΜΕΓΑΛΟ
+ΣΤΑΘΕΡΕΣ
+    Ν = 10
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Π[Ν]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ
+    ΛΟΓΙΚΕΣ: Λ
+ΑΡΧΗ
+    Σ <- 0
+    Κ <- 0
+    Χ <- 0
+    Λ <- ΑΛΗΘΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Π[Ι] <- 0
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+"""
+
+FOOTER = """ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΥΞΗΣΕ(Α)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    Α <- Α + 1
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΔΙΠΛΟ(Α): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    ΔΙΠΛΟ <- Α * 2
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+
+def generate(blocks: int) -> str:
+    return HEADER + "".join(BLOCK.format(n=n) for n in range(blocks)) + FOOTER
+
+
+def analyze(code: str):
+    error_stack = ErrorStack(code.splitlines())
+    lexer = Lexer(code, error_stack)
+    program, _ = ParserAST(lexer.tokenize_with_lines(), lexer.token_type, error_stack).parse()
+    analyzer = TreeAnalyzer(0)
+    analyzer.analyze_types_tree(program, error_stack)
+    if error_stack.errors_stack:
+        error_stack.print_errors()
+        raise SystemExit(1)
+    for name in ("symbols", "types", "calls", "ranges", "assignment", "cfg"):
+        analyzer.manager.get_analysis(name) # the backend only writes, the analyses are not timed
+    return program, analyzer.manager
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(prog="glwssa-emitter-benchmark")
+    arg_parser.add_argument("--blocks", type=int, default=2000, help="How many times the block of statements repeats")
+    arg_parser.add_argument("--ir", choices=("ast", "cfg"), default="ast")
+    args = arg_parser.parse_args()
+
+    set_global_tags(tags=[], exclude_tags=["all"])
+    code = generate(args.blocks)
+    program, manager = analyze(code)
+    print(f"{args.blocks} blocks, {len(code.splitlines())} lines of ΓΛΩΣΣΑ (ir={args.ir})")
+
+    seconds, peak = measure(lambda: TranspilerBackend_cpp().translate_tree(program, manager, args.ir))
+    print(f"  translate_tree (string): {seconds:7.3f}s  peak {peak / 2**20:7.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "output.cpp")
+        def write():
+            with open(path, "w") as file:
+                TranspilerBackend_cpp().write_tree(program, manager, file, args.ir)
+        seconds, peak = measure(write)
+        size = os.path.getsize(path)
+    print(f"  write_tree (file)      : {seconds:7.3f}s  peak {peak / 2**20:7.1f} MiB  ({size / 2**20:.1f} MiB of C++)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Transpiles a .glwssa program at every -O level, compiles it with g++ and times the executables.
+The output of every level must be the same, so this is also a differential test of the passes.
+
+    python benchmarks/run.py benchmarks/inlining.glwssa
+    python benchmarks/run.py benchmarks/inlining.glwssa -O 0 2 --repeat 5 --cxxflags="-O1"
+    python benchmarks/run.py benchmarks/bounds_checks.glwssa -O 2 --bounds-checks off on all
+    python benchmarks/run.py benchmarks/int_widths.glwssa -O 2 --ints wide narrow
+    python benchmarks/run.py benchmarks/zero_init.glwssa -O 2 --init zero assigned
+    python -c "print(500000); [print(i, i / 7) for i in range(500000)]" > io_input.txt
+    python benchmarks/run.py benchmarks/io.glwssa -O 2 --input io_input.txt
+"""
+
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from glwssa_compiler import ErrorStack, Lexer, ParserAST, TreeAnalyzer, TranspilerBackend_cpp
+from glwssa_compiler.log import set_global_tags
+
+
+def transpile(code: str, opt_level: int, bounds_checks: str = "on", ints: str = "narrow", init: str = "assigned") -> str:
+    error_stack = ErrorStack(code.splitlines())
+    lexer = Lexer(code, error_stack)
+    program, _ = ParserAST(lexer.tokenize_with_lines(), lexer.token_type, error_stack).parse()
+    analyzer = TreeAnalyzer(opt_level)
+    analyzer.analyze_types_tree(program, error_stack)
+    if error_stack.errors_stack:
+        error_stack.print_errors()
+        raise SystemExit(1)
+    return TranspilerBackend_cpp().translate_tree(program, analyzer.manager, bounds_checks=bounds_checks,
+                                                  narrow_ints=ints == "narrow", zero_init=init == "zero")
+
+
+def compile_cpp(cpp_code: str, directory: str, name: str, cxxflags: list) -> str:
+    source = os.path.join(directory, name + ".cpp")
+    executable = os.path.join(directory, name + ".out")
+    with open(source, "w") as file:
+        file.write(cpp_code)
+    subprocess.run(["g++", *cxxflags, source, "-o", executable], check=True)
+    return executable
+
+
+def time_run(executable: str, stdin: bytes, repeat: int):
+    best = None
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([executable], input=stdin, capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = result.stdout
+    return best, output
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(prog="glwssa-benchmark")
+    arg_parser.add_argument("programs", nargs="+")
+    arg_parser.add_argument("-O", dest="levels", type=int, nargs="+", default=[0, 1, 2])
+    arg_parser.add_argument("--repeat", type=int, default=3, help="The best time of this many runs is kept")
+    arg_parser.add_argument("--input", help="A file that is given to the programs as their input")
+    arg_parser.add_argument("--cxxflags", default="", help="The flags g++ gets, main.py gives none")
+    arg_parser.add_argument("--bounds-checks", nargs="+", default=["on"], choices=("on", "all", "off"),
+        help="Every level is timed with each of these modes of the index checks")
+    arg_parser.add_argument("--ints", nargs="+", default=["narrow"], choices=("narrow", "wide"),
+        help="The arrays of ΑΚΕΡΑΙΕΣ get the narrowest type their values fit in, or int64_t")
+    arg_parser.add_argument("--init", nargs="+", default=["assigned"], choices=("assigned", "zero"),
+        help="Sets to 0 only the variables/arrays that can be read before they are written, or all of them")
+    args = arg_parser.parse_args()
+
+    set_global_tags(tags=[], exclude_tags=["all"])
+    stdin = open(args.input, "rb").read() if args.input else b""
+    cxxflags = args.cxxflags.split()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for path in args.programs:
+            code = open(path, encoding="utf-8").read()
+            name = os.path.splitext(os.path.basename(path))[0]
+            print(f"{name}  (g++ {' '.join(cxxflags) or 'without flags'})")
+
+            baseline = None
+            expected = None
+            for level in args.levels:
+                for bounds_checks, ints, init in itertools.product(args.bounds_checks, args.ints, args.init):
+                    start = time.perf_counter()
+                    cpp_code = transpile(code, level, bounds_checks, ints, init)
+                    transpile_time = time.perf_counter() - start
+
+                    executable = compile_cpp(cpp_code, directory, f"{name}_O{level}_{bounds_checks}_{ints}_{init}", cxxflags)
+                    seconds, output = time_run(executable, stdin, args.repeat)
+
+                    if expected is None:
+                        expected, baseline = output, seconds
+                    same = output == expected
+                    failed |= not same
+                    checks = f" checks {bounds_checks:3}" if len(args.bounds_checks) > 1 else ""
+                    checks += f" ints {ints:6}" if len(args.ints) > 1 else ""
+                    checks += f" init {init:8}" if len(args.init) > 1 else ""
+                    print(f"  -O{level}{checks}: run {seconds:8.3f}s  x{baseline / seconds:5.2f}  "
+                          f"transpile {transpile_time * 1000:7.1f}ms  {'' if same else 'DIFFERENT OUTPUT'}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import subprocess
+import argparse
 import os
 
 import traceback
@@ -21,9 +22,66 @@ from src.glwssa_compiler.lexer import Lexer
 from src.glwssa_compiler.parser_ast import ParserAST
 from src.glwssa_compiler.analyzer import TreeAnalyzer
 from src.glwssa_compiler.backend import TranspilerBackend_cpp
+from src.glwssa_compiler.runtime import default_cache_dir, precompiled_header
+from src.glwssa_compiler.build_cache import BuildCache, build_key, DEFAULT_MAX_BYTES
+from src.glwssa_compiler.units import write_units, compile_units
+from src.glwssa_compiler.toolchain import compile_piped, probe_toolchain, profile_flags, COMPILERS, PROFILES, DEFAULT_PROFILE, INLINING_PROFILES
 from src.glwssa_compiler.log import set_global_tags, log, flush_log_file
 
 
+# the -c values of STANDARD.md
+PROFILE_ALIASES = {"-o": "release", "-O": "release"}
+
+
+def profile_name(text: str) -> str:
+    return PROFILE_ALIASES.get(text, text)
+
+
+def parse_arguments() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(prog="glwssa-transpiler")
+    arg_parser.add_argument("file", nargs="?", default="file.glwssa")
+    arg_parser.add_argument("-O", dest="opt_level", type=int, choices=(0, 1, 2), default=0,
+        help="Optimization level, selects the passes that run on the tree")
+    arg_parser.add_argument("-o", dest="opt_level", action="store_const", const=2,
+        help="The same as -O 2")
+    arg_parser.add_argument("-c", "--profile", type=profile_name, choices=list(PROFILES), default=DEFAULT_PROFILE,
+        help="The flags of the C++ compiler: fast-compile (the quickest compilation, for grading), debug, release, "
+             "release-native (the fastest program, for this machine only). -c=\"-o\" is release")
+    arg_parser.add_argument("-n", "--name", metavar="NAME",
+        help="The name of the executable, by default the name of the ΠΡΟΓΡΑΜΜΑ")
+    arg_parser.add_argument("--compiler", metavar="COMPILER",
+        help="The C++ compiler, by default the first of g++ and clang++ that is installed")
+    arg_parser.add_argument("--time-passes", action="store_true",
+        help="Prints the time each analysis/optimization pass took")
+    arg_parser.add_argument("--ir", choices=("ast", "cfg"), default="ast",
+        help="Writes the C++ code from the program tree (ast) or from the control flow graphs (cfg)")
+    arg_parser.add_argument("--bounds-checks", choices=("on", "all", "off"), default="on",
+        help="Checks the indexes of the arrays, except the ones proven to be in bounds (on), all of them or none")
+    arg_parser.add_argument("--wide-ints", action="store_true",
+        help="Declares every array of ΑΚΕΡΑΙΕΣ with int64_t, not with the narrowest type its values fit in")
+    arg_parser.add_argument("--zero-init", action="store_true",
+        help="Sets every variable/array to 0, also the ones that are written before they are read")
+    arg_parser.add_argument("--cache", nargs="?", const=default_cache_dir(), metavar="CACHE_DIR",
+        help="Keeps the executables in a cache directory (by default the glwssa-compiler folder of the user's cache), "
+             "g++ does not run again for the same C++ code and flags")
+    arg_parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar="MiB",
+        help="The size of the executables the cache keeps, the least recently used are removed first")
+    arg_parser.add_argument("--cache-stats", action="store_true",
+        help="Prints the hits/misses of the cache")
+    arg_parser.add_argument("--pipe", action="store_true",
+        help="Gives the C++ code to g++ through a pipe while it is written, without output.cpp. The executable is "
+             "made under a unique name and renamed, runs in the same directory do not overwrite each other's files")
+    arg_parser.add_argument("--units", nargs="?", const="output_units", metavar="DIRECTORY",
+        help="Writes a .cpp for the main program and for every subprogram in the directory (output_units by default), "
+             "their object files are kept in the cache and only the units that changed are compiled again")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=None,
+        help="How many units are compiled at the same time, by default the number of CPUs")
+    arg_parser.add_argument("--pch", nargs="?", const=default_cache_dir(), metavar="CACHE_DIR",
+        help="Includes glwssa_runtime.hpp instead of pasting it, precompiled once in the cache directory "
+             "(by default the glwssa-compiler folder of the user's cache)")
+    return arg_parser.parse_args()
+
+
 def main():
     # pytest - logging the test start to finish, for pytest debugging
     # e - error
@@ -45,6 +103,24 @@ def main():
     # nodes - prints all the nodes of the AST tree
     # pcp - parse call procedure
     # pep - parse end program method logging
+    # pm - pass manager of the TreeAnalyzer
+    # cf - constant folding
+    # dce - dead code elimination
+    # cg - call graph
+    # be - the C++ backend
+    # inl - inlining
+    # licm - loop invariant code motion
+    # sr - strength reduction
+    # cse - common subexpression elimination
+    # cfg - control flow graph
+    # rng - range analysis of the indexes
+    # da - definite assignment
+    # lix - loop interchange
+    # rt - runtime header and its precompiled header
+    # swc - ΑΝ chains that become ΕΠΙΛΕΞΕ
+    # bc - build cache of the executables
+    # tu - translation units of the subprograms
+    # tc - the toolchain that compiles the C++ code
     flush_log_file()
     # set_global_tags(tags=["e"])
     set_global_tags(tags=["all"], exclude_tags=["mtok"])
@@ -52,12 +128,14 @@ def main():
 
     log("From main func (main.py): main function started.", tags=["v"])
 
+    args = parse_arguments()
+
     code: str = ""
     list_code: list[str] = []
 
     compile_command: list[str] = []
 
-    with open("file.glwssa") as program:
+    with open(args.file) as program:
         code = program.read()
         list_code = code.splitlines()
 
@@ -81,18 +159,12 @@ def main():
     for node in program_ast.body:
         log(node, tags=['nodes'])
 
-    analyzer = TreeAnalyzer()
+    analyzer = TreeAnalyzer(args.opt_level, args.time_passes, args.profile in INLINING_PROFILES)
     log("From main func (main.py): Starting analyzing of the tree", tags=["v"])
     analyzer.analyze_types_tree(program_ast, error_stack)
     log("From main func (main.py): Program tree analyzer is ", tags=["v"])
 
 
-    backend = TranspilerBackend_cpp()
-    log("From main func (main.py): The backend has been succesfully initialized", tags=["v"])
-    cpp_code = backend.translate_tree(program_ast)
-    log("From main func (main.py): Code has been succesfully parsed", tags=["v"])
-
-
     if error_stack.errors_stack:
         log("From main func (main.py): Errors were caught", tags=["v"])
         error_stack.print_errors()
@@ -104,35 +176,113 @@ def main():
     error_stack.print_notes()
 
 
-    with open("output.cpp", "w") as output_file:
-        output_file.write(cpp_code)
-
-
-    log("From main func (main.py): The cpp code output has been transferred into the output.cpp file", tags=["v"])
-
     # Detect the operating system
     is_windows = os.name == "nt"
-
     log("From main func (main.py): Detected OS is:", "Windows" if is_windows else "Linux", tags=["v"])
 
+    # the compiler and the flags it has are probed once, then read from the cache directory
+    try:
+        toolchain = probe_toolchain(args.cache or default_cache_dir(), [args.compiler] if args.compiler else COMPILERS)
+    except FileNotFoundError as e:
+        log("From main func (main.py): No compiler was found, see error:\n", e, tags=["v", "tc"])
+        print(f"Compilation failed: {e}")
+        return
+    compiler = toolchain.compiler
+    flags: list[str] = profile_flags(toolchain, args.profile, args.units is not None)
+    log("From main func (main.py): Compiling with", compiler, toolchain.version, "and the flags", flags, tags=["v", "tc"])
+
+    # the runtime is included from the cache, where g++ also finds its .gch (made with the same flags)
+    runtime = "inline"
+    if args.pch is not None:
+        try:
+            flags += ["-I", precompiled_header(args.pch, compiler, flags), "-Winvalid-pch"]
+            runtime = "include"
+        except (OSError, subprocess.CalledProcessError) as e:
+            log("From main func (main.py): Could not precompile the runtime header, see error:\n", e, tags=["v", "rt"])
+            print(f"Precompiling the runtime header failed, it is pasted in output.cpp: {e}")
+
     # Set the compile command based on the OS
+    name = args.name or program_name
     if is_windows: # https://github.com/niXman/mingw-builds-binaries?tab=readme-ov-file
-        compile_command = ["/mingw64/bin/g++.exe", "output.cpp", "-o", f"{program_name}.exe"]
+        executable = f"{name}.exe"
     else:
-        compile_command = ["g++", "output.cpp", "-o", f"{program_name}.out"]
+        executable = f"{name}.out"
+
+    backend = TranspilerBackend_cpp()
+    log("From main func (main.py): The backend has been succesfully initialized", tags=["v"])
+
+    # a translation unit for every subprogram, only the ones that changed are compiled again
+    if args.units is not None:
+        units = backend.translate_units(program_ast, analyzer.manager, args.ir, args.bounds_checks, not args.wide_ints,
+                                        args.zero_init, runtime)
+        write_units(units, args.units)
+        cache = BuildCache(args.cache or default_cache_dir(), args.cache_size * 1024 * 1024)
+        sources = [name for name in units if name.endswith(".cpp")]
+        try:
+            compiled = compile_units(units, args.units, executable, cache, compiler, flags, args.jobs)
+            log("From main func (main.py): Compiled the units", compiled, "into", executable, tags=["v", "tu"])
+            print(f"Compilation successful ({len(compiled)} of {len(sources)} units compiled). Executable created: ./{executable}")
+        except subprocess.CalledProcessError as e:
+            log("From main func (main.py): Failed to compile the units because, see error:\n", e, tags=["v", "tu"])
+            print(f"Compilation failed: {e}")
+        if args.cache_stats:
+            print(cache.report())
+        return
 
-    log("From main func (main.py): Running this command:", compile_command, tags=["v"])
+    def write_code(stream) -> None:
+        backend.write_tree(program_ast, analyzer.manager, stream, args.ir, args.bounds_checks, not args.wide_ints,
+                           args.zero_init, runtime)
 
+    # with --pipe there is no output.cpp, the code goes to g++ as it is written (or after it is hashed for the cache)
+    cpp_code = None
+    if args.pipe:
+        if args.cache is not None:
+            cpp_code = backend.translate_tree(program_ast, analyzer.manager, args.ir, args.bounds_checks,
+                                              not args.wide_ints, args.zero_init, runtime)
+    else:
+        with open("output.cpp", "w") as output_file:
+            write_code(output_file)
+        log("From main func (main.py): The cpp code has been written into the output.cpp file", tags=["v"])
+    compile_command = [compiler, "output.cpp", "-o", executable, *flags]
+
+    # the same code with the same compiler and flags gives the same executable, it is taken from the cache
+    cache = None
+    if args.cache is not None:
+        cache = BuildCache(args.cache, args.cache_size * 1024 * 1024)
+        if cpp_code is None:
+            with open("output.cpp", encoding="utf-8") as output_file:
+                cpp_code = output_file.read()
+        key = build_key(cpp_code, compiler, flags)
+        if cache.fetch(key, executable):
+            log("From main func (main.py): The executable was in the cache, named:", executable, tags=["v", "bc"])
+            print(f"Compilation skipped, the executable was in the cache: ./{executable}")
+            if args.cache_stats:
+                print(cache.report())
+            return
 
     # Compile the generated C++ file
     try:
-        subprocess.run(compile_command, check=True)
-        executable = f"{program_name}.exe" if is_windows else f"{program_name}.out"
+        if args.pipe:
+            log("From main func (main.py): Piping the cpp code to", compiler, tags=["v"])
+            compile_piped(write_code if cpp_code is None else lambda stream: stream.write(cpp_code),
+                          executable, compiler, flags)
+        else:
+            log("From main func (main.py): Running this command:", compile_command, tags=["v"])
+            subprocess.run(compile_command, check=True)
         log("From main func (main.py): The cpp code has been succesfully compiled into an executable, named:", executable, tags=["v"])
         print(f"Compilation successful. Executable created: ./{executable}")
     except subprocess.CalledProcessError as e:
         log("From main func (main.py): Failed to compile because, see error:\n", e, tags=["v"])
         print(f"Compilation failed: {e}")
+        return
+
+    if cache is not None:
+        try:
+            cache.store(key, executable)
+        except OSError as e:
+            log("From main func (main.py): Could not store the executable in the cache, see error:\n", e, tags=["v", "bc"])
+        if args.cache_stats:
+            print(cache.report())
 
 
 if __name__ == "__main__":
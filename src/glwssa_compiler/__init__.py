@@ -3,6 +3,28 @@ from .data import Token, Scope, ScopeNotClosed
 from .parser_ast import ScopeStack, ParserAST
 from .error import ErrorStack
 from .lexer import Lexer
+from .analyzer import TreeAnalyzer, PassManager, AnalysisPass, TransformPass, ALL_ANALYSES
+from .ast_nodes import Program
+from .symbol_table import SymbolTable, build_symbol_table
+from .type_inference import TypeTable, infer_types
+from .constant_folding import fold_constants
+from .dead_code import eliminate_dead_code
+from .call_graph import CallGraph, build_call_graph
+from .licm import move_loop_invariants
+from .interchange import interchange_loops
+from .strength_reduction import reduce_strength
+from .cse import eliminate_common_subexpressions
+from .switch_conversion import convert_if_chains
+from .ranges import RangeTable, analyze_ranges
+from .definite_assignment import AssignmentTable, analyze_definite_assignment
+from .cfg import ControlFlowGraph, build_cfgs, immediate_dominators, dominates, liveness, format_cfg
+from .dispatch import Dispatch, plan_dispatch
+from .code_writer import CodeWriter
+from .runtime import RUNTIME_VERSION, runtime_code, precompiled_header
+from .build_cache import BuildCache, build_key
+from .units import write_units, compile_units
+from .toolchain import compile_piped, Toolchain, probe_toolchain, profile_flags, PROFILES
+from .backend import TranspilerBackend_cpp
 
 from .log import log, flush_log_file, Info, update_path
 
@@ -11,6 +33,22 @@ __all__ = [
     "ScopeStack", "ParserAST",
     "ErrorStack",
     "Lexer",
+    "TreeAnalyzer", "PassManager", "AnalysisPass", "TransformPass", "ALL_ANALYSES",
+    "Program",
+    "SymbolTable", "build_symbol_table",
+    "TypeTable", "infer_types",
+    "fold_constants", "eliminate_dead_code",
+    "CallGraph", "build_call_graph",
+    "move_loop_invariants", "interchange_loops", "reduce_strength", "eliminate_common_subexpressions",
+    "convert_if_chains",
+    "RangeTable", "analyze_ranges",
+    "AssignmentTable", "analyze_definite_assignment",
+    "ControlFlowGraph", "build_cfgs", "immediate_dominators", "dominates", "liveness", "format_cfg",
+    "Dispatch", "plan_dispatch",
+    "CodeWriter", "TranspilerBackend_cpp",
+    "RUNTIME_VERSION", "runtime_code", "precompiled_header",
+    "BuildCache", "build_key", "write_units", "compile_units", "compile_piped",
+    "Toolchain", "probe_toolchain", "profile_flags", "PROFILES",
     
     "log", "flush_log_file", "Info", "update_path"
 ]
\ No newline at end of file
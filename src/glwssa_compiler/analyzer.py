@@ -11,9 +11,404 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import time
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
 from .error import ErrorStack
+from .log import log
+from .symbol_table import build_symbol_table
+from .type_inference import infer_types
+from .constant_folding import fold_constants
+from .dead_code import eliminate_dead_code
+from .call_graph import build_call_graph, remove_unused_subprograms
+from .inlining import inline_calls
+from .licm import move_loop_invariants
+from .interchange import interchange_loops
+from .strength_reduction import reduce_strength
+from .cse import eliminate_common_subexpressions
+from .switch_conversion import convert_if_chains
+from .cfg import build_cfgs
+from .ranges import analyze_ranges
+from .definite_assignment import analyze_definite_assignment
+
+from typing import Any as _Any
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+from typing import Tuple as _Tuple
+
+
+# Used in TransformPass.invalidates, drops every cached analysis.
+ALL_ANALYSES = "*"
+
+
+@dataclass
+class PassTiming:
+    name: str
+    kind: str # "analysis" or "transform"
+    seconds: float
+    changed: bool = False
+
+
+class AnalysisPass(ABC):
+    """
+    An analysis only reads the tree and returns a result (a symbol table, a type table etc).
+
+    The PassManager caches the result under `name`, until a transform pass invalidates it.
+    An analysis can ask the manager for other analyses, the manager remembers that dependency
+    so when the other analysis is invalidated, this one is invalidated too.
+    """
+    name: str = ""
+
+    @abstractmethod
+    def run(self, program, manager: "PassManager") -> _Any: ...
+
+
+class TransformPass(ABC):
+    """
+    A transform pass changes the tree (optimizations, lowering etc).
+
+    requires: names of the analyses that must be computed before the pass runs.
+    invalidates: names of the analyses that are dropped when the pass changed the tree.
+        ALL_ANALYSES drops all of them.
+
+    run() returns True if it changed the tree. If it did not change anything, nothing is invalidated.
+    """
+    name: str = ""
+    requires: _Tuple[str, ...] = ()
+    invalidates: _Tuple[str, ...] = (ALL_ANALYSES,)
+
+    @abstractmethod
+    def run(self, program, manager: "PassManager") -> bool: ...
+
+
+class PassManager:
+    def __init__(self, error_stack: ErrorStack, passes: _Tuple[TransformPass, ...] = ()) -> None:
+        self.error_stack = error_stack
+        self.program = None
+
+        self.passes: _List[TransformPass] = list(passes)
+        self.analyses: _Dict[str, AnalysisPass] = {}
+
+        self.cache: _Dict[str, _Any] = {}
+        # analysis name -> the analyses that were computed using it
+        self.dependents: _Dict[str, _Set[str]] = {}
+        self.timings: _List[PassTiming] = []
+
+        self._computing: _List[str] = []
+
+        for analysis in DEFAULT_ANALYSES:
+            self.register_analysis(analysis())
+
+
+    def register_analysis(self, analysis: AnalysisPass) -> None:
+        self.analyses[analysis.name] = analysis
+        self.invalidate((analysis.name,))
+
+
+    def add_pass(self, transform: TransformPass) -> None:
+        self.passes.append(transform)
+
+
+    def get_analysis(self, name: str) -> _Any:
+        """
+        Returns the cached result of the analysis, or computes it (and times it) if it is not cached.
+        """
+        if self._computing:
+            self.dependents.setdefault(name, set()).add(self._computing[-1])
+
+        if name in self.cache:
+            return self.cache[name]
+
+        if name in self._computing:
+            raise RuntimeError(f"Analysis '{name}' depends on itself: {self._computing}")
+
+        analysis = self.analyses[name]
+
+        log(f"From get_analysis (analyzer.py): Computing analysis '{name}'", tags=["pm"])
+        self._computing.append(name)
+        start = time.perf_counter()
+        try:
+            result = analysis.run(self.program, self)
+        finally:
+            self._computing.pop()
+        self.timings.append(PassTiming(name, "analysis", time.perf_counter() - start))
+
+        self.cache[name] = result
+        return result
+
+
+    def invalidate(self, names: _Tuple[str, ...]) -> None:
+        """
+        Drops the analyses from the cache, and every analysis that was computed using them.
+        """
+        if ALL_ANALYSES in names:
+            self.cache.clear()
+            self.dependents.clear()
+            return
+
+        worklist = list(names)
+        while worklist:
+            name = worklist.pop()
+            if name in self.cache:
+                del self.cache[name]
+                log(f"From invalidate (analyzer.py): Invalidated analysis '{name}'", tags=["pm"])
+            worklist.extend(self.dependents.pop(name, ()))
+
+
+    def run(self, program) -> None:
+        """
+        Runs the passes in order. It stops after the first pass that leaves errors on the error stack, the program
+        is not translated, and an analysis computed again by a later pass would push the same errors again.
+        """
+        self.program = program
+        self.invalidate((ALL_ANALYSES,))
+
+        for transform in self.passes:
+            for name in transform.requires:
+                self.get_analysis(name)
+
+            log(f"From run (analyzer.py): Running pass '{transform.name}'", tags=["pm"])
+            start = time.perf_counter()
+            changed = bool(transform.run(program, self))
+            self.timings.append(PassTiming(transform.name, "transform", time.perf_counter() - start, changed))
+
+            if changed:
+                self.invalidate(transform.invalidates)
+
+            if self.error_stack.errors_stack:
+                log(f"From run (analyzer.py): Errors after pass '{transform.name}', the rest do not run", tags=["pm"])
+                return
+
+
+    def report(self) -> str:
+        """
+        A table with the time each pass took, in the order they ran.
+        """
+        total = sum(t.seconds for t in self.timings)
+        lines = [f"{'Pass':<32}{'Kind':<12}{'Time (ms)':>12}{'%':>8}"]
+        for t in self.timings:
+            percent = 100 * t.seconds / total if total else 0.0
+            name = t.name + (" *" if t.changed else "")
+            lines.append(f"{name:<32}{t.kind:<12}{t.seconds * 1000:>12.3f}{percent:>8.1f}")
+        lines.append(f"{'Total':<44}{total * 1000:>12.3f}")
+        return "\n".join(lines)
+
+
+# Passes ____________________________________________________________________________________________
+
+class SymbolTableAnalysis(AnalysisPass):
+    name = "symbols"
+
+    def run(self, program, manager: PassManager):
+        return build_symbol_table(program, manager.error_stack)
+
+
+class TypeAnalysis(AnalysisPass):
+    name = "types"
+
+    def run(self, program, manager: PassManager):
+        return infer_types(program, manager.get_analysis("symbols"), manager.error_stack)
+
+
+class CallGraphAnalysis(AnalysisPass):
+    name = "calls"
+
+    def run(self, program, manager: PassManager):
+        return build_call_graph(program, manager.get_analysis("symbols"))
+
+
+class ValueRangeAnalysis(AnalysisPass):
+    """
+    The indexes of the arrays that are proven to be in bounds, the backend does not check them.
+    """
+    name = "ranges"
+
+    def run(self, program, manager: PassManager):
+        return analyze_ranges(program, manager.get_analysis("symbols"))
+
+
+class DefiniteAssignmentAnalysis(AnalysisPass):
+    """
+    The variables/arrays that are written before they are read, the backend does not set them to 0.
+    """
+    name = "assignment"
+
+    def run(self, program, manager: PassManager):
+        return analyze_definite_assignment(program, manager.get_analysis("symbols"))
+
+
+class CFGAnalysis(AnalysisPass):
+    """
+    The control flow graphs of the program and the subprograms, after the passes. Only the backend asks for it.
+    """
+    name = "cfg"
+
+    def run(self, program, manager: PassManager):
+        return build_cfgs(program, manager.get_analysis("symbols"), manager.get_analysis("types"),
+                          manager.get_analysis("ranges"))
+
+
+class CheckPass(TransformPass):
+    """
+    Runs the analyses that report errors, it does not change the tree. It is the first pass of every level,
+    if it finds errors no other pass runs.
+    The warnings of the definite assignment are pushed here, on the code as it was written.
+    """
+    name = "check"
+    requires = ("symbols", "types", "assignment")
+
+    def run(self, program, manager: PassManager) -> bool:
+        for warning in manager.get_analysis("assignment").warnings:
+            manager.error_stack.push_warning(warning)
+        return False
+
+
+class ConstantFoldingPass(TransformPass):
+    """
+    Folds the literal expressions and puts the values of the ΣΤΑΘΕΡΕΣ where they are used.
+    It runs after the check, so the errors are reported on the code as it was written.
+    """
+    name = "constant-folding"
+    requires = ("symbols",)
+    invalidates = ("types",) # the symbol ids on the nodes are still right
+
+    def run(self, program, manager: PassManager) -> bool:
+        return fold_constants(program, manager.get_analysis("symbols"))
+
+
+class StrengthReductionPass(TransformPass):
+    """
+    Replaces ^, / and * by literals with cheaper operators that give the same value (Χ^2 -> Χ*Χ).
+    It runs after the folding, so the ΣΤΑΘΕΡΕΣ are literals already.
+    """
+    name = "strength-reduction"
+    requires = ("types",)
+    invalidates = ("types",)
+
+    def run(self, program, manager: PassManager) -> bool:
+        return reduce_strength(program, manager.get_analysis("types"))
+
+
+class DeadCodePass(TransformPass):
+    """
+    Removes the branches and loops that can never run and the assignments that are never read.
+    """
+    name = "dead-code"
+    requires = ("symbols", "calls")
+    invalidates = ("types", "calls") # the calls in the removed code are gone
+
+    def run(self, program, manager: PassManager) -> bool:
+        return eliminate_dead_code(program, manager.get_analysis("symbols"), manager.get_analysis("calls"))
+
+
+class SwitchConversionPass(TransformPass):
+    """
+    Rewrites the ΑΝ/ΑΛΛΙΩΣ_ΑΝ chains that compare one ΑΚΕΡΑΙΑ with constants into an ΕΠΙΛΕΞΕ.
+    It runs after the folding and the dead code pass, so the ΣΤΑΘΕΡΕΣ are literals and the dead branches are gone.
+    """
+    name = "switch-conversion"
+    requires = ("symbols", "types")
+    invalidates = ("types",)
+
+    def run(self, program, manager: PassManager) -> bool:
+        return convert_if_chains(program, manager.get_analysis("symbols"), manager.get_analysis("types"))
+
+
+class UnusedSubprogramsPass(TransformPass):
+    """
+    Removes the ΔΙΑΔΙΚΑΣΙΕΣ/ΣΥΝΑΡΤΗΣΕΙΣ the program can not reach. It runs after the dead code pass,
+    so the calls inside removed branches do not keep a subprogram alive.
+    """
+    name = "unused-subprograms"
+    requires = ("calls",)
+
+    def run(self, program, manager: PassManager) -> bool:
+        return remove_unused_subprograms(program, manager.get_analysis("calls"))
+
+
+class InliningPass(TransformPass):
+    """
+    Puts the body of the small, non recursive ΣΥΝΑΡΤΗΣΕΙΣ/ΔΙΑΔΙΚΑΣΙΕΣ where they are called.
+    The locals are renamed, so every analysis is invalidated.
+    """
+    name = "inlining"
+    requires = ("symbols", "calls", "assignment")
+
+    def run(self, program, manager: PassManager) -> bool:
+        return inline_calls(program, manager.get_analysis("symbols"), manager.get_analysis("calls"),
+                            assignment=manager.get_analysis("assignment"))
+
+
+class LoopInterchangePass(TransformPass):
+    """
+    Swaps the nested ΓΙΑ that walk the arrays column by column, so the inner loop walks a row.
+    It runs before the LICM, the swapped inner loop has other invariant expressions.
+    """
+    name = "loop-interchange"
+    requires = ("symbols", "types", "ranges")
+    invalidates = ("ranges",) # the nodes are the same, only the headers of the loops moved
+
+    def run(self, program, manager: PassManager) -> bool:
+        return interchange_loops(program, manager.get_analysis("symbols"), manager.get_analysis("types"),
+                                 manager.get_analysis("ranges"))
+
+
+class LICMPass(TransformPass):
+    """
+    Moves the invariant expressions of the loops (and the ΜΕΧΡΙ/ΜΕ_ΒΗΜΑ of ΓΙΑ) into temporaries before the loop.
+    It runs after the inlining, the inlined bodies have the most invariant work.
+    """
+    name = "licm"
+    requires = ("symbols", "types")
+
+    def run(self, program, manager: PassManager) -> bool:
+        return move_loop_invariants(program, manager.get_analysis("symbols"), manager.get_analysis("types"))
+
+
+class CSEPass(TransformPass):
+    """
+    Computes the expressions that repeat inside a basic block once, into temporaries.
+    It runs after the LICM, so what is left in the loops is what changes in every repetition.
+    """
+    name = "cse"
+    requires = ("symbols", "types", "calls")
+
+    def run(self, program, manager: PassManager) -> bool:
+        return eliminate_common_subexpressions(program, manager.get_analysis("symbols"), manager.get_analysis("types"),
+                                               manager.get_analysis("calls"))
+
+
+DEFAULT_ANALYSES: _Tuple[type, ...] = (
+    SymbolTableAnalysis,
+    TypeAnalysis,
+    CallGraphAnalysis,
+    ValueRangeAnalysis,
+    DefiniteAssignmentAnalysis,
+    CFGAnalysis,
+)
+
+# -O level -> the passes that run, in order
+PIPELINES: _Dict[int, _Tuple[type, ...]] = {
+    0: (CheckPass,),
+    1: (CheckPass, ConstantFoldingPass, StrengthReductionPass, DeadCodePass, SwitchConversionPass, UnusedSubprogramsPass),
+    2: (CheckPass, ConstantFoldingPass, DeadCodePass, UnusedSubprogramsPass,
+        InliningPass, ConstantFoldingPass, StrengthReductionPass, DeadCodePass, SwitchConversionPass,
+        UnusedSubprogramsPass, LoopInterchangePass, LICMPass, CSEPass),
+}
+
 
 class TreeAnalyzer:
+    def __init__(self, opt_level: int = 0, time_passes: bool = False, inline: bool = True) -> None:
+        self.opt_level = opt_level
+        self.time_passes = time_passes
+        self.inline = inline # False when the C++ compiler inlines the calls itself (the release profiles)
+        self.manager: _Optional[PassManager] = None
+
+
     def analyze_types_tree(self, ast, error_stack: ErrorStack) -> None:
         """
         Analyzes everything in the program tree. If there are any errors it pushes them to the error stack.
@@ -24,8 +419,18 @@ class TreeAnalyzer:
         checks conditions and if they are boolean
         checks the right functions/procedures have the right amount of arguments.
 
+        Then runs the optimization passes of the -O level.
+
         :param ast: Should be the tree produced by the ParserAST
         """
 
         self.ast = ast
-        self.error_stack = error_stack
\ No newline at end of file
+        self.error_stack = error_stack
+
+        passes = tuple(p() for p in PIPELINES[self.opt_level] if self.inline or p is not InliningPass)
+        self.manager = PassManager(error_stack, passes)
+        self.manager.run(ast)
+
+        log(f"From analyze_types_tree (analyzer.py): Pass timings\n{self.manager.report()}", tags=["pm"])
+        if self.time_passes:
+            print(self.manager.report())
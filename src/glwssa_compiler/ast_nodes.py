@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 
 from typing import Optional as _Optional
 from typing import Union as _Union
 from typing import List as _List
+from typing import Callable as _Callable
 
 from .data import Token
 
@@ -23,7 +24,13 @@ class Expression(Node):
 
 @dataclass
 class Program:
+    """
+    The main program, the procedures and the functions are kept here (in the order they were parsed),
+    so every pass can reach the whole program from one node.
+    """
     body: list[Statement]
+    procedures: list["Procedure"] = field(default_factory=list)
+    functions: list["Function"] = field(default_factory=list)
 
 
 @dataclass
@@ -75,10 +82,12 @@ class Variable(Expression):
     The variable dataclass can store single values variables, arrays and whatever else.
 
     The type of the variable is stored (obviously) in the var_type attribute.
-    
+
+    symbol_id is filled by the symbol table, it is the id of the declaration the name refers to.
     """
     name: str
     var_type: _Optional[str]
+    symbol_id: _Optional[int] = field(default=None, compare=False, repr=False)
 
 
 @dataclass 
@@ -119,6 +128,7 @@ class ArrayIndex(Expression):
     name: str
     index_dim: _List[Expression]
     var_type: _Optional[str]
+    symbol_id: _Optional[int] = field(default=None, compare=False, repr=False)
 
 
 @dataclass
@@ -167,9 +177,13 @@ class VariableAssignement(Statement):
     """
     Because in GLWSSA you declare the variables you use globally, assignement should be different.
     (Type is not preserved here because there is a variable table where it will be type checked) 
+
+    target_index is empty for simple variables, for Π[i, j] <- ... it has the index expressions.
     """
     target: str
     expr: Expression
+    target_id: _Optional[int] = field(default=None, compare=False, repr=False)
+    target_index: _List[Expression] = field(default_factory=list)
 
 
 @dataclass
@@ -216,6 +230,7 @@ class Do(Statement):
 class CallProcedure(Statement):
     name: str
     params: list[Variable]
+    symbol_id: _Optional[int] = field(default=None, compare=False, repr=False)
 
 
 @dataclass 
@@ -223,6 +238,7 @@ class CallFunction(Statement):
     name: str
     params: list[Expression]
     func_type: _Optional[str]
+    symbol_id: _Optional[int] = field(default=None, compare=False, repr=False)
 
 
 @dataclass
@@ -254,6 +270,133 @@ TYPE_TABLE_FUNC = {
     "LOGICAL": BoolType,
 }
 
+
+# Walking the tree _____________________________________________________________________________________
+
+_TREE_NODES = (Node, Branch, Program, Callable)
+_CHILD_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+def _child_fields(cls: type) -> tuple[str, ...]:
+    names = _CHILD_FIELDS.get(cls)
+    if names is None:
+        names = tuple(f.name for f in fields(cls) if f.compare)
+        _CHILD_FIELDS[cls] = names
+    return names
+
+
+def iter_child_nodes(node):
+    """
+    Yields the direct children of a node (statements, expressions, branches), in the order of the fields.
+    The types that are stored as classes (IntType etc) are not children.
+    """
+    for name in _child_fields(type(node)):
+        value = getattr(node, name)
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, _TREE_NODES):
+                    yield item
+        elif isinstance(value, _TREE_NODES):
+            yield value
+
+
+def walk(node):
+    """
+    Yields the node and every node under it (pre-order).
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = list(iter_child_nodes(node))
+        children.reverse()
+        stack.extend(children)
+
+
+class NodeVisitor:
+    """
+    Calls visit_<ClassName> for every node, or generic_visit if there is no such method.
+    The method of every class is looked up once and cached.
+    """
+    def __init__(self) -> None:
+        self._dispatch: dict[type, _Callable] = {}
+
+
+    def visit(self, node):
+        method = self._dispatch.get(type(node))
+        if method is None:
+            method = getattr(self, "visit_" + type(node).__name__, self.generic_visit)
+            self._dispatch[type(node)] = method
+        return method(node)
+
+
+    def generic_visit(self, node):
+        for child in iter_child_nodes(node):
+            self.visit(child)
+
+
+class NodeTransformer(NodeVisitor):
+    """
+    A NodeVisitor where visit_<ClassName> returns the node that takes the place of the visited one.
+    Inside a list a method can also return None (the node is removed) or a list of nodes (they are spliced in).
+    """
+    def generic_visit(self, node):
+        for name in _child_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, list):
+                new_values = []
+                for item in value:
+                    if isinstance(item, _TREE_NODES):
+                        item = self.visit(item)
+                        if item is None:
+                            continue
+                        if isinstance(item, list):
+                            new_values.extend(item)
+                            continue
+                    new_values.append(item)
+                value[:] = new_values
+            elif isinstance(value, _TREE_NODES):
+                setattr(node, name, self.visit(value))
+        return node
+
+
+# Helpers for the passes ______________________________________________________________________________
+
+DECLARATIONS = (ProgramName, VariableDeclaration, ConstantDeclaration)
+
+
+def assigned_names(body: list) -> set:
+    """
+    The names that the statements can change (assignment, ΔΙΑΒΑΣΕ, arguments of ΚΑΛΕΣΕ, counter of ΓΙΑ).
+    """
+    names = set()
+    for node in (child for statement in body for child in walk(statement)):
+        if isinstance(node, VariableAssignement):
+            names.add(node.target)
+        elif isinstance(node, Read):
+            names.update(variable.name for variable in node.variable_list)
+        elif isinstance(node, CallProcedure):
+            names.update(arg.name for arg in node.params if isinstance(arg, (Variable, ArrayIndex)))
+        elif isinstance(node, For):
+            names.add(node.counter.name)
+    return names
+
+
+def used_names(node) -> set:
+    return {child.name for child in walk(node) if isinstance(child, (Variable, ArrayIndex))}
+
+
+def insert_declarations(body: list, declarations: list) -> None:
+    """
+    The symbol table only looks for declarations at the top level of the body,
+    so the variables a pass makes are put after the declarations that are already there.
+    """
+    position = 0
+    while position < len(body) and isinstance(body[position], DECLARATIONS):
+        position += 1
+    body[position:position] = declarations
+
+
 # __all__ = [
 #     "Expression",
 #     "Statement",
@@ -11,8 +11,97 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-class TranspilerBackend_cpp:
+import io
+import math
+
+from .log import log
+from .ast_nodes import *
+from .constant_folding import literal_value, NOT_A_LITERAL
+from .symbol_table import RESULT, PARAMETER, BUILTIN, CONSTANT, VARIABLE
+from .cfg import (ControlFlowGraph, Var, Const, Element, Copy, BinaryOp, UnaryOp, Load, Store,
+                  CallFunc, CallProc, Input, Output, Jump, CondJump, Return)
+from .code_writer import CodeWriter
+from .dispatch import plan_dispatch, Decision, NO_BRANCH
+from .runtime import RUNTIME_HEADER, RUNTIME_MODES, RUNTIME_SOURCE, runtime_code
+
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import TextIO as _TextIO
+
+
+# on: the indexes are checked, except the ones the range analysis proves to be in bounds
+# all: every index is checked, off: no index is checked
+BOUNDS_CHECKS = ("on", "all", "off")
+
+CPP_TYPES = {
+    IntType: "int64_t",
+    RealType: "double",
+    CharType: "std::string",
+    BoolType: "bool",
+}
+
+# The narrower types an array of ΑΚΕΡΑΙΕΣ can have, with the values they hold.
+CPP_INT_TYPES = (
+    ("int8_t", -2**7, 2**7 - 1),
+    ("int16_t", -2**15, 2**15 - 1),
+    ("int32_t", -2**31, 2**31 - 1),
+)
+
+CPP_ZERO = {
+    IntType: "0",
+    RealType: "0.0",
+    CharType: '""',
+    BoolType: "false",
+}
+
+CPP_BUILTINS = {
+    "Α_Μ": "glwssa_int_part",
+    "Α_Τ": "std::abs",
+    "Τ_Ρ": "std::sqrt",
+    "gr_HM": "glwssa_sin",
+    "gr_SYN": "glwssa_cos",
+    "gr_EF": "glwssa_tan",
+    "gr_E": "std::exp",
+    "gr_LOG": "std::log",
+}
+
+# the value a function returns is kept here, the name of the function is the C++ function
+RESULT_NAME = "result_"
+
+# The files of translate_units() besides the one of every subprogram.
+UNITS_HEADER = "glwssa_program.hpp"
+MAIN_UNIT = "main.cpp"
+
+# An array of a subprogram with constant dimensions and at most this many elements is kept on the stack.
+STACK_ELEMENTS = 256
+
+class TranspilerBackend_cpp(NodeVisitor):
+    """
+    Writes the C++ code of the program tree. The visit_<Statement> methods write lines,
+    expression() returns the C++ code of an expression.
+
+    Only the subprograms that the program can reach (the call graph) are written.
+
+    With ir="cfg" the bodies are written from the control flow graphs (cfg.py) instead of the tree:
+    every variable is declared at the top, every block is a label and the jumps are gotos.
+
+    An index that is checked is written as glwssa_index(i, dimension), it stops the program if i is not in 1..dimension.
+
+    An array of ΑΚΕΡΑΙΕΣ whose elements are proven to fit in a narrower type (the range analysis) is declared with it,
+    its elements are read as int64_t so the arithmetic stays the same.
+
+    A variable/array that is written before it is read on every path (the definite assignment analysis) is declared
+    without its 0, the elements of such an array are allocated with glwssa_no_zero.
+
+    Every array is a glwssa_array (the runtime), its elements are in one block and Π[i, j] is written Π(i, j).
+    The arrays of the main program with constant dimensions point to static storage (it starts as 0 and is never
+    allocated), the small ones of the subprograms to stack storage, the rest allocate their block.
+
+    The lines go to a CodeWriter as they are made (write_tree), it writes them to a file or an io.StringIO.
+    """
     def __init__(self):
+        super().__init__()
         self.operator_mapping = {
             'NEQ': '!=',  # Not equal
             'EQ': '==',   # Equal
@@ -25,9 +114,782 @@ class TranspilerBackend_cpp:
             'NOT': '!',   # Logical NOT
             'MOD': '%',   # Modulus operator
             'DIV': '/',   # Division operator
+            'IDIV': '/',  # DIV, C++ also truncates towards zero
+            'FDIV': '/',  # Real division
+            'PLUS': '+',
+            'MINUS': '-',
+            'MUL': '*',
+        }
+
+        self._expression_dispatch = {
+            Number: self.expression_Number,
+            Float: self.expression_Float,
+            Boolean: self.expression_Boolean,
+            String: self.expression_String,
+            Variable: self.expression_Variable,
+            ArrayIndex: self.expression_ArrayIndex,
+            BinaryOperation: self.expression_BinaryOperation,
+            UnaryOperator: self.expression_UnaryOperator,
+            Parentheses: lambda node: f"({self.expression(node.exrpession)})",
+            CallFunction: self.expression_CallFunction,
         }
 
-    def translate_tree(self, tree):
+        self._instruction_dispatch = {
+            Copy: self.instruction_Copy,
+            BinaryOp: self.instruction_BinaryOp,
+            UnaryOp: self.instruction_UnaryOp,
+            Load: self.instruction_Load,
+            Store: self.instruction_Store,
+            CallFunc: self.instruction_CallFunc,
+            CallProc: self.instruction_CallProc,
+            Input: self.instruction_Input,
+            Output: self.instruction_Output,
+        }
+
+
+    def translate_tree(self, tree: Program, manager, ir: str = "ast", bounds_checks: str = "on",
+                       narrow_ints: bool = True, zero_init: bool = False, runtime: str = "inline") -> str:
+        """
+        The C++ code as one string, write_tree() writes it to a stream instead.
+        """
+        stream = io.StringIO()
+        self.write_tree(tree, manager, stream, ir, bounds_checks, narrow_ints, zero_init, runtime)
+        return stream.getvalue()
+
+
+    def write_tree(self, tree: Program, manager, stream: _TextIO, ir: str = "ast", bounds_checks: str = "on",
+                   narrow_ints: bool = True, zero_init: bool = False, runtime: str = "inline") -> int:
+        """
+        Writes the C++ code of the program to the stream, returns the number of lines.
+
+        :param tree: The program tree, after the passes of the TreeAnalyzer.
+        :param manager: The PassManager of the TreeAnalyzer, the symbols, types and call graph come from it.
+        :param ir: "ast" writes the bodies from the tree, "cfg" from the control flow graphs.
+        :param bounds_checks: One of BOUNDS_CHECKS.
+        :param narrow_ints: Declares the arrays of ΑΚΕΡΑΙΕΣ with the narrowest type their values fit in.
+        :param zero_init: Sets every variable/array to 0, also the ones that are written before they are read.
+        :param runtime: One of RUNTIME_MODES, pastes glwssa_runtime.hpp in the code or includes it.
+        """
+        runtime_text = runtime_code(runtime)
+        subprograms = self.prepare(tree, manager, ir, bounds_checks, narrow_ints, zero_init)
+        self.out = CodeWriter(stream)
+        self.temp_count = 0
+
+        self.out.raw(runtime_text)
+        for subprogram in subprograms:
+            self.out.line(self.signature(subprogram) + ";")
+        if subprograms:
+            self.out.line("")
+
+        self.main_function(tree)
+        for subprogram in subprograms:
+            self.out.line("")
+            self.subprogram(subprogram)
+
+        self.out.flush()
+        log(f"From write_tree (backend.py): Wrote {self.out.line_count} lines", tags=["be"])
+        return self.out.line_count
+
+
+    def translate_units(self, tree: Program, manager, ir: str = "ast", bounds_checks: str = "on",
+                        narrow_ints: bool = True, zero_init: bool = False, runtime: str = "inline") -> _Dict[str, str]:
+        """
+        The C++ code in translation units that are compiled on their own and linked: MAIN_UNIT for the main program
+        and <name>.cpp for every subprogram. file name -> code, the parameters are the ones of write_tree().
+
+        Every unit includes the runtime and UNITS_HEADER (the signatures of the subprograms). With runtime="inline"
+        the runtime header is one more file of the units, with "include" the compiler finds it with -I.
+        The temporaries are numbered in every unit from 1, a unit only changes when its own code does.
+        """
+        if runtime not in RUNTIME_MODES:
+            raise ValueError(f"Unknown runtime mode '{runtime}', expected one of {RUNTIME_MODES}")
+        subprograms = self.prepare(tree, manager, ir, bounds_checks, narrow_ints, zero_init)
+        units = {}
+        if runtime == "inline":
+            units[RUNTIME_HEADER] = RUNTIME_SOURCE
+
+        guard = UNITS_HEADER.upper().replace(".", "_")
+        lines = [f"#ifndef {guard}", f"#define {guard}", f'#include "{RUNTIME_HEADER}"', ""]
+        lines += [self.signature(subprogram) + ";" for subprogram in subprograms]
+        lines += ["", f"#endif // {guard}", ""]
+        units[UNITS_HEADER] = "\n".join(lines)
+
+        includes = f'#include "{RUNTIME_HEADER}"\n#include "{UNITS_HEADER}"\n\n'
+        units[MAIN_UNIT] = includes + self.unit(self.main_function, tree)
+        for subprogram in subprograms:
+            units[f"{subprogram.name.value}.cpp"] = includes + self.unit(self.subprogram, subprogram)
+        log(f"From translate_units (backend.py): {len(units)} files", tags=["be"])
+        return units
+
+
+    def unit(self, write, node) -> str:
+        stream = io.StringIO()
+        self.out = CodeWriter(stream)
+        self.temp_count = 0
+        write(node)
+        self.out.flush()
+        return stream.getvalue()
+
+
+    def prepare(self, tree: Program, manager, ir: str, bounds_checks: str, narrow_ints: bool, zero_init: bool) -> list:
+        """
+        Takes the analyses the code is written from, returns the subprograms that are written.
+        """
+        if ir not in ("ast", "cfg"):
+            raise ValueError(f"Unknown ir '{ir}', expected 'ast' or 'cfg'")
+        if bounds_checks not in BOUNDS_CHECKS:
+            raise ValueError(f"Unknown bounds_checks '{bounds_checks}', expected one of {BOUNDS_CHECKS}")
         self.tree = tree
-        return ""
-        # translating
\ No newline at end of file
+        self.symbols = manager.get_analysis("symbols")
+        self.types = manager.get_analysis("types")
+        self.calls = manager.get_analysis("calls")
+        self.bounds_checks = bounds_checks
+        self.ranges = manager.get_analysis("ranges")
+        self.element_types = self.narrow_arrays() if narrow_ints else {}
+        self.assignment = None if zero_init else manager.get_analysis("assignment")
+        self.graphs = None
+        if ir == "cfg":
+            self.graphs = {id(cfg.node): cfg for cfg in manager.get_analysis("cfg")}
+        self.in_main = False
+
+        subprograms = [s for s in tree.procedures + tree.functions if self.calls.is_reachable(s)]
+        log(f"From prepare (backend.py): Writing {len(subprograms)} of "
+            f"{len(tree.procedures) + len(tree.functions)} subprograms", tags=["be"])
+        return subprograms
+
+
+    def main_function(self, tree: Program) -> None:
+        self.in_main = True
+        self.out.line("int main() {")
+        with self.out.indented():
+            if self.graphs is None:
+                self.body(tree.body)
+                self.out.line("return 0;")
+            else:
+                self.graph(self.graphs[id(tree)])
+        self.out.line("}")
+        self.in_main = False
+
+
+    def new_temp(self, name: str) -> str:
+        self.temp_count += 1
+        return f"{name}{self.temp_count}_"
+
+
+    def body(self, statements: list) -> None:
+        for statement in statements:
+            self.visit(statement)
+
+
+    def block(self, block: Block) -> None:
+        with self.out.indented():
+            self.body(block.body)
+
+    # Types ________________________________________________________________________________________________
+
+    def narrow_arrays(self) -> dict:
+        """
+        symbol id -> the C++ type of the elements, for the arrays that do not need int64_t.
+        The parameters keep int64_t, the arrays that are passed to them are not narrowed either (they can have any value).
+        """
+        element_types = {}
+        for symbol in self.symbols.symbols:
+            var_type = symbol.var_type
+            if symbol.kind != VARIABLE or not isinstance(var_type, ArrayType) or var_type.val_type is not IntType:
+                continue
+            values = self.ranges.element_range(symbol.id)
+            for name, low, high in CPP_INT_TYPES:
+                if values.within(low, high):
+                    element_types[symbol.id] = name
+                    break
+        log(f"From narrow_arrays (backend.py): {len(element_types)} arrays of ΑΚΕΡΑΙΕΣ are narrower than int64_t", tags=["be"])
+        return element_types
+
+
+    def cpp_type(self, var_type, element: _Optional[str] = None) -> str:
+        if isinstance(var_type, ArrayType):
+            return f"glwssa_array<{element or CPP_TYPES[var_type.val_type]}, {len(var_type.val_dim)}>"
+        return CPP_TYPES[var_type]
+
+
+    def constant_dims(self, var_type: ArrayType) -> _Optional[_List[int]]:
+        """
+        The dimensions if they are all literals or ΣΤΑΘΕΡΕΣ with a literal value, else None.
+        """
+        values = []
+        for dim in var_type.val_dim:
+            if type(dim) is Variable and dim.symbol_id is not None:
+                symbol = self.symbols[dim.symbol_id]
+                if symbol.kind == CONSTANT and isinstance(symbol.node, ConstantDeclaration):
+                    dim = symbol.node.expr
+            value = literal_value(dim)
+            if type(value) is not int or value < 1:
+                return None
+            values.append(value)
+        return values
+
+
+    def declaration(self, var_type, name: str, symbol_id: _Optional[int] = None) -> _List[str]:
+        zero = self.assignment is None or self.assignment.needs_zero(symbol_id)
+        if not isinstance(var_type, ArrayType):
+            if not zero:
+                return [f"{self.cpp_type(var_type)} {name};"]
+            return [f"{self.cpp_type(var_type)} {name} = {CPP_ZERO[var_type]};"]
+
+        element = self.element_types.get(symbol_id) or CPP_TYPES[var_type.val_type]
+        cpp_type = self.cpp_type(var_type, element)
+        dims = ", ".join(self.expression(dim) for dim in var_type.val_dim)
+        values = self.constant_dims(var_type)
+        size = math.prod(values) if values is not None else None
+        storage = f"{name}_elements_"
+        if size is not None and self.in_main:
+            # main runs once, static storage is set to 0 when the program is loaded
+            return [f"static {element} {storage}[{size}];", f"{cpp_type} {name}({storage}, {{{dims}}});"]
+        if size is not None and size <= STACK_ELEMENTS:
+            return [f"{element} {storage}[{size}]{' = {}' if zero else ''};", f"{cpp_type} {name}({storage}, {{{dims}}});"]
+        if not zero:
+            return [f"{cpp_type} {name}({{{dims}}}, glwssa_no_zero);"]
+        return [f"{cpp_type} {name}({{{dims}}});"]
+
+    # Subprograms __________________________________________________________________________________________
+
+    def signature(self, subprogram: Callable) -> str:
+        scope = self.symbols.scope_of(subprogram)
+        params = []
+        for symbol_id in scope.params:
+            symbol = self.symbols[symbol_id]
+            cpp_type = self.cpp_type(symbol.var_type)
+            if isinstance(subprogram, Procedure):
+                # the changes to the parameters of a procedure are copied back to the caller
+                params.append(f"{cpp_type}& {symbol.name}")
+            elif isinstance(symbol.var_type, ArrayType) and not self.is_assigned(subprogram, symbol_id):
+                params.append(f"const {cpp_type}& {symbol.name}")
+            else:
+                params.append(f"{cpp_type} {symbol.name}")
+
+        return_type = "void" if isinstance(subprogram, Procedure) else self.cpp_type(subprogram.func_type)
+        return f"{return_type} {subprogram.name.value}({', '.join(params)})"
+
+
+    def is_assigned(self, subprogram: Callable, symbol_id: int) -> bool:
+        for node in (child for statement in subprogram.body for child in walk(statement)):
+            if isinstance(node, VariableAssignement) and node.target_id == symbol_id:
+                return True
+            if isinstance(node, Read) and any(v.symbol_id == symbol_id for v in node.variable_list):
+                return True
+            if isinstance(node, CallProcedure) and any(getattr(p, "symbol_id", None) == symbol_id for p in node.params):
+                return True
+        return False
+
+
+    def subprogram(self, subprogram: Callable) -> None:
+        self.out.line(self.signature(subprogram) + " {")
+        with self.out.indented():
+            if isinstance(subprogram, Function):
+                for line in self.declaration(subprogram.func_type, RESULT_NAME):
+                    self.out.line(line)
+            if self.graphs is not None:
+                self.graph(self.graphs[id(subprogram)])
+            else:
+                self.body(subprogram.body)
+                if isinstance(subprogram, Function):
+                    self.out.line(f"return {RESULT_NAME};")
+        self.out.line("}")
+
+    # Statements ___________________________________________________________________________________________
+
+    def generic_visit(self, node) -> None:
+        log(f"From generic_visit (backend.py): No C++ for {type(node).__name__}", tags=["be"])
+
+
+    def visit_ProgramName(self, node: ProgramName) -> None:
+        pass
+
+
+    def visit_VariableDeclaration(self, node: VariableDeclaration) -> None:
+        variable = node.variable
+        if variable.symbol_id is not None and self.symbols[variable.symbol_id].kind == PARAMETER:
+            return # it is declared in the signature
+        for line in self.declaration(variable.var_type, variable.name, variable.symbol_id):
+            self.out.line(line)
+
+
+    def visit_ConstantDeclaration(self, node: ConstantDeclaration) -> None:
+        const_type = self.types.type_of(node.expr)
+        self.out.line(f"const {CPP_TYPES[const_type]} {node.name} = {self.expression(node.expr)};")
+
+
+    def visit_VariableAssignement(self, node: VariableAssignement) -> None:
+        target = self.name_of(node.target_id, node.target)
+        indexes = self.indexes(node.target_id, node.target_index)
+        self.out.line(f"{target}{indexes} = {self.expression(node.expr)};")
+
+
+    def visit_Write(self, node: Write) -> None:
+        parts = []
+        for expr in node.expression:
+            code = self.expression(expr)
+            parts.append(f"glwssa_bool({code})" if self.types.type_of(expr) is BoolType else code)
+        separator = " << ' ' << "
+        self.out.line(f"glwssa_out << {separator.join(parts) if parts else '\"\"'} << '\\n';")
+
+
+    def visit_Read(self, node: Read) -> None:
+        targets = " >> ".join(self.expression(variable) for variable in node.variable_list)
+        self.out.line(f"glwssa_in >> {targets};")
+
+
+    def visit_If(self, node: If) -> None:
+        for index, branch in enumerate(node.branches):
+            keyword = "if" if index == 0 else "} else if"
+            self.out.line(f"{keyword} ({self.expression(branch.condition)}) {{")
+            self.block(branch.body)
+        if node.else_branch is not None and node.else_branch.body:
+            self.out.line("} else {")
+            self.block(node.else_branch)
+        self.out.line("}")
+
+
+    def visit_Switch(self, node: Switch) -> None:
+        dispatch = plan_dispatch(node, self.symbols, self.types)
+        value = self.new_temp("switch")
+        self.out.line("{")
+        with self.out.indented():
+            self.out.line(f"const {CPP_TYPES[self.types.type_of(node.expr)]} {value} = {self.expression(node.expr)};")
+            if dispatch is None:
+                self.switch_chain(value, node)
+            elif dispatch.table:
+                labels = {}
+                for low, high, index in dispatch.cases():
+                    labels.setdefault(index, []).append(f"{low}" if low == high else f"{low} ... {high}")
+                self.switch_table(value, labels, node)
+            else:
+                self.switch_tree(value, dispatch.tree(), node)
+        self.out.line("}")
+
+
+    def switch_chain(self, value: str, node: Switch) -> None:
+        for index, branch in enumerate(node.branches):
+            keyword = "if" if index == 0 else "} else if"
+            condition = " || ".join(self.case_condition(value, case) for case in branch.condition)
+            self.out.line(f"{keyword} ({condition}) {{")
+            self.block(branch.body)
+        if node.else_branch is not None and node.else_branch.body:
+            if node.branches:
+                self.out.line("} else {")
+                self.block(node.else_branch)
+            else:
+                self.body(node.else_branch.body)
+        if node.branches:
+            self.out.line("}")
+
+
+    def switch_table(self, value: str, labels: dict, node: Switch) -> None:
+        """
+        A C++ switch (the compiler makes it a jump table), labels: the index of a branch -> its case labels.
+        A range of values is a GNU case range (g++ and clang++), the body of every case is a block.
+        """
+        self.out.line(f"switch ({value}) {{")
+        with self.out.indented():
+            for index, branch in enumerate(node.branches):
+                if index not in labels:
+                    continue # every value of its cases goes to an earlier branch
+                for label in labels[index][:-1]:
+                    self.out.line(f"case {label}:")
+                self.out.line(f"case {labels[index][-1]}: {{")
+                self.block(branch.body)
+                with self.out.indented():
+                    self.out.line("break;")
+                self.out.line("}")
+            if node.else_branch is not None and node.else_branch.body:
+                self.out.line("default: {")
+                self.block(node.else_branch)
+                self.out.line("}")
+        self.out.line("}")
+
+
+    def switch_tree(self, value: str, tree, node: Switch) -> None:
+        """
+        The tests of the decision tree, with the bodies of the branches in its leaves. If a branch (or ΑΛΛΙΩΣ) is in
+        more than one leaf, the leaves only keep its index and a C++ switch on it writes each body once.
+        """
+        leaves = []
+        stack = [tree]
+        while stack:
+            test = stack.pop()
+            if isinstance(test, Decision):
+                stack.extend((test.below, test.above))
+            else:
+                leaves.append(test)
+        if len(leaves) == len(set(leaves)):
+            bodies = {index: branch.body.body for index, branch in enumerate(node.branches)}
+            if node.else_branch is not None:
+                bodies[NO_BRANCH] = node.else_branch.body
+            self.decision(value, tree, bodies.get)
+            return
+
+        selected = self.new_temp("case")
+        self.out.line(f"int {selected} = {NO_BRANCH};")
+        self.decision(value, tree, lambda index: None if index == NO_BRANCH else [f"{selected} = {index};"])
+        self.switch_table(selected, {index: [f"{index}"] for index in set(leaves) if index != NO_BRANCH}, node)
+
+
+    def decision(self, value: str, tree, leaf) -> None:
+        """
+        leaf(index) is the statements (or C++ lines) of a leaf, None/[] if it has nothing to do.
+        """
+        if not isinstance(tree, Decision):
+            for statement in leaf(tree) or ():
+                if isinstance(statement, str):
+                    self.out.line(statement)
+                else:
+                    self.visit(statement)
+            return
+        below = tree.below if isinstance(tree.below, Decision) or leaf(tree.below) else None
+        above = tree.above if isinstance(tree.above, Decision) or leaf(tree.above) else None
+        if below is None or above is None:
+            condition = f"{value} < {tree.bound}" if above is None else f"{value} >= {tree.bound}"
+            if below is None and above is None:
+                return
+            self.out.line(f"if ({condition}) {{")
+            with self.out.indented():
+                self.decision(value, above if below is None else below, leaf)
+            self.out.line("}")
+            return
+        self.out.line(f"if ({value} < {tree.bound}) {{")
+        with self.out.indented():
+            self.decision(value, below, leaf)
+        self.out.line("} else {")
+        with self.out.indented():
+            self.decision(value, above, leaf)
+        self.out.line("}")
+
+
+    def case_condition(self, value: str, case: Expression) -> str:
+        if isinstance(case, UnaryOperator) and case.operator in {"GT", "LT", "GTE", "LTE"}:
+            return f"{value} {self.operator_mapping[case.operator]} {self.expression(case.operand)}"
+        if isinstance(case, BinaryOperation) and case.operator == "PERIOD":
+            return f"({value} >= {self.expression(case.left)} && {value} <= {self.expression(case.right)})"
+        return f"{value} == {self.expression(case)}"
+
+
+    def visit_While(self, node: While) -> None:
+        self.out.line(f"while ({self.expression(node.condition)}) {{")
+        self.block(node.body)
+        self.out.line("}")
+
+
+    def visit_Do(self, node: Do) -> None:
+        self.out.line("do {")
+        self.block(node.body)
+        self.out.line(f"}} while (!{self.expression(node.condition)});")
+
+
+    def visit_For(self, node: For) -> None:
+        counter = self.expression(node.counter)
+        counter_type = CPP_TYPES[self.types.type_of(node.counter)]
+
+        # ΓΛΩΣΣΑ finds the bounds once, before the loop
+        hoisted = []
+        changed = set() # only a bound that is not a literal needs the names the body changes
+        if literal_value(node.to_expr) is NOT_A_LITERAL or literal_value(node.step) is NOT_A_LITERAL:
+            changed = assigned_names(node.body.body) | {node.counter.name}
+        to_code = self.expression(node.to_expr)
+        if not self.is_fixed(node.to_expr, changed):
+            name = self.new_temp("to")
+            hoisted.append(f"const {CPP_TYPES[self.types.type_of(node.to_expr)]} {name} = {to_code};")
+            to_code = name
+
+        step = literal_value(node.step)
+        step_code = self.expression(node.step)
+        if step is NOT_A_LITERAL and not self.is_fixed(node.step, changed):
+            name = self.new_temp("step")
+            hoisted.append(f"const {CPP_TYPES[self.types.type_of(node.step)]} {name} = {step_code};")
+            step_code = name
+        if step is NOT_A_LITERAL:
+            condition = f"({step_code} > 0 ? {counter} <= {to_code} : {counter} >= {to_code})"
+        else:
+            condition = f"{counter} {'>=' if step < 0 else '<='} {to_code}"
+
+        increment = f"++{counter}" if step == 1 and counter_type == "int64_t" else f"{counter} += {step_code}"
+
+        header = f"for ({counter} = {self.expression(node.from_expr)}; {condition}; {increment}) {{"
+        if not hoisted:
+            self.out.line(header)
+            self.block(node.body)
+            self.out.line("}")
+            return
+        self.out.line("{")
+        with self.out.indented():
+            for line in hoisted:
+                self.out.line(line)
+            self.out.line(header)
+            self.block(node.body)
+            self.out.line("}")
+        self.out.line("}")
+
+
+    def is_fixed(self, bound: Expression, changed: set) -> bool:
+        """
+        A literal, or a variable that the loop does not change, can be read every time instead of copied.
+        """
+        if literal_value(bound) is not NOT_A_LITERAL:
+            return True
+        return type(bound) is Variable and not isinstance(bound.var_type, ArrayType) and bound.name not in changed
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> None:
+        procedure = self.symbols[node.symbol_id].node
+        param_ids = self.symbols.scope_of(procedure).params
+
+        # a reference parameter needs a variable of the same type, the rest are copied into temporaries
+        temps = []
+        args = []
+        for arg, param_id in zip(node.params, param_ids):
+            param_type = self.symbols[param_id].var_type
+            if self.is_lvalue(arg) and self.types.type_of(arg) == param_type:
+                args.append(self.expression(arg))
+                continue
+            name = self.new_temp("arg")
+            temps.append(f"{self.cpp_type(param_type)} {name} = {self.expression(arg)};")
+            args.append(name)
+
+        call = f"{node.name}({', '.join(args)});"
+        if not temps:
+            self.out.line(call)
+            return
+        self.out.line("{")
+        with self.out.indented():
+            for line in temps:
+                self.out.line(line)
+            self.out.line(call)
+        self.out.line("}")
+
+
+    def is_lvalue(self, node: Expression) -> bool:
+        if not isinstance(node, (Variable, ArrayIndex)) or node.symbol_id is None:
+            return False
+        return self.symbols[node.symbol_id].kind not in {CONSTANT, BUILTIN}
+
+    # Expressions __________________________________________________________________________________________
+
+    def expression(self, node: Expression) -> str:
+        return self._expression_dispatch[type(node)](node)
+
+
+    def name_of(self, symbol_id: _Optional[int], name: str) -> str:
+        if symbol_id is not None and self.symbols[symbol_id].kind == RESULT:
+            return RESULT_NAME
+        return name
+
+
+    def expression_Number(self, node: Number) -> str:
+        value = str(node.value)
+        return f"({value})" if value.startswith("-") else value
+
+
+    def expression_Float(self, node: Float) -> str:
+        value = str(node.value)
+        if not any(c in value for c in ".eE"):
+            value += ".0"
+        return f"({value})" if value.startswith("-") else value
+
+
+    def expression_Boolean(self, node: Boolean) -> str:
+        return "true" if node.value in ("true", True) else "false"
+
+
+    def expression_String(self, node: String) -> str:
+        text = node.value[1:-1].replace("\\", "\\\\").replace('"', '\\"')
+        return f'std::string("{text}")'
+
+
+    def expression_Variable(self, node: Variable) -> str:
+        name = self.name_of(node.symbol_id, node.name)
+        if isinstance(node.var_type, ArrayType): # ΔΙΑΒΑΣΕ Π[i]
+            return name + self.indexes(node.symbol_id, node.var_type.val_dim)
+        return name
+
+
+    def expression_ArrayIndex(self, node: ArrayIndex) -> str:
+        element = self.name_of(node.symbol_id, node.name) + self.indexes(node.symbol_id, node.index_dim)
+        if node.symbol_id in self.element_types:
+            return f"static_cast<int64_t>({element})"
+        return element
+
+
+    def indexes(self, symbol_id: _Optional[int], indexes: list) -> str:
+        dims = []
+        if self.bounds_checks != "off" and symbol_id is not None:
+            array_type = self.symbols[symbol_id].var_type
+            dims = array_type.val_dim if isinstance(array_type, ArrayType) else []
+        codes = []
+        for position, index in enumerate(indexes):
+            checked = position < len(dims) and not (self.bounds_checks == "on" and self.ranges.is_proven(index))
+            codes.append(self.checked_index(self.expression(index), dims[position] if checked else None))
+        return f"({', '.join(codes)})" if codes else ""
+
+
+    def checked_index(self, index: str, dim: _Optional[Expression]) -> str:
+        if dim is None:
+            return index
+        return f"glwssa_index({index}, {self.expression(dim)})"
+
+
+    def expression_BinaryOperation(self, node: BinaryOperation) -> str:
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        op = node.operator
+
+        if op == "POW":
+            if self.types.type_of(node) is IntType:
+                return f"glwssa_ipow({left}, {right})"
+            return f"std::pow({left}, {right})"
+
+        if op == "FDIV" and self.types.type_of(node.left) is IntType and self.types.type_of(node.right) is IntType:
+            return f"(static_cast<double>({left}) / {right})"
+
+        return f"({left} {self.operator_mapping[op]} {right})"
+
+
+    def expression_UnaryOperator(self, node: UnaryOperator) -> str:
+        return f"({self.operator_mapping[node.operator]}{self.expression(node.operand)})"
+
+
+    def expression_CallFunction(self, node: CallFunction) -> str:
+        args = ", ".join(self.expression(arg) for arg in node.params)
+        symbol = self.symbols[node.symbol_id]
+        if symbol.kind == BUILTIN:
+            if symbol.name == "Α_Τ" and self.types.type_of(node) is RealType:
+                return f"std::fabs({args})"
+            return f"{CPP_BUILTINS[symbol.name]}({args})"
+        return f"{symbol.name}({args})"
+
+    # Control flow graph ___________________________________________________________________________________
+
+    def graph(self, cfg: ControlFlowGraph) -> None:
+        """
+        The body of one function from its graph. A jump to the block that is written next is left out.
+        """
+        self.cfg = cfg
+        self.array_types = {d.var.name: d.var.var_type for d in cfg.declarations if isinstance(d.var.var_type, ArrayType)}
+        for declaration in cfg.declarations:
+            var = declaration.var
+            if declaration.is_param:
+                continue
+            if declaration.value is not None:
+                self.out.line(f"const {CPP_TYPES[var.var_type]} {var.name} = {self.expression(declaration.value)};")
+            else:
+                for line in self.declaration(var.var_type, var.name, self.symbols.scope_of(cfg.node).names.get(var.name)):
+                    self.out.line(line)
+        for name, var_type in cfg.temps.items():
+            for line in self.declaration(var_type, name):
+                self.out.line(line)
+
+        order = sorted(cfg.reverse_postorder()) # the blocks in the order they were made, without the unreachable ones
+        targets = {label for block in order for label in cfg.successors(block)}
+        for position, label in enumerate(order):
+            block = cfg.blocks[label]
+            if label in targets:
+                self.out.label(f"L{label}:")
+            for instruction in block.instructions:
+                self.out.line(self._instruction_dispatch[type(instruction)](instruction))
+            following = order[position + 1] if position + 1 < len(order) else None
+            self.terminator(block.terminator, following)
+
+
+    def terminator(self, terminator, following: _Optional[int]) -> None:
+        if isinstance(terminator, Jump):
+            if terminator.target != following:
+                self.out.line(f"goto L{terminator.target};")
+        elif isinstance(terminator, CondJump):
+            condition = self.operand(terminator.condition)
+            if terminator.if_false == following:
+                self.out.line(f"if ({condition}) goto L{terminator.if_true};")
+            elif terminator.if_true == following:
+                self.out.line(f"if (!{condition}) goto L{terminator.if_false};")
+            else:
+                self.out.line(f"if ({condition}) goto L{terminator.if_true}; else goto L{terminator.if_false};")
+        elif isinstance(self.cfg.node, Function):
+            self.out.line(f"return {RESULT_NAME};")
+        elif isinstance(self.cfg.node, Procedure):
+            self.out.line("return;")
+        else:
+            self.out.line("return 0;")
+
+
+    def operand(self, operand) -> str:
+        if isinstance(operand, Element):
+            return self.operand(operand.array) + self.operand_indexes(operand.array, operand.indexes, operand.checked)
+        if isinstance(operand, Var):
+            return RESULT_NAME if operand.name == self.cfg.result else operand.name
+        value = operand.value
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, str):
+            text = value.replace("\\", "\\\\").replace('"', '\\"')
+            return f'std::string("{text}")'
+        code = repr(value) if isinstance(value, float) else str(value)
+        return f"({code})" if code.startswith("-") else code
+
+
+    def operand_indexes(self, array: Var, indexes, checked) -> str:
+        array_type = self.array_types.get(array.name)
+        dims = array_type.val_dim if array_type is not None and self.bounds_checks != "off" else []
+        codes = []
+        for position, index in enumerate(indexes):
+            check = position < len(dims) and (self.bounds_checks == "all" or
+                                              (position < len(checked) and checked[position]))
+            codes.append(self.checked_index(self.operand(index), dims[position] if check else None))
+        return f"({', '.join(codes)})" if codes else ""
+
+
+    def instruction_Copy(self, node: Copy) -> str:
+        return f"{self.operand(node.dest)} = {self.operand(node.value)};"
+
+
+    def instruction_BinaryOp(self, node: BinaryOp) -> str:
+        left, right, op = self.operand(node.left), self.operand(node.right), node.op
+        if op == "POW":
+            call = "glwssa_ipow" if node.dest.var_type is IntType else "std::pow"
+            return f"{self.operand(node.dest)} = {call}({left}, {right});"
+        if op == "FDIV" and node.left.var_type is IntType and node.right.var_type is IntType:
+            left = f"static_cast<double>({left})"
+        return f"{self.operand(node.dest)} = {left} {self.operator_mapping[op]} {right};"
+
+
+    def instruction_UnaryOp(self, node: UnaryOp) -> str:
+        return f"{self.operand(node.dest)} = {self.operator_mapping[node.op]}{self.operand(node.operand)};"
+
+
+    def instruction_Load(self, node: Load) -> str:
+        return f"{self.operand(node.dest)} = {self.operand(Element(node.array, tuple(node.indexes), node.checked))};"
+
+
+    def instruction_Store(self, node: Store) -> str:
+        return f"{self.operand(Element(node.array, tuple(node.indexes), node.checked))} = {self.operand(node.value)};"
+
+
+    def instruction_CallFunc(self, node: CallFunc) -> str:
+        args = ", ".join(self.operand(arg) for arg in node.args)
+        name = node.name
+        if node.builtin:
+            name = "std::fabs" if name == "Α_Τ" and node.dest.var_type is RealType else CPP_BUILTINS[name]
+        return f"{self.operand(node.dest)} = {name}({args});"
+
+
+    def instruction_CallProc(self, node: CallProc) -> str:
+        return f"{node.name}({', '.join(self.operand(arg) for arg in node.args)});"
+
+
+    def instruction_Input(self, node: Input) -> str:
+        return f"glwssa_in >> {self.operand(node.target)};"
+
+
+    def instruction_Output(self, node: Output) -> str:
+        parts = []
+        for value in node.values:
+            code = self.operand(value)
+            parts.append(f"glwssa_bool({code})" if value.var_type is BoolType else code)
+        separator = " << ' ' << "
+        return f"glwssa_out << {separator.join(parts) if parts else '\"\"'} << '\\n';"
@@ -0,0 +1,171 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import shutil
+
+from .log import log
+from .runtime import RUNTIME_VERSION, compiler_version, replace_file
+
+from typing import Dict as _Dict
+from typing import Sequence as _Sequence
+
+
+BUILDS_DIR = "builds"
+STATS_DIR = "stats"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024 # the executables of the cache together, the least recently used go first
+
+STATS = ("hits", "misses", "stores", "evictions")
+
+
+def build_key(cpp_code: str, compiler: str, flags: _Sequence[str] = ()) -> str:
+    """
+    The hash of everything the executable depends on: the C++ code, the compiler (and its version), the flags and the
+    runtime (the code only #includes it when it is precompiled). The names of the .cpp and the executable are not in it.
+    """
+    parts = [f"runtime-v{RUNTIME_VERSION}", compiler, compiler_version(compiler), *flags, cpp_code]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class BuildCache:
+    """
+    The executables made from the generated C++, in one directory that every run (also at the same time) can share:
+
+        <directory>/builds/<key>    an executable, found by build_key()
+        <directory>/stats/hits      one byte for every hit of all the runs, the same for misses, stores, evictions
+
+    Every executable is made under a temporary name and renamed (replace_file), a run never sees half of one.
+    An executable that is used is touched, when the cache is bigger than max_bytes the oldest ones are removed.
+    A count is one write with O_APPEND, the runs that count at the same time do not need a lock or a rename.
+    """
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = os.path.join(directory, BUILDS_DIR)
+        self.stats_directory = os.path.join(directory, STATS_DIR)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        os.makedirs(self.stats_directory, exist_ok=True)
+
+
+    def entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+
+    def fetch(self, key: str, executable: str) -> bool:
+        """
+        Puts the executable of the key at the path (a hard link, or a copy if the link can not be made).
+        Returns False if the cache does not have it.
+        """
+        entry = self.entry(key)
+        try:
+            os.utime(entry)
+            if os.path.lexists(executable):
+                os.remove(executable)
+            try:
+                os.link(entry, executable)
+            except OSError:
+                shutil.copy2(entry, executable)
+        except FileNotFoundError: # not made yet, or evicted by another run
+            self.count("misses")
+            log(f"From fetch (build_cache.py): Miss {key[:16]}", tags=["bc"])
+            return False
+        self.count("hits")
+        log(f"From fetch (build_cache.py): Hit {key[:16]} -> {executable}", tags=["bc"])
+        return True
+
+
+    def store(self, key: str, executable: str) -> None:
+        """
+        Copies the executable that was just compiled into the cache, then evicts what does not fit.
+        """
+        replace_file(self.entry(key), lambda path: shutil.copy2(executable, path))
+        self.count("stores")
+        log(f"From store (build_cache.py): Stored {executable} as {key[:16]}", tags=["bc"])
+        self.evict()
+
+
+    def entries(self):
+        """
+        (last use, size, path) of every executable, the least recently used first.
+        """
+        found = []
+        for name in os.listdir(self.directory):
+            if name.startswith("."):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                continue
+            found.append((info.st_mtime, info.st_size, path))
+        return sorted(found)
+
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used executables until the rest fit in max_bytes. Returns how many were removed.
+        """
+        found = self.entries()
+        size = sum(entry_size for _, entry_size, _ in found)
+        removed = 0
+        for _, entry_size, path in found:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass # another run removed it
+            size -= entry_size
+            removed += 1
+        if removed:
+            self.count("evictions", removed)
+            log(f"From evict (build_cache.py): Removed {removed} executables, {size} bytes are left", tags=["bc"])
+        return removed
+
+    # Statistics ____________________________________________________________________________________________
+
+    def counts(self) -> _Dict[str, int]:
+        counts = {}
+        for name in STATS:
+            try:
+                counts[name] = os.path.getsize(os.path.join(self.stats_directory, name))
+            except FileNotFoundError:
+                counts[name] = 0
+        return counts
+
+
+    def stats(self) -> _Dict[str, int]:
+        """
+        The counts of all the runs, and the executables/bytes that are in the cache now.
+        """
+        stats = self.counts()
+        found = self.entries()
+        stats["entries"] = len(found)
+        stats["bytes"] = sum(entry_size for _, entry_size, _ in found)
+        return stats
+
+
+    def count(self, name: str, amount: int = 1) -> None:
+        descriptor = os.open(os.path.join(self.stats_directory, name), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(descriptor, b"." * amount)
+        finally:
+            os.close(descriptor)
+
+
+    def report(self) -> str:
+        stats = self.stats()
+        lookups = stats["hits"] + stats["misses"]
+        rate = 100 * stats["hits"] / lookups if lookups else 0.0
+        return (f"Build cache {os.path.dirname(self.directory)}: {stats['hits']} hits, {stats['misses']} misses ({rate:.1f}% hits), "
+                f"{stats['evictions']} evictions, {stats['entries']} executables in {stats['bytes'] / 1024 / 1024:.1f} MiB")
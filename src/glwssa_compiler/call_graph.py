@@ -0,0 +1,215 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, PROGRAM, PROCEDURE, FUNCTION, RESULT
+
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Set as _Set
+from typing import Union as _Union
+
+
+class CallGraph:
+    """
+    Which subprogram calls which, keyed by the symbol id of the subprogram (the program has an id too).
+
+    callees[a] are the subprograms a calls, callers[b] the ones that call b, call_sites[a] the
+    CallProcedure/CallFunction nodes inside a. The builtin functions are not in the graph.
+    impure are the subprograms that reach a ΚΑΛΕΣΕ, ΔΙΑΒΑΣΕ or ΓΡΑΨΕ, in their body or in one they call:
+    a call to an impure ΣΥΝΑΡΤΗΣΗ must run even when its value is not used.
+    """
+    def __init__(self, symbols: SymbolTable, program_id: int) -> None:
+        self.symbols = symbols
+        self.program_id = program_id
+        self.nodes: _Dict[int, _Union[Program, Callable]] = {}
+        self.callees: _Dict[int, _Set[int]] = {}
+        self.callers: _Dict[int, _Set[int]] = {}
+        self.call_sites: _Dict[int, _List[_Union[CallProcedure, CallFunction]]] = {}
+
+        self.reachable: _Set[int] = set()
+        self.impure: _Set[int] = set()
+        self._components: _List[_List[int]] = []
+        self._component_of: _Dict[int, int] = {}
+
+
+    def add_node(self, symbol_id: int, node: _Union[Program, Callable]) -> None:
+        self.nodes[symbol_id] = node
+        self.callees.setdefault(symbol_id, set())
+        self.callers.setdefault(symbol_id, set())
+        self.call_sites.setdefault(symbol_id, [])
+
+
+    def add_call(self, caller: int, callee: int, site: _Union[CallProcedure, CallFunction]) -> None:
+        self.callees[caller].add(callee)
+        self.callers[callee].add(caller)
+        self.call_sites[caller].append(site)
+
+
+    def is_reachable(self, subprogram: Callable) -> bool:
+        return self.symbol_of(subprogram) in self.reachable
+
+
+    def is_pure(self, symbol_id: int) -> bool:
+        return symbol_id not in self.impure
+
+
+    def has_effects(self, node) -> bool:
+        """
+        True if evaluating the expression calls an impure ΣΥΝΑΡΤΗΣΗ.
+        """
+        for child in walk(node):
+            if isinstance(child, CallFunction) and child.symbol_id is not None:
+                symbol = self.symbols[child.symbol_id]
+                if symbol.kind == RESULT: # a recursive call
+                    symbol = self.symbols[self.symbols.global_scope.names[symbol.name]]
+                if symbol.id in self.impure:
+                    return True
+        return False
+
+
+    def symbol_of(self, subprogram: Callable) -> int:
+        return self.symbols.global_scope.names[subprogram.name.value]
+
+
+    def components(self) -> _List[_List[int]]:
+        """
+        The strongly connected components, callees before their callers (bottom-up),
+        so a pass can finish the subprograms a subprogram calls before it looks at it.
+        """
+        return self._components
+
+
+    def is_recursive(self, symbol_id: int) -> bool:
+        """
+        True if the subprogram can call itself, directly or through others.
+        """
+        component = self._components[self._component_of[symbol_id]]
+        return len(component) > 1 or symbol_id in self.callees[symbol_id]
+
+
+    def find_components(self) -> None:
+        """
+        Tarjan's algorithm, without recursion so long call chains do not hit the python limit.
+        """
+        index: _Dict[int, int] = {}
+        low: _Dict[int, int] = {}
+        stack: _List[int] = []
+        on_stack: _Set[int] = set()
+
+        for root in self.nodes:
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.callees[root])))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.callees[child]))))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        self._component_of[member] = len(self._components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    self._components.append(component)
+
+
+    def find_impure(self) -> None:
+        worklist = []
+        for symbol_id, owner in self.nodes.items():
+            if symbol_id == self.program_id:
+                continue
+            if any(isinstance(child, (CallProcedure, Read, Write)) for statement in owner.body for child in walk(statement)):
+                self.impure.add(symbol_id)
+                worklist.append(symbol_id)
+        while worklist:
+            for caller in self.callers[worklist.pop()]:
+                if caller not in self.impure and caller != self.program_id:
+                    self.impure.add(caller)
+                    worklist.append(caller)
+
+
+    def find_reachable(self) -> None:
+        worklist = [self.program_id]
+        self.reachable = {self.program_id}
+        while worklist:
+            for callee in self.callees[worklist.pop()]:
+                if callee not in self.reachable:
+                    self.reachable.add(callee)
+                    worklist.append(callee)
+
+
+def build_call_graph(program: Program, symbols: SymbolTable) -> CallGraph:
+    global_names = symbols.global_scope.names
+    program_id = next(s.id for s in symbols.symbols if s.kind == PROGRAM)
+
+    graph = CallGraph(symbols, program_id)
+    graph.add_node(program_id, program)
+    for subprogram in program.procedures + program.functions:
+        graph.add_node(global_names[subprogram.name.value], subprogram)
+
+    for caller, owner in list(graph.nodes.items()):
+        for node in (child for statement in owner.body for child in walk(statement)):
+            if not isinstance(node, (CallProcedure, CallFunction)) or node.symbol_id is None:
+                continue
+            callee = symbols[node.symbol_id]
+            if callee.kind == RESULT: # the function calls itself, inside it the name is its result
+                callee = symbols[global_names[callee.name]]
+            if callee.kind in {PROCEDURE, FUNCTION}:
+                graph.add_call(caller, callee.id, node)
+
+    graph.find_reachable()
+    graph.find_components()
+    graph.find_impure()
+
+    unused = len(graph.nodes) - len(graph.reachable)
+    log(f"From build_call_graph (call_graph.py): {len(graph.nodes)} nodes, {unused} unreachable subprograms, "
+        f"{len(graph.impure)} impure", tags=["cg"])
+    return graph
+
+
+def remove_unused_subprograms(program: Program, graph: CallGraph) -> bool:
+    """
+    Removes the subprograms the program never calls. Returns True if any were removed.
+    """
+    procedures = [p for p in program.procedures if graph.is_reachable(p)]
+    functions = [f for f in program.functions if graph.is_reachable(f)]
+    removed = len(program.procedures) + len(program.functions) - len(procedures) - len(functions)
+
+    program.procedures[:] = procedures
+    program.functions[:] = functions
+    if removed:
+        log(f"From remove_unused_subprograms (call_graph.py): Removed {removed} subprograms", tags=["cg"])
+    return removed > 0
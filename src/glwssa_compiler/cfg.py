@@ -0,0 +1,835 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The control flow graph of the program: every Program/Procedure/Function becomes basic blocks of
+three-address instructions, the jumps between the blocks take the place of ΑΝ/ΕΠΙΛΕΞΕ/ΟΣΟ/ΓΙΑ/ΜΕΧΡΙΣ_ΟΤΟΥ.
+
+    t1 = gr_A + 1          every operand is a variable or a constant
+    t2 = gr_P[t1]
+    if t3 goto L2 else L3  every block ends with one jump, or the return
+"""
+
+from dataclasses import dataclass, field
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, CONSTANT, PARAMETER, BUILTIN
+from .type_inference import TypeTable
+from .ranges import RangeTable
+from .constant_folding import literal_value
+from .dispatch import plan_dispatch, Decision, NO_BRANCH
+
+from typing import Any as _Any
+from typing import Dict as _Dict
+from typing import FrozenSet as _FrozenSet
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+from typing import Union as _Union
+
+
+# How the pretty printer writes the operators.
+OPERATOR_SYMBOLS = {
+    "PLUS": "+", "MINUS": "-", "MUL": "*", "FDIV": "/", "IDIV": "DIV", "MOD": "MOD", "POW": "^",
+    "EQ": "=", "NEQ": "<>", "GT": ">", "LT": "<", "GTE": ">=", "LTE": "<=",
+    "AND": "ΚΑΙ", "OR": "Ή", "NOT": "ΟΧΙ",
+}
+
+# The temporaries of the lowering, the lexer only makes names that start with gr_/en_.
+TEMP_PREFIX = "t"
+
+# Operands _____________________________________________________________________________________________________
+
+@dataclass(frozen=True)
+class Var:
+    name: str
+    var_type: _Any = field(compare=False)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(frozen=True)
+class Const:
+    value: _Any # int, float, bool or str (without the quotes)
+    var_type: _Any = field(compare=False)
+
+    def __str__(self) -> str:
+        if self.var_type is BoolType:
+            return "ΑΛΗΘΗΣ" if self.value else "ΨΕΥΔΗΣ"
+        if self.var_type is CharType:
+            return f'"{self.value}"'
+        return repr(self.value)
+
+
+@dataclass(frozen=True)
+class Element:
+    """
+    An element of an array as a place: a target of ΔΙΑΒΑΣΕ or an argument of ΚΑΛΕΣΕ.
+    """
+    array: Var
+    indexes: _Tuple[_Union[Var, Const], ...]
+    checked: _Tuple[bool, ...] = field(default=(), compare=False) # the indexes not proven to be in bounds
+
+    def __str__(self) -> str:
+        return f"{self.array}[{', '.join(str(i) for i in self.indexes)}]"
+
+
+Operand = _Union[Var, Const]
+
+
+def names_of(*operands) -> _List[str]:
+    names = []
+    for operand in operands:
+        if isinstance(operand, Var):
+            names.append(operand.name)
+        elif isinstance(operand, Element):
+            names.append(operand.array.name)
+            names.extend(i.name for i in operand.indexes if isinstance(i, Var))
+    return names
+
+# Instructions _________________________________________________________________________________________________
+
+@dataclass
+class Copy:
+    dest: Var
+    value: Operand
+
+    def uses(self): return names_of(self.value)
+    def defs(self): return [self.dest.name]
+    def __str__(self): return f"{self.dest} = {self.value}"
+
+
+@dataclass
+class BinaryOp:
+    dest: Var
+    op: str
+    left: Operand
+    right: Operand
+
+    def uses(self): return names_of(self.left, self.right)
+    def defs(self): return [self.dest.name]
+    def __str__(self): return f"{self.dest} = {self.left} {OPERATOR_SYMBOLS.get(self.op, self.op)} {self.right}"
+
+
+@dataclass
+class UnaryOp:
+    dest: Var
+    op: str
+    operand: Operand
+
+    def uses(self): return names_of(self.operand)
+    def defs(self): return [self.dest.name]
+    def __str__(self): return f"{self.dest} = {OPERATOR_SYMBOLS.get(self.op, self.op)} {self.operand}"
+
+
+@dataclass
+class Load:
+    dest: Var
+    array: Var
+    indexes: _List[Operand]
+    checked: _Tuple[bool, ...] = ()
+
+    def uses(self): return names_of(self.array, *self.indexes)
+    def defs(self): return [self.dest.name]
+    def __str__(self): return f"{self.dest} = {Element(self.array, tuple(self.indexes))}"
+
+
+@dataclass
+class Store:
+    """
+    Writes one element, the rest of the array keeps its value, so the array is used and not defined.
+    """
+    array: Var
+    indexes: _List[Operand]
+    value: Operand
+    checked: _Tuple[bool, ...] = ()
+
+    def uses(self): return names_of(self.array, *self.indexes, self.value)
+    def defs(self): return []
+    def __str__(self): return f"{Element(self.array, tuple(self.indexes))} = {self.value}"
+
+
+@dataclass
+class CallFunc:
+    dest: Var
+    name: str
+    args: _List[Operand]
+    builtin: bool = False
+
+    def uses(self): return names_of(*self.args)
+    def defs(self): return [self.dest.name]
+    def __str__(self): return f"{self.dest} = {self.name}({', '.join(str(a) for a in self.args)})"
+
+
+@dataclass
+class CallProc:
+    """
+    The arguments are places, the procedure reads them and writes them back (copy-in/copy-out).
+    """
+    name: str
+    args: _List[_Union[Var, Element]]
+
+    def uses(self): return names_of(*self.args)
+    def defs(self): return [a.name for a in self.args if isinstance(a, Var)]
+    def __str__(self): return f"ΚΑΛΕΣΕ {self.name}({', '.join(str(a) for a in self.args)})"
+
+
+@dataclass
+class Input:
+    target: _Union[Var, Element]
+
+    def uses(self): return names_of(self.target) if isinstance(self.target, Element) else []
+    def defs(self): return [self.target.name] if isinstance(self.target, Var) else []
+    def __str__(self): return f"ΔΙΑΒΑΣΕ {self.target}"
+
+
+@dataclass
+class Output:
+    values: _List[Operand]
+
+    def uses(self): return names_of(*self.values)
+    def defs(self): return []
+    def __str__(self): return f"ΓΡΑΨΕ {', '.join(str(v) for v in self.values)}"
+
+
+Instruction = _Union[Copy, BinaryOp, UnaryOp, Load, Store, CallFunc, CallProc, Input, Output]
+
+# Terminators __________________________________________________________________________________________________
+
+@dataclass
+class Jump:
+    target: int
+
+    def targets(self): return [self.target]
+    def uses(self): return []
+    def __str__(self): return f"goto L{self.target}"
+
+
+@dataclass
+class CondJump:
+    condition: Operand
+    if_true: int
+    if_false: int
+
+    def targets(self): return [self.if_true, self.if_false]
+    def uses(self): return names_of(self.condition)
+    def __str__(self): return f"if {self.condition} goto L{self.if_true} else L{self.if_false}"
+
+
+@dataclass
+class Return:
+    def targets(self): return []
+    def uses(self): return []
+    def __str__(self): return "return"
+
+
+Terminator = _Union[Jump, CondJump, Return]
+
+# Graph ________________________________________________________________________________________________________
+
+@dataclass
+class BasicBlock:
+    label: int
+    instructions: _List[Instruction] = field(default_factory=list)
+    terminator: _Optional[Terminator] = None
+
+
+@dataclass
+class Declaration:
+    """
+    A variable of the program/subprogram. The constants keep their expression, the arrays their dimensions,
+    these are found before the first block runs.
+    """
+    var: Var
+    value: _Optional[Expression] = None
+    is_param: bool = False
+
+
+class ControlFlowGraph:
+    """
+    The blocks of one Program, Procedure or Function. The label of a block is its index in `blocks`,
+    the first block is the entry.
+    """
+    def __init__(self, node: _Union[Program, Callable], name: str) -> None:
+        self.node = node
+        self.name = name
+        self.blocks: _List[BasicBlock] = []
+        self.declarations: _List[Declaration] = []
+        self.temps: _Dict[str, _Any] = {} # name -> type
+        self.params: _List[str] = []
+        self.result: _Optional[str] = None # the variable a ΣΥΝΑΡΤΗΣΗ returns
+
+        self._predecessors: _Optional[_Dict[int, _List[int]]] = None
+
+
+    @property
+    def entry(self) -> BasicBlock:
+        return self.blocks[0]
+
+
+    def new_block(self) -> BasicBlock:
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        self._predecessors = None
+        return block
+
+
+    def successors(self, label: int) -> _List[int]:
+        terminator = self.blocks[label].terminator
+        return terminator.targets() if terminator is not None else []
+
+
+    def predecessors(self, label: int) -> _List[int]:
+        if self._predecessors is None:
+            self._predecessors = {block.label: [] for block in self.blocks}
+            for block in self.blocks:
+                for successor in self.successors(block.label):
+                    self._predecessors[successor].append(block.label)
+        return self._predecessors[label]
+
+
+    def reverse_postorder(self) -> _List[int]:
+        """
+        The blocks that can be reached from the entry, every block before its successors (except for the back edges).
+        """
+        order = []
+        visited = {0}
+        stack = [(0, iter(self.successors(0)))]
+        while stack:
+            label, successors = stack[-1]
+            successor = next(successors, None)
+            if successor is None:
+                stack.pop()
+                order.append(label)
+            elif successor not in visited:
+                visited.add(successor)
+                stack.append((successor, iter(self.successors(successor))))
+        order.reverse()
+        return order
+
+
+    def instruction_count(self) -> int:
+        return sum(len(block.instructions) + 1 for block in self.blocks)
+
+# Analyses _____________________________________________________________________________________________________
+
+def immediate_dominators(cfg: ControlFlowGraph) -> _Dict[int, int]:
+    """
+    idom[b] is the block closest to b that every path from the entry to b goes through, the entry is its own idom.
+    Cooper, Harvey and Kennedy, "A Simple, Fast Dominance Algorithm". Unreachable blocks are not in the result.
+    """
+    order = cfg.reverse_postorder()
+    position = {label: index for index, label in enumerate(order)}
+    idom = {order[0]: order[0]}
+
+    def intersect(a: int, b: int) -> int:
+        while a != b:
+            while position[a] > position[b]:
+                a = idom[a]
+            while position[b] > position[a]:
+                b = idom[b]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for label in order[1:]:
+            processed = [p for p in cfg.predecessors(label) if p in idom]
+            new_idom = processed[0]
+            for predecessor in processed[1:]:
+                new_idom = intersect(predecessor, new_idom)
+            if idom.get(label) != new_idom:
+                idom[label] = new_idom
+                changed = True
+    return idom
+
+
+def dominates(idom: _Dict[int, int], a: int, b: int) -> bool:
+    """
+    True if every path from the entry to b goes through a (a block dominates itself).
+    """
+    while True:
+        if a == b:
+            return True
+        parent = idom.get(b)
+        if parent is None or parent == b:
+            return False
+        b = parent
+
+
+def live_out_at_exit(cfg: ControlFlowGraph) -> _FrozenSet[str]:
+    """
+    A procedure copies its parameters back to the caller, a function returns its result.
+    """
+    names = set()
+    if isinstance(cfg.node, Procedure):
+        names.update(cfg.params)
+    if cfg.result is not None:
+        names.add(cfg.result)
+    return frozenset(names)
+
+
+def liveness(cfg: ControlFlowGraph) -> _Tuple[_Dict[int, _FrozenSet[str]], _Dict[int, _FrozenSet[str]]]:
+    """
+    The variables live at the start (live_in) and at the end (live_out) of every block,
+    found backwards until the sets stop changing.
+    """
+    use: _Dict[int, set] = {}
+    define: _Dict[int, set] = {}
+    for block in cfg.blocks:
+        block_use, block_def = set(), set()
+        for instruction in block.instructions:
+            block_use.update(name for name in instruction.uses() if name not in block_def)
+            block_def.update(instruction.defs())
+        if block.terminator is not None:
+            block_use.update(name for name in block.terminator.uses() if name not in block_def)
+        use[block.label], define[block.label] = block_use, block_def
+
+    exit_live = live_out_at_exit(cfg)
+    live_in = {block.label: frozenset() for block in cfg.blocks}
+    live_out = {block.label: frozenset() for block in cfg.blocks}
+
+    changed = True
+    while changed:
+        changed = False
+        for block in reversed(cfg.blocks):
+            label = block.label
+            if isinstance(block.terminator, Return):
+                out = exit_live
+            else:
+                out = frozenset().union(*(live_in[s] for s in cfg.successors(label)))
+            new_in = frozenset(use[label] | (out - define[label]))
+            if out != live_out[label] or new_in != live_in[label]:
+                live_out[label], live_in[label] = out, new_in
+                changed = True
+    return live_in, live_out
+
+# Printing _____________________________________________________________________________________________________
+
+def format_cfg(cfg: ControlFlowGraph, live: bool = False) -> str:
+    """
+    The blocks as text, for the logs and the tests. With live=True every block shows the variables live at its start.
+    """
+    live_in = liveness(cfg)[0] if live else {}
+    lines = [f"{cfg.name}({', '.join(cfg.params)})"]
+    for block in cfg.blocks:
+        header = f"L{block.label}:"
+        if live:
+            header += f"    ; live: {', '.join(sorted(live_in[block.label]))}"
+        lines.append(header)
+        for instruction in block.instructions:
+            lines.append(f"    {instruction}")
+        lines.append(f"    {block.terminator}")
+    return "\n".join(lines)
+
+# Lowering _____________________________________________________________________________________________________
+
+class CFGBuilder(NodeVisitor):
+    """
+    Lowers the statements of one Program/Procedure/Function into a ControlFlowGraph.
+    The visit_<Statement> methods add instructions to the current block, value() lowers an expression and
+    returns the operand that has its value. ΚΑΙ/Ή jump over their right side, like in the C++ code of the tree.
+    The indexes that the RangeTable does not prove to be in bounds are marked as checked.
+    """
+    def __init__(self, symbols: SymbolTable, types: TypeTable, ranges: _Optional[RangeTable] = None) -> None:
+        super().__init__()
+        self.symbols = symbols
+        self.types = types
+        self.ranges = ranges
+
+
+    def build(self, owner: _Union[Program, Callable]) -> ControlFlowGraph:
+        name = owner.name.value if isinstance(owner, Callable) else "main"
+        self.cfg = ControlFlowGraph(owner, name)
+        self.temp_count = 0
+        self.current = self.cfg.new_block()
+
+        scope = self.symbols.scope_of(owner)
+        self.cfg.params = [self.symbols[i].name for i in scope.params]
+        if isinstance(owner, Function):
+            self.cfg.result = owner.name.value
+
+        for statement in owner.body:
+            self.visit(statement)
+        self.finish(Return())
+        return self.cfg
+
+
+    def finish(self, terminator: Terminator) -> None:
+        self.current.terminator = terminator
+
+
+    def start(self, block: BasicBlock) -> None:
+        self.current = block
+
+
+    def emit(self, instruction: Instruction) -> None:
+        self.current.instructions.append(instruction)
+
+
+    def temp(self, var_type) -> Var:
+        self.temp_count += 1
+        name = f"{TEMP_PREFIX}{self.temp_count}"
+        self.cfg.temps[name] = var_type
+        return Var(name, var_type)
+
+
+    def variable(self, name: str, symbol_id: _Optional[int]) -> Var:
+        if symbol_id is None:
+            return Var(name, None)
+        symbol = self.symbols[symbol_id]
+        var_type = self.types.symbol_type(symbol_id) if symbol.kind == CONSTANT else symbol.var_type
+        return Var(symbol.name, var_type)
+
+    # Expressions __________________________________________________________________________________________
+
+    def value(self, node: Expression) -> Operand:
+        node_type = type(node)
+        if node_type in (Number, Float, Boolean):
+            return Const(literal_value(node), self.types.type_of(node))
+        if node_type is String:
+            return Const(node.value[1:-1], CharType)
+        if node_type is Parentheses:
+            return self.value(node.exrpession)
+        if node_type is Variable:
+            return self.variable(node.name, node.symbol_id)
+
+        if node_type is ArrayIndex:
+            indexes = [self.value(index) for index in node.index_dim]
+            dest = self.temp(self.types.type_of(node))
+            self.emit(Load(dest, self.variable(node.name, node.symbol_id), indexes, self.checked(node.index_dim)))
+            return dest
+
+        if node_type is BinaryOperation:
+            if node.operator in {"AND", "OR"}:
+                return self.short_circuit(node)
+            left = self.value(node.left)
+            right = self.value(node.right)
+            dest = self.temp(self.types.type_of(node))
+            self.emit(BinaryOp(dest, node.operator, left, right))
+            return dest
+
+        if node_type is UnaryOperator:
+            operand = self.value(node.operand)
+            dest = self.temp(self.types.type_of(node))
+            self.emit(UnaryOp(dest, node.operator, operand))
+            return dest
+
+        if node_type is CallFunction:
+            args = [self.value(arg) for arg in node.params]
+            dest = self.temp(self.types.type_of(node))
+            symbol = self.symbols[node.symbol_id] # a recursive call finds the RESULT symbol, it has the same name
+            self.emit(CallFunc(dest, symbol.name, args, symbol.kind == BUILTIN))
+            return dest
+
+        raise TypeError(f"No CFG lowering for {node_type.__name__}")
+
+
+    def short_circuit(self, node: BinaryOperation) -> Var:
+        """
+        dest = left; if dest (ΚΑΙ) or if not dest (Ή) then dest = right.
+        """
+        dest = self.temp(BoolType)
+        self.emit(Copy(dest, self.value(node.left)))
+        right_block = self.cfg.new_block()
+        join = self.cfg.new_block()
+        if node.operator == "AND":
+            self.finish(CondJump(dest, right_block.label, join.label))
+        else:
+            self.finish(CondJump(dest, join.label, right_block.label))
+
+        self.start(right_block)
+        self.emit(Copy(dest, self.value(node.right)))
+        self.finish(Jump(join.label))
+        self.start(join)
+        return dest
+
+
+    def place(self, node: _Union[Variable, ArrayIndex]) -> _Union[Var, Element]:
+        """
+        Where ΔΙΑΒΑΣΕ or ΚΑΛΕΣΕ writes.
+        """
+        array = self.variable(node.name, node.symbol_id)
+        if isinstance(node, ArrayIndex):
+            return Element(array, tuple(self.value(i) for i in node.index_dim), self.checked(node.index_dim))
+        if isinstance(node.var_type, ArrayType): # ΔΙΑΒΑΣΕ Π[i]
+            indexes = node.var_type.val_dim
+            return Element(array, tuple(self.value(i) for i in indexes), self.checked(indexes))
+        return array
+
+
+    def checked(self, indexes: list) -> _Tuple[bool, ...]:
+        if self.ranges is None:
+            return tuple(True for _ in indexes)
+        return tuple(not self.ranges.is_proven(index) for index in indexes)
+
+    # Statements ___________________________________________________________________________________________
+
+    def generic_visit(self, node) -> None:
+        log(f"From generic_visit (cfg.py): No CFG lowering for {type(node).__name__}", tags=["cfg"])
+
+
+    def visit_ProgramName(self, node: ProgramName) -> None:
+        pass
+
+
+    def visit_VariableDeclaration(self, node: VariableDeclaration) -> None:
+        variable = node.variable
+        is_param = variable.symbol_id is not None and self.symbols[variable.symbol_id].kind == PARAMETER
+        self.cfg.declarations.append(Declaration(Var(variable.name, variable.var_type), None, is_param))
+
+
+    def visit_ConstantDeclaration(self, node: ConstantDeclaration) -> None:
+        self.cfg.declarations.append(Declaration(Var(node.name, self.types.type_of(node.expr)), node.expr))
+
+
+    def visit_VariableAssignement(self, node: VariableAssignement) -> None:
+        value = self.value(node.expr)
+        target = self.variable(node.target, node.target_id)
+        if node.target_index:
+            indexes = [self.value(i) for i in node.target_index]
+            self.emit(Store(target, indexes, value, self.checked(node.target_index)))
+        else:
+            self.emit(Copy(target, value))
+
+
+    def visit_Write(self, node: Write) -> None:
+        self.emit(Output([self.value(expr) for expr in node.expression]))
+
+
+    def visit_Read(self, node: Read) -> None:
+        # one at a time, ΔΙΑΒΑΣΕ Ι, Π[Ι] uses the Ι it just read
+        for variable in node.variable_list:
+            self.emit(Input(self.place(variable)))
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> None:
+        procedure = self.symbols[node.symbol_id].node
+        param_ids = self.symbols.scope_of(procedure).params
+
+        args = []
+        for arg, param_id in zip(node.params, param_ids):
+            param_type = self.symbols[param_id].var_type
+            if self.is_place(arg) and self.types.type_of(arg) == param_type:
+                args.append(self.place(arg))
+                continue
+            # not a variable of the parameter's type, the procedure gets a copy and what it writes back is lost
+            copy = self.temp(param_type)
+            self.emit(Copy(copy, self.value(arg)))
+            args.append(copy)
+        self.emit(CallProc(node.name, args))
+
+
+    def is_place(self, node: Expression) -> bool:
+        if not isinstance(node, (Variable, ArrayIndex)) or node.symbol_id is None:
+            return False
+        return self.symbols[node.symbol_id].kind not in {CONSTANT, BUILTIN}
+
+
+    def visit_If(self, node: If) -> None:
+        end = self.cfg.new_block()
+        for branch in node.branches:
+            condition = self.value(branch.condition)
+            body = self.cfg.new_block()
+            next_test = self.cfg.new_block()
+            self.finish(CondJump(condition, body.label, next_test.label))
+            self.start(body)
+            self.body(branch.body)
+            self.finish(Jump(end.label))
+            self.start(next_test)
+        if node.else_branch is not None:
+            self.body(node.else_branch)
+        self.finish(Jump(end.label))
+        self.start(end)
+
+
+    def visit_Switch(self, node: Switch) -> None:
+        value = self.value(node.expr)
+        if isinstance(value, Var) and value.name not in self.cfg.temps:
+            # the cases are tested one after the other, the value is the one before the first test
+            copy = self.temp(self.types.type_of(node.expr))
+            self.emit(Copy(copy, value))
+            value = copy
+
+        end = self.cfg.new_block()
+        dispatch = plan_dispatch(node, self.symbols, self.types)
+        if dispatch is not None:
+            self.switch_tree(value, dispatch.tree(), node, end)
+            self.start(end)
+            return
+
+        for branch in node.branches:
+            body = self.cfg.new_block()
+            for case in branch.condition:
+                next_case = self.cfg.new_block()
+                self.case_test(value, case, body.label, next_case.label)
+                self.start(next_case)
+            next_branch = self.current
+            self.start(body)
+            self.body(branch.body)
+            self.finish(Jump(end.label))
+            self.start(next_branch)
+        if node.else_branch is not None:
+            self.body(node.else_branch)
+        self.finish(Jump(end.label))
+        self.start(end)
+
+
+    def switch_tree(self, value: Operand, tree, node: Switch, end: BasicBlock) -> None:
+        """
+        The tests of the decision tree (dispatch.py), every branch is one block that the leaves jump to.
+        """
+        bodies = {}
+        def target(index: int) -> int:
+            if index not in bodies:
+                bodies[index] = self.cfg.new_block()
+            return bodies[index].label
+
+        pending = [(self.current, tree)]
+        while pending:
+            block, test = pending.pop()
+            self.start(block)
+            if not isinstance(test, Decision):
+                self.finish(Jump(target(test)))
+                continue
+            below = self.cfg.new_block() if isinstance(test.below, Decision) else None
+            above = self.cfg.new_block() if isinstance(test.above, Decision) else None
+            condition = self.temp(BoolType)
+            self.emit(BinaryOp(condition, "LT", value, Const(test.bound, IntType)))
+            self.finish(CondJump(condition, below.label if below else target(test.below),
+                                 above.label if above else target(test.above)))
+            pending.extend((child, branch) for child, branch in ((below, test.below), (above, test.above)) if child)
+
+        for index, block in bodies.items():
+            self.start(block)
+            if index == NO_BRANCH:
+                if node.else_branch is not None:
+                    self.body(node.else_branch)
+            else:
+                self.body(node.branches[index].body)
+            self.finish(Jump(end.label))
+
+
+    def case_test(self, value: Operand, case: Expression, match: int, no_match: int) -> None:
+        if isinstance(case, UnaryOperator) and case.operator in {"GT", "LT", "GTE", "LTE"}:
+            test = self.temp(BoolType)
+            self.emit(BinaryOp(test, case.operator, value, self.value(case.operand)))
+            self.finish(CondJump(test, match, no_match))
+        elif isinstance(case, BinaryOperation) and case.operator == "PERIOD":
+            low = self.temp(BoolType)
+            self.emit(BinaryOp(low, "GTE", value, self.value(case.left)))
+            high_block = self.cfg.new_block()
+            self.finish(CondJump(low, high_block.label, no_match))
+            self.start(high_block)
+            high = self.temp(BoolType)
+            self.emit(BinaryOp(high, "LTE", value, self.value(case.right)))
+            self.finish(CondJump(high, match, no_match))
+        else:
+            test = self.temp(BoolType)
+            self.emit(BinaryOp(test, "EQ", value, self.value(case)))
+            self.finish(CondJump(test, match, no_match))
+
+
+    def visit_While(self, node: While) -> None:
+        header = self.cfg.new_block()
+        self.finish(Jump(header.label))
+        self.start(header)
+        condition = self.value(node.condition)
+        body = self.cfg.new_block()
+        end = self.cfg.new_block()
+        self.finish(CondJump(condition, body.label, end.label))
+        self.start(body)
+        self.body(node.body)
+        self.finish(Jump(header.label))
+        self.start(end)
+
+
+    def visit_Do(self, node: Do) -> None:
+        body = self.cfg.new_block()
+        self.finish(Jump(body.label))
+        self.start(body)
+        self.body(node.body)
+        condition = self.value(node.condition)
+        end = self.cfg.new_block()
+        # ΜΕΧΡΙΣ_ΟΤΟΥ: the loop ends when the condition is true
+        self.finish(CondJump(condition, end.label, body.label))
+        self.start(end)
+
+
+    def visit_For(self, node: For) -> None:
+        counter = self.variable(node.counter.name, node.counter.symbol_id)
+        start = self.value(node.from_expr)
+        # ΓΛΩΣΣΑ finds the bounds once, before the loop
+        to = self.fixed(self.value(node.to_expr), node.to_expr)
+        step = self.fixed(self.value(node.step), node.step)
+        self.emit(Copy(counter, start))
+
+        header = self.cfg.new_block()
+        body = self.cfg.new_block()
+        end = self.cfg.new_block()
+        self.finish(Jump(header.label))
+        self.start(header)
+
+        if isinstance(step, Const):
+            test = self.temp(BoolType)
+            self.emit(BinaryOp(test, "GTE" if step.value < 0 else "LTE", counter, to))
+            self.finish(CondJump(test, body.label, end.label))
+        else:
+            # the direction is known only at the run time
+            up, down = self.cfg.new_block(), self.cfg.new_block()
+            positive = self.temp(BoolType)
+            self.emit(BinaryOp(positive, "GT", step, Const(0, IntType)))
+            self.finish(CondJump(positive, up.label, down.label))
+            for block, op in ((up, "LTE"), (down, "GTE")):
+                self.start(block)
+                test = self.temp(BoolType)
+                self.emit(BinaryOp(test, op, counter, to))
+                self.finish(CondJump(test, body.label, end.label))
+
+        self.start(body)
+        self.body(node.body)
+        self.emit(BinaryOp(counter, "PLUS", counter, step))
+        self.finish(Jump(header.label))
+        self.start(end)
+
+
+    def fixed(self, operand: Operand, node: Expression) -> Operand:
+        """
+        A copy of a bound that is a variable, the body might change the variable.
+        """
+        if isinstance(operand, Var) and operand.name not in self.cfg.temps:
+            copy = self.temp(self.types.type_of(node))
+            self.emit(Copy(copy, operand))
+            return copy
+        return operand
+
+
+    def body(self, block: Block) -> None:
+        for statement in block.body:
+            self.visit(statement)
+
+
+def build_cfgs(program: Program, symbols: SymbolTable, types: TypeTable,
+               ranges: _Optional[RangeTable] = None) -> _List[ControlFlowGraph]:
+    """
+    The graph of the program first, then one for every procedure and function.
+    Without the ranges every index is marked as checked.
+    """
+    builder = CFGBuilder(symbols, types, ranges)
+    graphs = [builder.build(owner) for owner in [program] + program.procedures + program.functions]
+    for cfg in graphs:
+        log(f"From build_cfgs (cfg.py): '{cfg.name}' has {len(cfg.blocks)} blocks and "
+            f"{cfg.instruction_count()} instructions", tags=["cfg"])
+    return graphs
@@ -0,0 +1,90 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import List as _List
+from typing import TextIO as _TextIO
+
+
+INDENT = "    "
+FLUSH_LINES = 1024 # the lines are given to the stream in groups, a write for every line costs more
+
+
+class CodeWriter:
+    """
+    Writes the lines of the generated code to a stream (an open file, io.StringIO) as they are made, at most
+    FLUSH_LINES of them wait in memory, never the whole program. The writer keeps the indentation, the backend
+    only says where a block starts and ends. flush() must be called at the end.
+    """
+    def __init__(self, stream: _TextIO, indent: str = INDENT) -> None:
+        self.stream = stream
+        self.indent_unit = indent
+        self.depth = 0
+        self.line_count = 0
+        self._prefixes: _List[str] = [""] # depth -> the spaces, made once
+        self._prefix = ""                 # of the current depth
+        self._pending: _List[str] = []
+
+
+    def prefix(self, depth: int) -> str:
+        while len(self._prefixes) <= depth:
+            self._prefixes.append(self._prefixes[-1] + self.indent_unit)
+        return self._prefixes[depth]
+
+
+    def line(self, text: str = "") -> None:
+        """
+        One line at the current depth, an empty text is an empty line without spaces.
+        """
+        pending = self._pending
+        pending.append(f"{self._prefix}{text}\n" if text else "\n")
+        if len(pending) >= FLUSH_LINES:
+            self.flush()
+
+
+    def label(self, text: str) -> None:
+        """
+        A line one level to the left (the labels of the gotos).
+        """
+        self._pending.append(f"{self.prefix(max(self.depth - 1, 0))}{text}\n")
+
+
+    def raw(self, text: str) -> None:
+        """
+        Text that is written as it is (the prelude), it must end with a new line.
+        """
+        self._pending.append(text)
+
+
+    def flush(self) -> None:
+        text = "".join(self._pending)
+        self.line_count += text.count("\n")
+        self.stream.write(text)
+        self._pending.clear()
+
+
+    def indented(self) -> "CodeWriter":
+        """
+        with writer.indented(): the lines of the block are one level to the right.
+        The writer is its own context manager, a generator one costs more than the lines of a small block.
+        """
+        return self
+
+
+    def __enter__(self) -> None:
+        self.depth += 1
+        self._prefix = self.prefix(self.depth)
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.depth -= 1
+        self._prefix = self.prefix(self.depth)
@@ -0,0 +1,273 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+import copy
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable
+
+from typing import Any as _Any
+from typing import Dict as _Dict
+from typing import Optional as _Optional
+
+
+# The ΑΚΕΡΑΙΕΣ are 64 bit in the generated C++, a result outside of this range is left for the run time.
+INT_MIN = -(2 ** 63)
+INT_MAX = 2 ** 63 - 1
+
+NOT_A_LITERAL = object()
+
+
+def literal_value(node) -> _Any:
+    """
+    The python value of a Number/Float/Boolean node (int, float, bool), NOT_A_LITERAL for anything else.
+    Strings are not folded, their value still has the quotes.
+    """
+    node_type = type(node)
+    if node_type is Number:
+        return int(node.value)
+    if node_type is Float:
+        return float(node.value)
+    if node_type is Boolean:
+        return node.value in ("true", True)
+    return NOT_A_LITERAL
+
+
+def make_literal(value) -> _Optional[Expression]:
+    """
+    The node of a python value, or None if the value can not be written in the generated code.
+    """
+    if isinstance(value, bool):
+        return Boolean("true" if value else "false")
+    if isinstance(value, int):
+        if not INT_MIN <= value <= INT_MAX:
+            return None
+        return Number(str(value))
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return Float(repr(value))
+    return None
+
+
+def glwssa_div(a: int, b: int) -> int:
+    """
+    DIV of ΓΛΩΣΣΑ: the quotient is truncated towards zero (like C++), python's // rounds down.
+    """
+    quotient = abs(a) // abs(b)
+    return quotient if (a >= 0) == (b >= 0) else -quotient
+
+
+def glwssa_mod(a: int, b: int) -> int:
+    """
+    MOD of ΓΛΩΣΣΑ: a - (a DIV b) * b, so the remainder has the sign of a (like C++).
+    """
+    return a - glwssa_div(a, b) * b
+
+
+def fold_binary(op: str, a, b) -> _Any:
+    """
+    Returns the value of `a op b` or NOT_A_LITERAL if it must be left for the run time
+    (division by zero, wrong types, a complex number etc).
+    """
+    numeric = not isinstance(a, bool) and not isinstance(b, bool)
+    ints = numeric and isinstance(a, int) and isinstance(b, int)
+
+    if op in {"AND", "OR"}:
+        if not (isinstance(a, bool) and isinstance(b, bool)):
+            return NOT_A_LITERAL
+        return (a and b) if op == "AND" else (a or b)
+
+    if op in {"EQ", "NEQ"}:
+        if numeric or (isinstance(a, bool) and isinstance(b, bool)):
+            return (a == b) if op == "EQ" else (a != b)
+        return NOT_A_LITERAL
+
+    if not numeric:
+        return NOT_A_LITERAL
+
+    if op == "GT":
+        return a > b
+    if op == "LT":
+        return a < b
+    if op == "GTE":
+        return a >= b
+    if op == "LTE":
+        return a <= b
+
+    if op == "PLUS":
+        return a + b
+    if op == "MINUS":
+        return a - b
+    if op == "MUL":
+        return a * b
+    if op == "FDIV":
+        return float(a) / float(b) if b != 0 else NOT_A_LITERAL
+
+    if op in {"IDIV", "MOD"}:
+        if not ints or b == 0:
+            return NOT_A_LITERAL
+        return glwssa_div(a, b) if op == "IDIV" else glwssa_mod(a, b)
+
+    if op == "POW":
+        if ints:
+            if b < 0 or b > 64 and abs(a) > 1:
+                return NOT_A_LITERAL
+            return a ** b
+        if a == 0 and b < 0:
+            return NOT_A_LITERAL
+        try:
+            result = math.pow(a, b)
+        except (ValueError, OverflowError): # (-8) ^ 0.5
+            return NOT_A_LITERAL
+        return result
+
+    return NOT_A_LITERAL
+
+
+class ConstantFolder(NodeTransformer):
+    """
+    Folds every BinaryOperation/UnaryOperator that only has literals under it, and puts the value of
+    the ΣΤΑΘΕΡΕΣ where they are used (so Π[Ν] with Ν = 10 becomes Π[10]).
+    """
+    def __init__(self, symbols: _Optional[SymbolTable] = None) -> None:
+        super().__init__()
+        self.symbols = symbols
+        self.constants: _Dict[int, Expression] = {} # symbol id -> the literal value of the constant
+        self.scope = None
+        self.changed = False
+
+
+    def fold(self, program: Program) -> bool:
+        for owner in [program] + program.procedures + program.functions:
+            if self.symbols is not None:
+                self.scope = self.symbols.scope_of(owner)
+            # the constants are declared before they are used, so one pass in order is enough
+            self.visit_body(owner.body)
+        return self.changed
+
+
+    def visit_body(self, body: list) -> None:
+        for index, node in enumerate(body):
+            body[index] = self.visit(node)
+
+
+    def visit_ConstantDeclaration(self, node: ConstantDeclaration) -> ConstantDeclaration:
+        node.expr = self.visit(node.expr)
+        if self.scope is not None and literal_value(node.expr) is not NOT_A_LITERAL:
+            symbol_id = self.scope.names.get(node.name)
+            if symbol_id is not None:
+                self.constants[symbol_id] = node.expr
+        return node
+
+
+    def visit_target(self, node: Expression) -> Expression:
+        """
+        A variable that is written (ΔΙΑΒΑΣΕ, the arguments of ΚΑΛΕΣΕ) keeps its name, only its indexes are folded.
+        """
+        if isinstance(node, Variable):
+            return self.generic_visit(node)
+        return self.visit(node)
+
+
+    def visit_Read(self, node: Read) -> Read:
+        node.variable_list = [self.visit_target(variable) for variable in node.variable_list]
+        return node
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> CallProcedure:
+        node.params = [self.visit_target(param) for param in node.params]
+        return node
+
+
+    def visit_Variable(self, node: Variable) -> Expression:
+        if node.symbol_id is not None and node.symbol_id in self.constants:
+            self.changed = True
+            return copy.copy(self.constants[node.symbol_id])
+        return self.generic_visit(node)
+
+
+    def visit_BinaryOperation(self, node: BinaryOperation) -> Expression:
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+
+        left = literal_value(node.left)
+        right = literal_value(node.right)
+
+        if left is NOT_A_LITERAL or right is NOT_A_LITERAL:
+            return self.fold_partial(node, left, right)
+
+        if node.operator == "PERIOD": # ΠΕΡΙΠΤΩΣΗ 1..5 stays a range
+            return node
+
+        folded = make_literal(fold_binary(node.operator, left, right))
+        if folded is None:
+            return node
+
+        log(f"From visit_BinaryOperation (constant_folding.py): Folded {node} into {folded}", tags=["cf"])
+        self.changed = True
+        return folded
+
+
+    def fold_partial(self, node: BinaryOperation, left, right) -> Expression:
+        """
+        Only one side is a literal. ΚΑΙ/Ή are folded when the result does not depend on the other side,
+        the left side only when it is the literal, so nothing that would run is removed.
+        """
+        op = node.operator
+        if op not in {"AND", "OR"}:
+            return node
+
+        absorbing = op == "OR" # true Ή x = true, false ΚΑΙ x = false
+        if isinstance(left, bool):
+            self.changed = True
+            return node.left if left == absorbing else node.right
+        if isinstance(right, bool) and right != absorbing: # x ΚΑΙ true = x, x Ή false = x
+            self.changed = True
+            return node.left
+        return node
+
+
+    def visit_UnaryOperator(self, node: UnaryOperator) -> Expression:
+        node.operand = self.visit(node.operand)
+        value = literal_value(node.operand)
+        if value is NOT_A_LITERAL:
+            return node
+
+        folded = None
+        if node.operator == "MINUS" and not isinstance(value, bool):
+            folded = make_literal(-value)
+        elif node.operator == "NOT" and isinstance(value, bool):
+            folded = make_literal(not value)
+
+        if folded is None: # the ΠΕΡΙΠΤΩΣΗ >10 operators
+            return node
+        self.changed = True
+        return folded
+
+
+    def visit_Parentheses(self, node: Parentheses) -> Expression:
+        node.exrpession = self.visit(node.exrpession)
+        if literal_value(node.exrpession) is not NOT_A_LITERAL:
+            self.changed = True
+            return node.exrpession
+        return node
+
+
+def fold_constants(program: Program, symbols: _Optional[SymbolTable] = None) -> bool:
+    """
+    Returns True if anything was folded. Without the symbol table the ΣΤΑΘΕΡΕΣ are not propagated.
+    """
+    return ConstantFolder(symbols).fold(program)
@@ -0,0 +1,274 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable
+from .type_inference import TypeTable
+from .call_graph import CallGraph, build_call_graph
+
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+from typing import Tuple as _Tuple
+
+
+# The temporaries start with this, the lexer only makes names that start with gr_/en_.
+CSE_PREFIX = "cse"
+
+# a op b is b op a, the operands are put in one order so both get the same number
+COMMUTATIVE = {"PLUS", "MUL", "EQ", "NEQ"}
+
+# The statements that run one after the other, a basic block is a run of them.
+STRAIGHT_LINE = (VariableAssignement, Write, Read, CallProcedure)
+
+
+class Replacer(NodeTransformer):
+    """
+    Puts the temporaries where the repeated expressions were, the nodes are found by identity.
+    The bodies of the loops/ΑΝ are other blocks, they are not entered.
+    """
+    def __init__(self, replacements: _Dict[int, str]) -> None:
+        super().__init__()
+        self.replacements = replacements
+
+
+    def visit(self, node):
+        name = self.replacements.get(id(node))
+        if name is not None:
+            return Variable(name, None)
+        return super().visit(node)
+
+
+    def visit_Block(self, node: Block) -> Block:
+        return node
+
+
+class CommonSubexpressionEliminator:
+    """
+    Local value numbering: every expression of a basic block gets a number, two expressions get the same number
+    if they have the same operator and their operands have the same numbers. A variable's number changes when
+    it is written (assignment, ΔΙΑΒΑΣΕ, argument of ΚΑΛΕΣΕ), so an expression after the write is a new value.
+
+    A call of an impure ΣΥΝΑΡΤΗΣΗ (CallGraph.impure) always gets a new number, it runs every time it is written.
+
+    A number that is computed more than once goes into a temporary, assigned before the statement where it is
+    first computed. That first time must be one that always runs (not on the right of ΚΑΙ/Ή), the later ones can be anywhere.
+    The biggest repeated expressions are taken first, the parts of their copies are not counted again.
+
+    The numbers are small tuples of ints looked up in one dict, so a block is done in time linear to its size.
+    """
+    def __init__(self, symbols: SymbolTable, types: TypeTable, graph: CallGraph) -> None:
+        self.symbols = symbols
+        self.types = types
+        self.graph = graph
+        self.count = 0
+        self.names: _Set[str] = set()
+        self.declarations: _List[Statement] = []
+        self.changed = False
+
+
+    def eliminate(self, program: Program) -> bool:
+        for owner in [program] + program.procedures + program.functions:
+            self.names = set(self.symbols.scope_of(owner).names)
+            self.declarations = []
+            self.visit_body(owner.body)
+            insert_declarations(owner.body, self.declarations)
+        return self.changed
+
+
+    def visit_body(self, body: list) -> None:
+        new_body = []
+        block = []
+        for statement in body:
+            block.append(statement)
+            if isinstance(statement, STRAIGHT_LINE):
+                continue
+            # an ΑΝ/ΕΠΙΛΕΞΕ/loop ends the block, what it evaluates before its body is still part of it
+            new_body.extend(self.eliminate_block(block))
+            block = []
+            for child in iter_child_nodes(statement):
+                if isinstance(child, Block):
+                    self.visit_body(child.body)
+                elif isinstance(child, Branch):
+                    self.visit_body(child.body.body)
+        new_body.extend(self.eliminate_block(block))
+        body[:] = new_body
+
+    # Numbering _____________________________________________________________________________________________
+
+    def uses(self, statement) -> _List[_Tuple[Expression, bool]]:
+        """
+        The expressions the statement evaluates before it writes anything, with True if they always run.
+        """
+        if isinstance(statement, VariableAssignement):
+            return [(index, True) for index in statement.target_index] + [(statement.expr, True)]
+        if isinstance(statement, Write):
+            return [(expression, True) for expression in statement.expression]
+        if isinstance(statement, CallProcedure):
+            # a whole argument is copied back by the procedure, only its parts can be replaced
+            return [(child, True) for arg in statement.params for child in iter_child_nodes(arg)]
+        if isinstance(statement, If):
+            return [(statement.branches[0].condition, True)]
+        if isinstance(statement, Switch):
+            return [(statement.expr, True)]
+        if isinstance(statement, For):
+            return [(statement.from_expr, True), (statement.to_expr, True), (statement.step, True)]
+        return [] # ΔΙΑΒΑΣΕ reads its indexes between the values it reads
+
+
+    def writes(self, statement) -> _List[str]:
+        if isinstance(statement, VariableAssignement):
+            return [statement.target]
+        if isinstance(statement, Read):
+            return [variable.name for variable in statement.variable_list]
+        if isinstance(statement, CallProcedure):
+            return [arg.name for arg in statement.params if isinstance(arg, (Variable, ArrayIndex))]
+        return []
+
+
+    def value_number(self, key: tuple) -> int:
+        number = self.numbers.get(key)
+        if number is None:
+            number = self.numbers[key] = len(self.numbers)
+        return number
+
+
+    def number(self, node, always: bool) -> int:
+        """
+        The value number of the expression. The expressions worth a temporary are recorded in `occurrences`.
+        """
+        if isinstance(node, Parentheses):
+            return self.number(node.exrpession, always)
+        if isinstance(node, Literal):
+            return self.value_number(("literal", type(node).__name__, node.value))
+        if isinstance(node, Variable):
+            if isinstance(node.var_type, ArrayType): # an element of ΔΙΑΒΑΣΕ
+                return self.value_number(("node", id(node)))
+            return self.value_number(("variable", node.name, self.versions.get(node.name, 0)))
+
+        if isinstance(node, BinaryOperation):
+            left = self.number(node.left, always)
+            right = self.number(node.right, always and node.operator not in {"AND", "OR"})
+            if node.operator in COMMUTATIVE and right < left:
+                left, right = right, left
+            key = ("binary", node.operator, left, right)
+            size = 1 + self.sizes.get(left, 1) + self.sizes.get(right, 1)
+        elif isinstance(node, UnaryOperator):
+            operand = self.number(node.operand, always)
+            if operand not in self.sizes: # -Χ is cheaper than a temporary
+                return self.value_number(("unary", node.operator, operand))
+            key = ("unary", node.operator, operand)
+            size = 1 + self.sizes[operand]
+        elif isinstance(node, ArrayIndex):
+            indexes = tuple(self.number(index, always) for index in node.index_dim)
+            key = ("element", node.name, self.versions.get(node.name, 0)) + indexes
+            size = 1 + sum(self.sizes.get(index, 1) for index in indexes)
+        elif isinstance(node, CallFunction):
+            args = tuple(self.number(arg, always) for arg in node.params)
+            if self.graph.has_effects(node): # every call of an impure ΣΥΝΑΡΤΗΣΗ must run
+                return self.value_number(("node", id(node)))
+            key = ("call", node.name) + args
+            size = 1 + sum(self.sizes.get(arg, 1) for arg in args)
+        else:
+            return self.value_number(("node", id(node)))
+
+        number = self.value_number(key)
+        self.sizes[number] = size
+        self.occurrences.setdefault(number, []).append(node)
+        self.position[id(node)] = (self.statement_index, len(self.position), always)
+        return number
+
+    # Replacing _____________________________________________________________________________________________
+
+    def eliminate_block(self, block: list) -> list:
+        self.numbers: _Dict[tuple, int] = {}
+        self.sizes: _Dict[int, int] = {}
+        self.versions: _Dict[str, int] = {}
+        self.occurrences: _Dict[int, _List[Expression]] = {}
+        self.position: _Dict[int, _Tuple[int, int, bool]] = {} # id(node) -> (statement, order of evaluation, always runs)
+
+        for index, statement in enumerate(block):
+            self.statement_index = index
+            for root, always in self.uses(statement):
+                self.number(root, always)
+            for name in self.writes(statement):
+                self.versions[name] = self.versions.get(name, 0) + 1
+
+        repeated = [n for n, nodes in self.occurrences.items() if len(nodes) > 1]
+        if not repeated:
+            return block
+        repeated.sort(key=lambda n: -self.sizes[n])
+
+        removed: _Set[int] = set() # the parts of the copies that a temporary took the place of
+        replacements: _Dict[int, str] = {}
+        definitions = []
+        for number in repeated:
+            alive = [node for node in self.occurrences[number] if id(node) not in removed]
+            if len(alive) < 2 or not self.position[id(alive[0])][2]:
+                continue
+            var_type = self.types.type_of(alive[0])
+            if var_type not in (IntType, RealType, BoolType):
+                continue # a std::string copy costs more than it saves
+
+            name = self.temporary(var_type)
+            for node in alive[1:]:
+                removed.update(id(child) for child in walk(node) if child is not node)
+            for node in alive:
+                replacements[id(node)] = name
+            statement_index, order, _ = self.position[id(alive[0])]
+            definitions.append((statement_index, order, name, alive[0]))
+
+        if not definitions:
+            return block
+
+        replacer = Replacer(replacements)
+        for _, _, _, node in definitions:
+            replacer.generic_visit(node) # the parts of the kept expression can be temporaries too
+        block = [replacer.visit(statement) for statement in block]
+
+        # the parts before the expressions they are in
+        definitions.sort(key=lambda d: (d[0], d[1]))
+        new_block = []
+        pending = iter(definitions)
+        definition = next(pending, None)
+        for index, statement in enumerate(block):
+            while definition is not None and definition[0] == index:
+                new_block.append(VariableAssignement(definition[2], definition[3]))
+                definition = next(pending, None)
+            new_block.append(statement)
+
+        log(f"From eliminate_block (cse.py): {len(definitions)} repeated expressions in a block of {len(block)}", tags=["cse"])
+        return new_block
+
+
+    def temporary(self, var_type) -> str:
+        self.count += 1
+        while f"{CSE_PREFIX}{self.count}" in self.names:
+            self.count += 1
+        name = f"{CSE_PREFIX}{self.count}"
+        self.declarations.append(VariableDeclaration(Variable(name, var_type)))
+        self.changed = True
+        return name
+
+
+def eliminate_common_subexpressions(program: Program, symbols: SymbolTable, types: TypeTable,
+                                    graph: _Optional[CallGraph] = None) -> bool:
+    """
+    Returns True if any expression was replaced. The new temporaries are declared, so the symbol table must be built again.
+    Without the graph it is built here.
+    """
+    if graph is None:
+        graph = build_call_graph(program, symbols)
+    return CommonSubexpressionEliminator(symbols, types, graph).eliminate(program)
@@ -60,3 +60,32 @@ class ScopeNotClosed(Diagnostic):
 class CommandOutOfPlace(Diagnostic):
     command: Token
 
+
+# Semantic analyzer diagnostics, they have no token because the tree does not keep the tokens.
+@dataclass(frozen=True)
+class UndefinedVariable(Diagnostic):
+    name: str
+    scope: str
+
+
+@dataclass(frozen=True)
+class WrongType(Diagnostic):
+    expected: str
+    got: str
+    context: str
+    scope: str
+
+
+@dataclass(frozen=True)
+class WrongArgumentCount(Diagnostic):
+    name: str
+    expected: int
+    got: int
+    scope: str
+
+
+# Warnings, the program is still translated.
+@dataclass(frozen=True)
+class UsedBeforeAssignment(Diagnostic):
+    name: str
+    scope: str
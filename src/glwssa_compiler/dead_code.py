@@ -0,0 +1,319 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .ast_nodes import *
+from .constant_folding import literal_value, fold_binary, NOT_A_LITERAL
+from .symbol_table import SymbolTable, RESULT
+from .call_graph import CallGraph, build_call_graph
+
+from typing import FrozenSet as _FrozenSet
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+
+
+def case_matches(case: Expression, value) -> _Optional[bool]:
+    """
+    Does the ΠΕΡΙΠΤΩΣΗ `case` match the literal value of the ΕΠΙΛΕΞΕ?
+    None if it can not be known before the run time.
+    """
+    if isinstance(case, UnaryOperator) and case.operator in {"GT", "LT", "GTE", "LTE"}:
+        operator, bound = case.operator, literal_value(case.operand)
+        if bound is NOT_A_LITERAL:
+            return None
+        result = fold_binary(operator, value, bound)
+
+    elif isinstance(case, BinaryOperation) and case.operator == "PERIOD":
+        low, high = literal_value(case.left), literal_value(case.right)
+        if low is NOT_A_LITERAL or high is NOT_A_LITERAL:
+            return None
+        above, below = fold_binary("GTE", value, low), fold_binary("LTE", value, high)
+        if above is NOT_A_LITERAL or below is NOT_A_LITERAL:
+            return None
+        return above and below
+
+    else:
+        case_value = literal_value(case)
+        if case_value is NOT_A_LITERAL:
+            return None
+        result = fold_binary("EQ", value, case_value)
+
+    return None if result is NOT_A_LITERAL else result
+
+
+def case_never_matches(case: Expression) -> bool:
+    """
+    A range with the low bound above the high one (ΠΕΡΙΠΤΩΣΗ 5..1) can not match anything.
+    """
+    if isinstance(case, BinaryOperation) and case.operator == "PERIOD":
+        result = fold_binary("GT", literal_value(case.left), literal_value(case.right))
+        return result is True
+    return False
+
+
+def is_empty(block: _Optional[Block]) -> bool:
+    return block is None or not block.body
+
+
+def used_symbols(node, used: _Optional[_Set[int]] = None) -> _Set[int]:
+    """
+    The ids of the variables that are read in the expression.
+    """
+    if used is None:
+        used = set()
+    for child in walk(node):
+        if isinstance(child, (Variable, ArrayIndex)) and child.symbol_id is not None:
+            used.add(child.symbol_id)
+    return used
+
+
+class DeadBranchEliminator(NodeTransformer):
+    """
+    Removes the branches of ΑΝ/ΕΠΙΛΕΞΕ whose condition is a literal ΨΕΥΔΗΣ or can never match,
+    the ΟΣΟ ΨΕΥΔΗΣ loops, and turns a branch that is always taken into its plain body.
+    """
+    def __init__(self, graph: CallGraph) -> None:
+        super().__init__()
+        self.graph = graph
+        self.changed = False
+
+
+    def visit_If(self, node: If):
+        self.generic_visit(node)
+
+        branches = []
+        else_branch = node.else_branch
+        for branch in node.branches:
+            value = literal_value(branch.condition)
+            if value is False:
+                continue
+            if value is True:
+                # the rest of the ΑΛΛΙΩΣ_ΑΝ and the ΑΛΛΙΩΣ can not be reached
+                else_branch = branch.body
+                break
+            branches.append(branch)
+
+        if len(branches) != len(node.branches) or else_branch is not node.else_branch:
+            self.changed = True
+            log(f"From visit_If (dead_code.py): Removed {len(node.branches) - len(branches)} dead branches", tags=["dce"])
+
+        if not branches:
+            self.changed = True
+            return [] if else_branch is None else else_branch.body
+
+        if all(is_empty(branch.body) for branch in branches) and is_empty(else_branch):
+            if not any(self.graph.has_effects(branch.condition) for branch in branches):
+                self.changed = True
+                return []
+
+        node.branches = branches
+        node.else_branch = else_branch
+        return node
+
+
+    def visit_Switch(self, node: Switch):
+        self.generic_visit(node)
+
+        value = literal_value(node.expr)
+        branches = []
+        for branch in node.branches:
+            cases = [case for case in branch.condition if not case_never_matches(case)]
+
+            if value is not NOT_A_LITERAL:
+                matches = [case_matches(case, value) for case in cases]
+                if any(match is True for match in matches) and not branches:
+                    # the first branch that can match does match, ΕΠΙΛΕΞΕ takes only the first one
+                    self.changed = True
+                    return branch.body.body
+                cases = [case for case, match in zip(cases, matches) if match is not False]
+
+            if not cases:
+                self.changed = True
+                continue
+            branch.condition = cases
+            branches.append(branch)
+
+        if not branches:
+            self.changed = True
+            return [] if node.else_branch is None else node.else_branch.body
+
+        if all(is_empty(branch.body) for branch in branches) and is_empty(node.else_branch):
+            if not self.graph.has_effects(node.expr):
+                self.changed = True
+                return []
+
+        node.branches = branches
+        return node
+
+
+    def visit_While(self, node: While):
+        self.generic_visit(node)
+        if literal_value(node.condition) is False:
+            self.changed = True
+            return []
+        return node
+
+
+    def visit_Do(self, node: Do):
+        self.generic_visit(node)
+        # ΜΕΧΡΙΣ_ΟΤΟΥ ΑΛΗΘΗΣ, the body runs exactly once
+        if literal_value(node.condition) is True:
+            self.changed = True
+            return node.body.body
+        return node
+
+
+class DeadStoreEliminator:
+    """
+    Removes the assignments to variables that are not read before they are assigned again
+    (or before the end of the program/subprogram).
+
+    The liveness is computed backwards on the tree, the loops are iterated until the sets stop changing.
+    An assignment that is removed does not make its expression's variables live, so chains of dead
+    assignments are removed in one pass. An assignment whose expression calls an impure ΣΥΝΑΡΤΗΣΗ
+    (one that reaches a ΚΑΛΕΣΕ/ΔΙΑΒΑΣΕ/ΓΡΑΨΕ, see CallGraph) is kept, the rest have no side effects.
+    """
+    def __init__(self, symbols: SymbolTable, graph: CallGraph) -> None:
+        self.symbols = symbols
+        self.graph = graph
+        self.changed = False
+
+
+    def eliminate(self, program: Program) -> bool:
+        self.sweep(program.body, frozenset(), True)
+
+        for subprogram in program.procedures + program.functions:
+            scope = self.symbols.scope_of(subprogram)
+            # the parameters of a procedure are copied back to the caller, the result of a function is returned
+            live_out = set(scope.params) if isinstance(subprogram, Procedure) else set()
+            live_out.update(i for i in scope.names.values() if self.symbols[i].kind == RESULT)
+            self.sweep(subprogram.body, frozenset(live_out), True)
+
+        return self.changed
+
+
+    def sweep(self, body: list, live_after: _FrozenSet[int], remove: bool) -> _FrozenSet[int]:
+        """
+        Returns the variables that are live before the body. With remove it also deletes the dead assignments.
+        """
+        live = set(live_after)
+        kept = []
+        for node in reversed(body):
+            if self.statement(node, live, remove):
+                kept.append(node)
+            elif remove:
+                self.changed = True
+                log(f"From sweep (dead_code.py): Removed dead assignment to '{node.target}'", tags=["dce"])
+
+        if remove and len(kept) != len(body):
+            kept.reverse()
+            body[:] = kept
+        return frozenset(live)
+
+
+    def statement(self, node, live: _Set[int], remove: bool) -> bool:
+        """
+        Updates `live` from after the statement to before it. Returns False if the statement is dead.
+        """
+        if isinstance(node, VariableAssignement):
+            if node.target_id is not None and node.target_id not in live and not self.graph.has_effects(node):
+                return False
+            if not node.target_index:
+                live.discard(node.target_id)
+            used_symbols(node.expr, live)
+            for index in node.target_index:
+                used_symbols(index, live)
+
+        elif isinstance(node, Read):
+            for variable in node.variable_list:
+                if isinstance(variable.var_type, ArrayType):
+                    used_symbols(variable.var_type, live) # the indexes, the array is only partly written
+                else:
+                    live.discard(variable.symbol_id)
+
+        elif isinstance(node, (Write, CallProcedure)):
+            used_symbols(node, live)
+
+        elif isinstance(node, If):
+            after = frozenset(live)
+            live.clear()
+            for branch in node.branches:
+                used_symbols(branch.condition, live)
+                live.update(self.sweep(branch.body.body, after, remove))
+            live.update(self.sweep(node.else_branch.body, after, remove) if node.else_branch else after)
+
+        elif isinstance(node, Switch):
+            after = frozenset(live)
+            live.clear()
+            used_symbols(node.expr, live)
+            for branch in node.branches:
+                for case in branch.condition:
+                    used_symbols(case, live)
+                live.update(self.sweep(branch.body.body, after, remove))
+            live.update(self.sweep(node.else_branch.body, after, remove) if node.else_branch else after)
+
+        elif isinstance(node, While):
+            head = self.loop(node.body, lambda head: used_symbols(node.condition, set(live) | head), remove)
+            live.update(head)
+
+        elif isinstance(node, Do):
+            # the body runs first, then ΜΕΧΡΙΣ_ΟΤΟΥ, then back to the body
+            after = frozenset(live)
+            at_test = self.loop(node.body, lambda head: used_symbols(node.condition, set(after) | head), remove)
+            live.update(self.sweep(node.body.body, at_test, False))
+
+        elif isinstance(node, For):
+            counter = node.counter.symbol_id
+            bounds = used_symbols(node.to_expr, used_symbols(node.step))
+            head = self.loop(node.body, lambda head: set(live) | head | bounds | {counter}, remove)
+            live.difference_update({counter})
+            live.update(head - {counter})
+            live.update(bounds)
+            used_symbols(node.from_expr, live)
+
+        else:
+            used_symbols(node, live)
+
+        return True
+
+
+    def loop(self, body: Block, live_at_test, remove: bool) -> _FrozenSet[int]:
+        """
+        The variables live at the test of a loop whose test is before the body.
+        live_at_test(head) gives the live variables when the test runs, knowing the ones live before the body.
+        """
+        head: _FrozenSet[int] = frozenset()
+        while True:
+            at_test = frozenset(live_at_test(head))
+            new_head = self.sweep(body.body, at_test, False)
+            if new_head <= head:
+                break
+            head = head | new_head
+        at_test = frozenset(live_at_test(head))
+        self.sweep(body.body, at_test, remove)
+        return at_test
+
+
+def eliminate_dead_code(program: Program, symbols: SymbolTable, graph: _Optional[CallGraph] = None) -> bool:
+    """
+    Returns True if anything was removed. The branches go first, so the assignments
+    that only the removed branches read become dead too. Without the graph it is built here.
+    """
+    if graph is None:
+        graph = build_call_graph(program, symbols)
+    branches = DeadBranchEliminator(graph)
+    branches.generic_visit(program) # the bodies of the program and of every subprogram
+
+    stores = DeadStoreEliminator(symbols, graph)
+    return stores.eliminate(program) | branches.changed
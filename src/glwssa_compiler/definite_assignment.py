@@ -0,0 +1,243 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .ast_nodes import *
+from .data import UsedBeforeAssignment
+from .symbol_table import SymbolTable, SymbolScope, CONSTANT, VARIABLE, RESULT
+
+from typing import FrozenSet as _FrozenSet
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+
+
+Assigned = _FrozenSet[str] # the names that have a value on every path to a point of the code
+
+
+class AssignmentTable:
+    """
+    The result of the analysis: the variables/arrays that are written before they are read on every path,
+    the backend declares them without the 0 they start with in ΓΛΩΣΣΑ and the inliner does not set them to 0
+    again for every call.
+    """
+    def __init__(self) -> None:
+        self.written_first: _Set[int] = set() # symbol ids
+        self.warnings: _List[UsedBeforeAssignment] = []
+
+
+    def needs_zero(self, symbol_id: _Optional[int]) -> bool:
+        return symbol_id not in self.written_first
+
+
+class DefiniteAssignment:
+    """
+    Walks the statements in order with the names that are assigned on every path to them. After ΑΝ/ΕΠΙΛΕΞΕ only the
+    names every branch assigned are kept, the body of ΟΣΟ/ΓΙΑ may not run so it adds nothing, ΑΡΧΗ_ΕΠΑΝΑΛΗΨΗΣ runs once.
+    A name that is read when it is not assigned needs its 0, a variable (not an array) also gets a warning.
+    The result of a ΣΥΝΑΡΤΗΣΗ is read when it returns, it is written first if every path assigns it.
+
+    An array is assigned when all of its elements are: a nest of ΓΙΑ ΑΠΟ 1 ΜΕΧΡΙ <dimension> that writes the element
+    of the counters in every repetition (an assignment or ΔΙΑΒΑΣΕ at the top level of the innermost body).
+    The elements are read as they are written, so a read inside the nest still needs the 0.
+    An array that is used whole (assigned, passed to ΚΑΛΕΣΕ/a function) always keeps it, its C++ type must not change.
+    """
+    def __init__(self, symbols: SymbolTable) -> None:
+        self.symbols = symbols
+        self.table = AssignmentTable()
+
+
+    def analyze(self, program: Program) -> AssignmentTable:
+        for owner in [program] + program.procedures + program.functions:
+            self.scope: SymbolScope = self.symbols.scope_of(owner)
+            self.read_first: _Set[int] = set()
+            self.whole: _Set[int] = set()
+            self.warned: _Set[int] = set()
+            end = self.body(owner.body, frozenset())
+
+            for symbol_id in self.scope.names.values():
+                if self.symbols[symbol_id].kind == VARIABLE and symbol_id not in self.read_first | self.whole:
+                    self.table.written_first.add(symbol_id)
+            if isinstance(owner, Function):
+                # the result is read when the function returns
+                result_id = self.scope.names.get(owner.name.value)
+                if result_id is not None and owner.name.value in end and result_id not in self.read_first:
+                    self.table.written_first.add(result_id)
+        log(f"From analyze (definite_assignment.py): {len(self.table.written_first)} variables are written before they are read, "
+            f"{len(self.table.warnings)} warnings", tags=["da"])
+        return self.table
+
+
+    def symbol_of(self, name: str):
+        symbol_id = self.scope.names.get(name)
+        return None if symbol_id is None else self.symbols[symbol_id]
+
+
+    def read(self, name: str, assigned: Assigned) -> None:
+        symbol = self.symbol_of(name)
+        if symbol is None or symbol.kind not in (VARIABLE, RESULT) or name in assigned:
+            return
+        self.read_first.add(symbol.id)
+        if symbol.kind == VARIABLE and not isinstance(symbol.var_type, ArrayType) and symbol.id not in self.warned:
+            self.warned.add(symbol.id)
+            self.table.warnings.append(UsedBeforeAssignment(name, self.scope.name))
+
+    # Expressions ___________________________________________________________________________________________
+
+    def expression(self, node, assigned: Assigned) -> None:
+        for child in walk(node):
+            if isinstance(child, ArrayIndex):
+                self.read(child.name, assigned)
+            elif isinstance(child, Variable) and not isinstance(child.var_type, ArrayType):
+                symbol = self.symbol_of(child.name)
+                if symbol is not None and isinstance(symbol.var_type, ArrayType):
+                    self.whole.add(symbol.id)
+                self.read(child.name, assigned)
+
+
+    def target(self, node, assigned: Assigned) -> None:
+        """
+        The indexes of an element that is written, ΔΙΑΒΑΣΕ Π[Ι] has them in var_type.
+        """
+        indexes = node.var_type.val_dim if isinstance(node.var_type, ArrayType) else getattr(node, "index_dim", [])
+        for index in indexes:
+            self.expression(index, assigned)
+
+    # Statements ____________________________________________________________________________________________
+
+    def body(self, body: list, assigned: Assigned) -> Assigned:
+        for statement in body:
+            assigned = self.statement(statement, assigned)
+        return assigned
+
+
+    def statement(self, node, assigned: Assigned) -> Assigned:
+        if isinstance(node, VariableAssignement):
+            for index in node.target_index:
+                self.expression(index, assigned)
+            self.expression(node.expr, assigned)
+            symbol = self.symbol_of(node.target)
+            if node.target_index:
+                return assigned # one element, the array is assigned by fills()
+            if symbol is not None and isinstance(symbol.var_type, ArrayType):
+                self.whole.add(symbol.id)
+            return assigned | {node.target}
+
+        if isinstance(node, Write):
+            for expression in node.expression:
+                self.expression(expression, assigned)
+            return assigned
+
+        if isinstance(node, Read):
+            for variable in node.variable_list:
+                self.target(variable, assigned)
+                if not isinstance(variable.var_type, ArrayType):
+                    assigned = assigned | {variable.name}
+            return assigned
+
+        if isinstance(node, CallProcedure):
+            # the procedure gets the values of its arguments, so they are read before they are written back
+            for arg in node.params:
+                self.expression(arg, assigned)
+            return assigned | {arg.name for arg in node.params if type(arg) is Variable}
+
+        if isinstance(node, If):
+            exits = []
+            for branch in node.branches:
+                self.expression(branch.condition, assigned)
+                exits.append(self.body(branch.body.body, assigned))
+            exits.append(self.body(node.else_branch.body, assigned) if node.else_branch is not None else assigned)
+            return frozenset.intersection(*exits)
+
+        if isinstance(node, Switch):
+            self.expression(node.expr, assigned)
+            exits = []
+            for branch in node.branches:
+                for case in branch.condition:
+                    self.expression(case, assigned)
+                exits.append(self.body(branch.body.body, assigned))
+            exits.append(self.body(node.else_branch.body, assigned) if node.else_branch is not None else assigned)
+            return frozenset.intersection(*exits)
+
+        if isinstance(node, While):
+            self.expression(node.condition, assigned)
+            self.body(node.body.body, assigned)
+            return assigned
+
+        if isinstance(node, Do):
+            assigned = self.body(node.body.body, assigned)
+            self.expression(node.condition, assigned)
+            return assigned
+
+        if isinstance(node, For):
+            for expression in (node.from_expr, node.to_expr, node.step):
+                self.expression(expression, assigned)
+            self.body(node.body.body, assigned | {node.counter.name})
+            return assigned | {node.counter.name} | self.fills(node, [])
+
+        return assigned
+
+    # Arrays ________________________________________________________________________________________________
+
+    def fills(self, node: For, counters: _List[For]) -> _FrozenSet[str]:
+        """
+        The arrays that the nest of ΓΙΑ writes all the elements of.
+        """
+        if not (type(node.from_expr) is Number and int(node.from_expr.value) == 1
+                and type(node.step) is Number and int(node.step.value) == 1):
+            return frozenset()
+        counters = counters + [node]
+        changed = assigned_names(node.body.body)
+        if any(loop.counter.name in changed or used_names(loop.to_expr) & changed for loop in counters):
+            return frozenset()
+
+        filled = set()
+        for statement in node.body.body:
+            if isinstance(statement, VariableAssignement) and statement.target_index:
+                filled.add(self.filled_array(statement.target, statement.target_index, counters))
+            elif isinstance(statement, Read):
+                for variable in statement.variable_list:
+                    if isinstance(variable.var_type, ArrayType):
+                        filled.add(self.filled_array(variable.name, variable.var_type.val_dim, counters))
+            elif isinstance(statement, For):
+                filled |= self.fills(statement, counters)
+        filled.discard(None)
+        return frozenset(filled)
+
+
+    def filled_array(self, name: str, indexes: list, counters: _List[For]) -> _Optional[str]:
+        """
+        The name of the array if the indexes are the counters of the whole nest, each one going over its dimension.
+        """
+        symbol = self.symbol_of(name)
+        if symbol is None or not isinstance(symbol.var_type, ArrayType) or len(indexes) != len(counters):
+            return None
+        loops = {loop.counter.name: loop for loop in counters}
+        for index, dimension in zip(indexes, symbol.var_type.val_dim):
+            loop = loops.pop(index.name, None) if type(index) is Variable else None
+            if loop is None or not self.same_bound(loop.to_expr, dimension):
+                return None
+        return name
+
+
+    def same_bound(self, bound, dimension) -> bool:
+        if type(bound) is Number and type(dimension) is Number:
+            return int(bound.value) == int(dimension.value)
+        if type(bound) is Variable and type(dimension) is Variable and bound.name == dimension.name:
+            symbol = self.symbol_of(bound.name)
+            return symbol is not None and symbol.kind == CONSTANT
+        return False
+
+
+def analyze_definite_assignment(program: Program, symbols: SymbolTable) -> AssignmentTable:
+    return DefiniteAssignment(symbols).analyze(program)
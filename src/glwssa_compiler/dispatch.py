@@ -0,0 +1,171 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from dataclasses import dataclass
+
+from .ast_nodes import *
+from .symbol_table import SymbolTable, CONSTANT
+from .type_inference import TypeTable
+from .constant_folding import literal_value, INT_MIN, INT_MAX
+
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+from typing import Union as _Union
+
+
+NO_BRANCH = -1 # the values that no case matches, they go to ΠΕΡΙΠΤΩΣΗ ΑΛΛΙΩΣ
+
+# With fewer cases than this the tests are written one after the other, like in the ΓΛΩΣΣΑ code.
+MIN_CASES = 4
+
+# A C++ switch is written when its table has at most this many entries for every range of a case,
+# else the values are found with a decision tree.
+TABLE_SLOTS = 4
+
+Segment = _Tuple[int, int, int] # low, high, the index of the branch (or NO_BRANCH)
+
+
+@dataclass
+class Decision:
+    """
+    A test of the decision tree: the value goes to below if it is < bound, else to above.
+    The leaves are the indexes of the branches.
+    """
+    bound: int
+    below: _Union["Decision", int]
+    above: _Union["Decision", int]
+
+
+@dataclass
+class Dispatch:
+    """
+    segments cover INT_MIN..INT_MAX in order, two segments next to each other never go to the same branch.
+    table is True if the ranges of the cases are dense enough for a C++ switch.
+    """
+    segments: _List[Segment]
+    table: bool
+
+    def cases(self) -> _List[Segment]:
+        return [segment for segment in self.segments if segment[2] != NO_BRANCH]
+
+
+    def tree(self) -> _Union[Decision, int]:
+        return decision_tree(self.segments)
+
+
+def decision_tree(segments: _List[Segment]) -> _Union[Decision, int]:
+    """
+    Splits the segments in the middle, a value is found with log2(len(segments)) tests.
+    """
+    if len(segments) == 1:
+        return segments[0][2]
+    middle = len(segments) // 2
+    return Decision(segments[middle][0], decision_tree(segments[:middle]), decision_tree(segments[middle:]))
+
+
+def constant_value(node, symbols: SymbolTable):
+    """
+    The value of a literal, -literal or ΣΤΑΘΕΡΑ with a literal value (the cases at -O0 are not folded).
+    """
+    while type(node) is Parentheses:
+        node = node.exrpession
+    if type(node) is UnaryOperator and node.operator == "MINUS":
+        value = constant_value(node.operand, symbols)
+        return -value if type(value) is int else None
+    if type(node) is Variable and node.symbol_id is not None:
+        symbol = symbols[node.symbol_id]
+        if symbol.kind == CONSTANT and isinstance(symbol.node, ConstantDeclaration):
+            return constant_value(symbol.node.expr, symbols)
+    value = literal_value(node)
+    return value if type(value) is int else None
+
+
+def case_range(case: Expression, symbols: SymbolTable) -> _Optional[_Tuple[int, int]]:
+    """
+    The values a case matches as low, high (low > high if none), None if they are not constant.
+    """
+    if isinstance(case, UnaryOperator) and case.operator in {"GT", "LT", "GTE", "LTE"}:
+        value = constant_value(case.operand, symbols)
+        if value is None:
+            return None
+        return {
+            "GT": (value + 1, INT_MAX),
+            "GTE": (value, INT_MAX),
+            "LT": (INT_MIN, value - 1),
+            "LTE": (INT_MIN, value),
+        }[case.operator]
+    if isinstance(case, BinaryOperation) and case.operator == "PERIOD":
+        low, high = constant_value(case.left, symbols), constant_value(case.right, symbols)
+        return None if low is None or high is None else (low, high)
+    value = constant_value(case, symbols)
+    return None if value is None else (value, value)
+
+
+def uncovered(low: int, high: int, taken: _List[Segment]) -> _List[_Tuple[int, int]]:
+    """
+    The parts of low..high that no segment of taken (in order, not overlapping) has.
+    """
+    parts = []
+    for taken_low, taken_high, _ in taken:
+        if taken_high < low or taken_low > high:
+            continue
+        if taken_low > low:
+            parts.append((low, taken_low - 1))
+        low = taken_high + 1
+        if low > high:
+            return parts
+    parts.append((low, high))
+    return parts
+
+
+def plan_dispatch(node: Switch, symbols: SymbolTable, types: TypeTable) -> _Optional[Dispatch]:
+    """
+    The segments of an ΕΠΙΛΕΞΕ on an ΑΚΕΡΑΙΑ whose cases are all constant, None if the tests must stay in order.
+    A value that more than one case matches goes to the first one, like in the chain of tests.
+    """
+    if types.type_of(node.expr) is not IntType or sum(len(branch.condition) for branch in node.branches) < MIN_CASES:
+        return None
+
+    taken: _List[Segment] = []
+    for index, branch in enumerate(node.branches):
+        for case in branch.condition:
+            values = case_range(case, symbols)
+            if values is None:
+                return None
+            low, high = max(values[0], INT_MIN), min(values[1], INT_MAX)
+            if low > high:
+                continue
+            taken.extend((part_low, part_high, index) for part_low, part_high in uncovered(low, high, taken))
+            taken.sort()
+
+    segments: _List[Segment] = []
+    position = INT_MIN
+    for low, high, index in taken + [(INT_MAX + 1, INT_MAX + 1, NO_BRANCH)]:
+        if low > position:
+            segments.append((position, low - 1, NO_BRANCH))
+        if index != NO_BRANCH:
+            segments.append((low, high, index))
+        position = high + 1
+    merged: _List[Segment] = []
+    for segment in segments:
+        if merged and merged[-1][2] == segment[2]:
+            merged[-1] = (merged[-1][0], segment[1], segment[2])
+        else:
+            merged.append(segment)
+
+    cases = [segment for segment in merged if segment[2] != NO_BRANCH]
+    if not cases:
+        return Dispatch(merged, False)
+    span = cases[-1][1] - cases[0][0] + 1
+    return Dispatch(merged, span <= TABLE_SLOTS * len(cases))
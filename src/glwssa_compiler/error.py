@@ -116,6 +116,52 @@ tokens_to_greek = {
 }
 
 
+greek_from_latin = {
+    'TH': 'Θ', 'CH': 'Χ', 'PS': 'Ψ', 'th': 'θ', 'ch': 'χ', 'ps': 'ψ',
+    'A': 'Α', 'B': 'Β', 'G': 'Γ', 'D': 'Δ', 'E': 'Ε', 'Z': 'Ζ', 'H': 'Η', 'I': 'Ι',
+    'K': 'Κ', 'L': 'Λ', 'M': 'Μ', 'N': 'Ν', 'X': 'Ξ', 'O': 'Ο', 'P': 'Π', 'R': 'Ρ',
+    'S': 'Σ', 'T': 'Τ', 'Y': 'Υ', 'F': 'Φ', 'W': 'Ω',
+    'a': 'α', 'b': 'β', 'g': 'γ', 'd': 'δ', 'e': 'ε', 'z': 'ζ', 'h': 'η', 'i': 'ι',
+    'k': 'κ', 'l': 'λ', 'm': 'μ', 'n': 'ν', 'x': 'ξ', 'o': 'ο', 'p': 'π', 'r': 'ρ',
+    's': 'σ', 't': 'τ', 'y': 'υ', 'f': 'φ', 'w': 'ω',
+}
+
+
+def display_name(name: str) -> str:
+    """
+    The lexer renames the identifiers (ΑΓ -> gr_AG, x -> en_x). This gives back the name the user wrote,
+    for the error messages of the passes that only have the tree.
+    (ΠΣ and ΤΗ come back as Ψ and Θ, the lexer makes them the same as Ψ and Θ.)
+    """
+    if name.startswith("en_"):
+        return name[3:]
+    if not name.startswith("gr_"):
+        return name
+
+    name = name[3:]
+    result = []
+    i = 0
+    while i < len(name):
+        pair = greek_from_latin.get(name[i:i + 2]) if len(name[i:i + 2]) == 2 else None
+        if pair:
+            result.append(pair)
+            i += 2
+        else:
+            result.append(greek_from_latin.get(name[i], name[i]))
+            i += 1
+    return "".join(result)
+
+
+def display_name_in(text: str) -> str:
+    """
+    display_name for every 'name' in quotes inside a message.
+    """
+    parts = text.split("'")
+    for i in range(1, len(parts), 2):
+        parts[i] = display_name(parts[i])
+    return "'".join(parts)
+
+
 def DebugIssue():
     """
     Small abstraction for the message below, for every instance of an Internal Compiler Error.
@@ -155,6 +201,13 @@ class ErrorStack:
             ScopeNotClosed : self.scope_not_closed,
             5 : self.command_out_of_place,
             6 : self.empty_branches,
+            UndefinedVariable : self.undefined_variable,
+            WrongType : self.wrong_type,
+            WrongArgumentCount : self.wrong_argument_count,
+        }
+
+        self.parser_warnings: dict[Diagnostic, _Callable[[Diagnostic], None]] = {
+            UsedBeforeAssignment : self.used_before_assignment,
         }
 
         self.errors_stack: list[Diagnostic] = []
@@ -169,6 +222,13 @@ class ErrorStack:
         self.errors_stack.append(diag)
 
 
+    def push_warning(self, diag: Diagnostic) -> None:
+        """
+        pushes a warning, the program is still translated
+        """
+        self.warnings_stack.append(diag)
+
+
     def print_errors(self) -> None:
         log(self.errors_stack, tags=["de"])
         for error in self.errors_stack:
@@ -182,7 +242,15 @@ class ErrorStack:
 
 
     def print_warnings(self) -> None:
-        ...
+        log(self.warnings_stack, tags=["de"])
+        for warning in self.warnings_stack:
+            try:
+                self.parser_warnings[type(warning)](warning)
+            except KeyError:
+                error_traceback = traceback.format_exc()
+                log(error_traceback, ["e"], "both")
+                print("ΣΦΑΛΜΑ <IZ90> : Εσωτερικό σφάλμα του Διαχείριστη Σφαλμάτων του Διαμεταγλωττιστή.")
+                DebugIssue()
 
 
     def print_notes(self) -> None:
@@ -243,4 +311,22 @@ class ErrorStack:
 
     
     def empty_branches(self, err:str, if_scope: Scope) -> None:
-        ...
\ No newline at end of file
+        ...
+
+
+    def undefined_variable(self, diag: UndefinedVariable) -> None:
+        print(f"ΣΦΑΛΜΑ <GS02> Δεν έχει οριστεί η μεταβλητή '{display_name(diag.name)}' στο '{display_name(diag.scope)}'.")
+        print("Συμβουλή: Όρισε την μεταβλητή στις ΜΕΤΑΒΛΗΤΕΣ.")
+
+
+    def wrong_type(self, diag: WrongType) -> None:
+        print(f"ΣΦΑΛΜΑ <GS01> Λάθος τύπος στο '{display_name(diag.scope)}', {display_name_in(diag.context)}. Έπρεπε '{diag.expected}' αλλά είναι '{diag.got}'.")
+
+
+    def wrong_argument_count(self, diag: WrongArgumentCount) -> None:
+        print(f"ΣΦΑΛΜΑ <GS03> Η '{display_name(diag.name)}' στο '{display_name(diag.scope)}' έχει {diag.expected} ορίσματα, αλλά δόθηκαν {diag.got}.")
+
+
+    def used_before_assignment(self, diag: UsedBeforeAssignment) -> None:
+        print(f"ΠΡΟΕΙΔΟΠΟΙΗΣΗ <WS01> Η μεταβλητή '{display_name(diag.name)}' στο '{display_name(diag.scope)}' μπορεί να χρησιμοποιηθεί πριν πάρει τιμή.")
+        print("Συμβουλή: Δώσε της τιμή πριν την χρησιμοποιήσεις, αλλιώς έχει την τιμή 0.")
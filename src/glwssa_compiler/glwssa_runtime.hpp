@@ -0,0 +1,297 @@
+// The runtime of the C++ code that glwssa-compiler writes, it is pasted in the code or included.
+// Like the rest of the generated code it is not covered by the GPL, see "Παραγόμενος Έξοδος" in README.md.
+// Change GLWSSA_RUNTIME_VERSION with every change of this file, the precompiled headers are kept by version.
+#ifndef GLWSSA_RUNTIME_HPP
+#define GLWSSA_RUNTIME_HPP
+
+#define GLWSSA_RUNTIME_VERSION 3
+
+#include <algorithm>
+#include <cctype>
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <initializer_list>
+#include <memory>
+#include <string>
+#include <string_view>
+#include <type_traits>
+
+#ifdef _WIN32
+#include <io.h>
+#define GLWSSA_READ _read
+#else
+#include <unistd.h>
+#define GLWSSA_READ read
+#endif
+
+static const double GLWSSA_PI = 3.14159265358979323846;
+
+static inline int64_t glwssa_int_part(double x) { return static_cast<int64_t>(std::floor(x)); }
+static inline double glwssa_sin(double degrees) { return std::sin(degrees * GLWSSA_PI / 180.0); }
+static inline double glwssa_cos(double degrees) { return std::cos(degrees * GLWSSA_PI / 180.0); }
+static inline double glwssa_tan(double degrees) { return std::tan(degrees * GLWSSA_PI / 180.0); }
+static inline const char* glwssa_bool(bool value) { return value ? "ΑΛΗΘΗΣ" : "ΨΕΥΔΗΣ"; }
+
+// ΓΡΑΨΕ: the text is kept in a buffer and written with one fwrite when the buffer is full,
+// before the program waits for a ΔΙΑΒΑΣΕ and at the end of the program.
+struct glwssa_output {
+    static constexpr std::size_t SIZE = 1 << 16;
+    char buffer[SIZE];
+    std::size_t used = 0;
+
+    ~glwssa_output() { flush(); }
+
+    void flush() {
+        if (used) std::fwrite(buffer, 1, used, stdout);
+        used = 0;
+        std::fflush(stdout);
+    }
+
+    void put(char c) {
+        if (used == SIZE) flush();
+        buffer[used++] = c;
+    }
+
+    void write(const char* text, std::size_t size) {
+        if (size > SIZE - used) {
+            flush();
+            if (size > SIZE) {
+                std::fwrite(text, 1, size, stdout);
+                return;
+            }
+        }
+        std::memcpy(buffer + used, text, size);
+        used += size;
+    }
+
+    void write_int(int64_t value) {
+        char digits[24];
+        char* end = digits + sizeof digits;
+        char* start = end;
+        uint64_t magnitude = value < 0 ? 0 - static_cast<uint64_t>(value) : static_cast<uint64_t>(value);
+        do {
+            *--start = static_cast<char>('0' + magnitude % 10);
+            magnitude /= 10;
+        } while (magnitude);
+        if (value < 0) *--start = '-';
+        write(start, end - start);
+    }
+
+    void write_real(double value) {
+        char digits[32];
+        int size = std::snprintf(digits, sizeof digits, "%g", value); // the format of std::cout
+        write(digits, size);
+    }
+
+    template <typename T>
+    glwssa_output& operator<<(const T& value) {
+        if constexpr (std::is_same_v<T, char>) put(value);
+        else if constexpr (std::is_integral_v<T>) write_int(value);
+        else if constexpr (std::is_floating_point_v<T>) write_real(value);
+        else {
+            std::string_view text(value);
+            write(text.data(), text.size());
+        }
+        return *this;
+    }
+};
+
+inline glwssa_output glwssa_out;
+
+// ΔΙΑΒΑΣΕ: stdin is read in blocks and the values are parsed from the block, separated by white space like std::cin.
+// read() returns what is there, so a program that is used from a terminal gets every line as it is typed.
+struct glwssa_input {
+    static constexpr std::size_t SIZE = 1 << 16;
+    char buffer[SIZE];
+    std::size_t position = 0;
+    std::size_t size = 0;
+    bool at_end = false;
+    std::string word; // the text of a real, kept so that it is not allocated for every value
+
+    int peek() {
+        if (position == size) {
+            if (at_end) return EOF;
+            glwssa_out.flush(); // what was written is seen before the program waits
+            auto got = GLWSSA_READ(0, buffer, SIZE);
+            if (got <= 0) {
+                at_end = true;
+                return EOF;
+            }
+            position = 0;
+            size = static_cast<std::size_t>(got);
+        }
+        return static_cast<unsigned char>(buffer[position]);
+    }
+
+    void skip_spaces() {
+        int c;
+        while ((c = peek()) != EOF && std::isspace(c)) ++position;
+    }
+
+    int64_t read_int() {
+        skip_spaces();
+        bool negative = false;
+        int c = peek();
+        if (c == '-' || c == '+') {
+            negative = c == '-';
+            ++position;
+        }
+        uint64_t value = 0;
+        while ((c = peek()) != EOF && c >= '0' && c <= '9') {
+            value = value * 10 + static_cast<uint64_t>(c - '0');
+            ++position;
+        }
+        return negative ? static_cast<int64_t>(0 - value) : static_cast<int64_t>(value);
+    }
+
+    void read_word(std::string& word) {
+        word.clear();
+        skip_spaces();
+        int c;
+        while ((c = peek()) != EOF && !std::isspace(c)) {
+            word.push_back(static_cast<char>(c));
+            ++position;
+        }
+    }
+
+    double read_real() {
+        read_word(word);
+        return word.empty() ? 0.0 : std::strtod(word.c_str(), nullptr);
+    }
+
+    template <typename T>
+    glwssa_input& operator>>(T& value) {
+        if constexpr (std::is_same_v<T, bool>) value = read_int() != 0;
+        else if constexpr (std::is_integral_v<T>) value = static_cast<T>(read_int());
+        else if constexpr (std::is_floating_point_v<T>) value = read_real();
+        else read_word(value);
+        return *this;
+    }
+};
+
+inline glwssa_input glwssa_in;
+
+static inline int64_t glwssa_ipow(int64_t base, int64_t exponent) {
+    if (exponent < 0) {
+        if (base == 1 || base == -1) return (exponent % 2 == 0) ? 1 : base;
+        // the result is not an ΑΚΕΡΑΙΑ (2 ^ -1 is 0.5), it must not become 0
+        glwssa_out.flush();
+        std::fprintf(stderr, "Ο αρνητικός εκθέτης %lld σε δύναμη ακεραίων δεν δίνει ακέραιο αποτέλεσμα\n",
+                     static_cast<long long>(exponent));
+        std::exit(1);
+    }
+    int64_t result = 1;
+    while (exponent > 0) {
+        if (exponent & 1) result *= base;
+        base *= base;
+        exponent >>= 1;
+    }
+    return result;
+}
+
+static inline int64_t glwssa_index(int64_t index, int64_t size) {
+    if (index < 1 || index > size) {
+        glwssa_out.flush();
+        std::fprintf(stderr, "Ο δείκτης %lld είναι εκτός των ορίων 1..%lld του πίνακα\n",
+                     static_cast<long long>(index), static_cast<long long>(size));
+        std::exit(1);
+    }
+    return index;
+}
+
+#if defined(__GNUC__)
+#define GLWSSA_INLINE inline __attribute__((always_inline))
+#else
+#define GLWSSA_INLINE inline
+#endif
+
+struct glwssa_no_zero_t {};
+inline constexpr glwssa_no_zero_t glwssa_no_zero{}; // the arrays that are written before they are read
+
+// An array of ΓΛΩΣΣΑ with N dimensions. The elements are in one block, row after row (the last index changes fastest),
+// the element (i, j, k) is elements[i * strides[0] + j * strides[1] + k - shift], the shift makes (1, 1, 1) the first.
+// The block is allocated here, or it is static/stack storage of the generated code that the array only points to.
+// A copy always allocates its own block, an assignment copies the elements into the block that is there.
+template <typename T, std::size_t N>
+class glwssa_array {
+public:
+    explicit glwssa_array(std::initializer_list<int64_t> dims) { allocate(dims, true); }
+    glwssa_array(std::initializer_list<int64_t> dims, glwssa_no_zero_t) { allocate(dims, false); }
+    glwssa_array(T* storage, std::initializer_list<int64_t> dims) : elements_(storage) { shape(dims); }
+
+    glwssa_array(const glwssa_array& other) : size_(other.size_), shift_(other.shift_) {
+        std::copy(other.strides_, other.strides_ + N, strides_);
+        owner_.reset(new T[size_]);
+        elements_ = owner_.get();
+        std::copy(other.elements_, other.elements_ + size_, elements_);
+    }
+
+    glwssa_array& operator=(const glwssa_array& other) {
+        if (this == &other) return *this;
+        if (size_ != other.size_) {
+            size_ = other.size_;
+            owner_.reset(new T[size_]);
+            elements_ = owner_.get();
+        }
+        std::copy(other.strides_, other.strides_ + N, strides_);
+        shift_ = other.shift_;
+        std::copy(other.elements_, other.elements_ + size_, elements_);
+        return *this;
+    }
+
+    // 1 to 3 dimensions are written out, g++ inlines them even without -O.
+    // They are const like std::span, a function gets the arrays it does not change as const&.
+    GLWSSA_INLINE T& operator()(int64_t i) const {
+        static_assert(N == 1, "an element has one index for every dimension");
+        return elements_[i - 1];
+    }
+    GLWSSA_INLINE T& operator()(int64_t i, int64_t j) const {
+        static_assert(N == 2, "an element has one index for every dimension");
+        return elements_[i * strides_[0] + j - shift_];
+    }
+    GLWSSA_INLINE T& operator()(int64_t i, int64_t j, int64_t k) const {
+        static_assert(N == 3, "an element has one index for every dimension");
+        return elements_[i * strides_[0] + j * strides_[1] + k - shift_];
+    }
+    template <typename... Indexes, typename = std::enable_if_t<(sizeof...(Indexes) > 3)>>
+    GLWSSA_INLINE T& operator()(Indexes... indexes) const { return elements_[offset(indexes...)]; }
+
+private:
+    T* elements_ = nullptr;
+    std::unique_ptr<T[]> owner_;
+    int64_t size_ = 0;
+    int64_t shift_ = 0;
+    int64_t strides_[N] = {};
+
+    void shape(std::initializer_list<int64_t> dims) {
+        const int64_t* dim = dims.end();
+        int64_t stride = 1;
+        shift_ = 0;
+        for (std::size_t d = N; d-- > 0;) {
+            strides_[d] = stride;
+            shift_ += stride;
+            stride *= *--dim;
+        }
+        size_ = stride;
+    }
+
+    void allocate(std::initializer_list<int64_t> dims, bool zero) {
+        shape(dims);
+        owner_.reset(zero ? new T[size_]() : new T[size_]);
+        elements_ = owner_.get();
+    }
+
+    template <typename... Indexes>
+    int64_t offset(Indexes... indexes) const {
+        static_assert(sizeof...(Indexes) == N, "an element has one index for every dimension");
+        const int64_t list[] = {static_cast<int64_t>(indexes)...};
+        int64_t result = -shift_;
+        for (std::size_t d = 0; d < N; ++d) result += list[d] * strides_[d];
+        return result;
+    }
+};
+
+#endif // GLWSSA_RUNTIME_HPP
@@ -0,0 +1,410 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import copy
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, FUNCTION, PROCEDURE, RESULT, CONSTANT, VARIABLE
+from .call_graph import CallGraph
+from .definite_assignment import AssignmentTable
+from .constant_folding import literal_value, NOT_A_LITERAL
+
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Union as _Union
+
+
+# A subprogram is inlined if its body (without the declarations) has at most this many nodes.
+# The calls only get faster with the default fast-compile profile (g++ -O0): benchmarks/inlining.glwssa runs 2.4x
+# faster there, with the release profiles g++ inlines these calls itself and the time is the same (main.py does not
+# run the pass for them, see INLINING_PROFILES).
+INLINE_THRESHOLD = 60
+# How many nodes the inlining can add to one program/subprogram.
+INLINE_BUDGET = 2000
+
+# The renamed locals start with this, the lexer only makes names that start with gr_/en_.
+INLINE_PREFIX = "inl"
+
+# The value every variable of ΓΛΩΣΣΑ starts with, the locals of an inlined call are set to it every time it runs.
+ZERO_LITERALS = {
+    IntType: lambda: Number("0"),
+    RealType: lambda: Float("0.0"),
+    CharType: lambda: String('""'),
+    BoolType: lambda: Boolean("false"),
+}
+
+
+def body_size(subprogram: Callable) -> int:
+    return sum(1 for statement in subprogram.body if not isinstance(statement, DECLARATIONS) for _ in walk(statement))
+
+
+def same_type(a, b) -> bool:
+    """
+    Arrays are the same type in the generated code if they have the same element type and number of dimensions.
+    """
+    if isinstance(a, ArrayType) and isinstance(b, ArrayType):
+        return a.val_type is b.val_type and len(a.val_dim) == len(b.val_dim)
+    return a is b
+
+
+def is_plain_variable(node) -> bool:
+    """
+    A whole variable (not an element of an array).
+    """
+    return type(node) is Variable and not isinstance(node.var_type, ArrayType)
+
+
+class Renamer(NodeVisitor):
+    """
+    Renames every name of the mapping, in place.
+    """
+    def __init__(self, names: _Dict[str, str]) -> None:
+        super().__init__()
+        self.names = names
+
+
+    def rename(self, name: str) -> str:
+        return self.names.get(name, name)
+
+
+    def visit_Variable(self, node: Variable) -> None:
+        node.name = self.rename(node.name)
+        self.generic_visit(node)
+
+
+    def visit_ArrayIndex(self, node: ArrayIndex) -> None:
+        node.name = self.rename(node.name)
+        self.generic_visit(node)
+
+
+    def visit_VariableAssignement(self, node: VariableAssignement) -> None:
+        node.target = self.rename(node.target)
+        self.generic_visit(node)
+
+
+    def visit_ConstantDeclaration(self, node: ConstantDeclaration) -> None:
+        node.name = self.rename(node.name)
+        self.generic_visit(node)
+
+
+class CallReplacer(NodeTransformer):
+    """
+    Puts `replacement` where the CallFunction `target` was.
+    """
+    def __init__(self, target: CallFunction, replacement: Expression) -> None:
+        super().__init__()
+        self.target = target
+        self.replacement = replacement
+
+
+    def visit_CallFunction(self, node: CallFunction) -> Expression:
+        if node is self.target:
+            return self.replacement
+        return self.generic_visit(node)
+
+
+class Inliner:
+    """
+    Puts the body of small, non recursive subprograms where they are called.
+
+    ΚΑΛΕΣΕ Π(α, β) becomes:
+        the parameters are copied in (π1 <- α)
+        the body, with every local renamed
+        the parameters are copied out (α <- π1)
+
+    For a ΣΥΝΑΡΤΗΣΗ the same is done before the statement with the call, the call becomes the variable
+    that the body assigns the result to. Only the calls that are always evaluated, once, where the statement is
+    are inlined (not the conditions of ΟΣΟ/ΜΕΧΡΙΣ_ΟΤΟΥ, not the right side of ΚΑΙ/Ή, not ΑΛΛΙΩΣ_ΑΝ), so the
+    body does not run when it would not have run.
+
+    The backend passes the arguments of a procedure by reference, the inlined call must do the same: a parameter
+    whose argument is a whole variable is not copied, the name of the argument is used in the body, even when
+    another argument is the same variable. An element is copied in and out, that is the same as a reference
+    while no other argument is the same array, so a call that passes the array twice is not inlined.
+    For a ΣΥΝΑΡΤΗΣΗ (the arguments are values) the name is used only if no other argument uses it and
+    the body does not change the parameter.
+
+    The locals (and the result) are declared once in the caller, so every inlined call sets them to 0 like a call
+    would, except the ones the AssignmentTable says the callee writes before it reads them.
+    """
+    def __init__(self, symbols: SymbolTable, graph: CallGraph, threshold: int = INLINE_THRESHOLD,
+                 budget: int = INLINE_BUDGET, assignment: _Optional[AssignmentTable] = None) -> None:
+        self.symbols = symbols
+        self.graph = graph
+        self.assignment = assignment
+        self.threshold = threshold
+        self.budget = budget
+
+        self.count = 0 # every inlined call gets its own names
+        self.declarations: _List[Statement] = []
+        self.spent = 0
+        self.changed = False
+
+
+    def inline(self, program: Program) -> bool:
+        owners = {symbol_id: node for symbol_id, node in self.graph.nodes.items()}
+        # bottom-up, so a callee already has its own calls inlined
+        for component in self.graph.components():
+            for symbol_id in component:
+                owner = owners[symbol_id]
+                self.declarations = []
+                self.spent = 0
+                self.caller = symbol_id
+                self.inline_body(owner.body)
+                insert_declarations(owner.body, self.declarations)
+        return self.changed
+
+    # Choosing _____________________________________________________________________________________________
+
+    def callee_of(self, node: _Union[CallFunction, CallProcedure]) -> _Optional[Callable]:
+        if node.symbol_id is None:
+            return None
+        symbol = self.symbols[node.symbol_id]
+        if symbol.kind == RESULT: # a recursive call
+            return None
+        if symbol.kind not in {FUNCTION, PROCEDURE} or symbol.id == self.caller:
+            return None
+        if self.graph.is_recursive(symbol.id):
+            return None
+
+        callee = symbol.node
+        size = body_size(callee)
+        if size > self.threshold or self.spent + size > self.budget:
+            return None
+        if len(node.params) != len(self.symbols.scope_of(callee).params):
+            return None
+        if isinstance(node, CallProcedure) and self.is_aliased(node, callee):
+            return None
+        return callee
+
+
+    def is_aliased(self, call: CallProcedure, callee: Callable) -> bool:
+        """
+        True if an element is passed by reference with another argument of the same array.
+        """
+        params = [self.symbols[i] for i in self.symbols.scope_of(callee).params]
+        references = [arg.name for arg, param in zip(call.params, params) if self.is_copied_out(arg, param)]
+        return any(isinstance(arg, ArrayIndex) and references.count(arg.name) > 1
+                   for arg, param in zip(call.params, params) if self.is_copied_out(arg, param))
+
+
+    def once_evaluated(self, statement) -> _List[Expression]:
+        """
+        The expressions of the statement that run exactly once, when the statement runs.
+        """
+        if isinstance(statement, VariableAssignement):
+            return statement.target_index + [statement.expr]
+        if isinstance(statement, Write):
+            return statement.expression
+        if isinstance(statement, CallProcedure):
+            return statement.params
+        if isinstance(statement, If):
+            return [statement.branches[0].condition]
+        if isinstance(statement, Switch):
+            return [statement.expr]
+        if isinstance(statement, For):
+            return [statement.from_expr, statement.to_expr, statement.step]
+        if isinstance(statement, Read):
+            return [i for v in statement.variable_list if isinstance(v.var_type, ArrayType) for i in v.var_type.val_dim]
+        return []
+
+
+    def find_call(self, node) -> _Optional[CallFunction]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, CallFunction) and self.callee_of(node) is not None:
+                return node
+            if isinstance(node, BinaryOperation) and node.operator in {"AND", "OR"}:
+                stack.append(node.left) # the right side might not be evaluated
+                continue
+            children = list(iter_child_nodes(node))
+            children.reverse()
+            stack.extend(children)
+        return None
+
+    # Inlining _____________________________________________________________________________________________
+
+    def inline_body(self, body: list) -> None:
+        index = 0
+        while index < len(body):
+            replacement = self.inline_statement(body[index])
+            if replacement is None:
+                self.inline_nested(body[index])
+                index += 1
+            else:
+                # the new statements are looked at again, the arguments might have calls too
+                body[index:index + 1] = replacement
+                self.changed = True
+
+
+    def inline_nested(self, statement) -> None:
+        for child in iter_child_nodes(statement):
+            if isinstance(child, Block):
+                self.inline_body(child.body)
+            elif isinstance(child, Branch):
+                self.inline_body(child.body.body)
+
+
+    def inline_statement(self, statement) -> _Optional[list]:
+        for root in self.once_evaluated(statement):
+            call = self.find_call(root)
+            if call is None:
+                continue
+            callee = self.callee_of(call)
+            before, result = self.expand(call, callee)
+            replaced = CallReplacer(call, Variable(result, None)).visit(statement)
+            return before + [replaced]
+
+        if isinstance(statement, CallProcedure):
+            callee = self.callee_of(statement)
+            if callee is not None:
+                before, _ = self.expand(statement, callee)
+                return before
+        return None
+
+
+    def expand(self, call: _Union[CallFunction, CallProcedure], callee: Callable):
+        """
+        Returns the statements that take the place of the call, and the name of the result of a ΣΥΝΑΡΤΗΣΗ.
+        """
+        self.count += 1
+        self.spent += body_size(callee)
+        log(f"From expand (inlining.py): Inlining '{callee.name.value}' #{self.count}", tags=["inl"])
+
+        scope = self.symbols.scope_of(callee)
+        params = [self.symbols[i] for i in scope.params]
+        is_function = isinstance(callee, Function)
+        changed_in_body = assigned_names(callee.body)
+
+        names = {name: f"{INLINE_PREFIX}{self.count}_{name}" for name in scope.names}
+        for statement in callee.body:
+            # the locals of the calls that were already inlined into the callee
+            if isinstance(statement, VariableDeclaration) and statement.variable.name not in names:
+                names[statement.variable.name] = f"{INLINE_PREFIX}{self.count}_{statement.variable.name}"
+
+        substituted = set()
+        for index, (param, arg) in enumerate(zip(params, call.params)):
+            if not is_plain_variable(arg) or arg.symbol_id is None:
+                continue
+            arg_symbol = self.symbols[arg.symbol_id]
+            if arg_symbol.kind == CONSTANT or not same_type(arg_symbol.var_type, param.var_type):
+                continue
+            if is_function:
+                others = set().union(*(used_names(a) for i, a in enumerate(call.params) if i != index))
+                if arg.name in others or param.name in changed_in_body:
+                    continue # a ΣΥΝΑΡΤΗΣΗ gets a copy
+            names[param.name] = arg.name
+            substituted.add(param.name)
+
+        body = copy.deepcopy(callee.body)
+        Renamer(names).visit(Block(body))
+
+        substituted_names = {names[name] for name in substituted}
+        locals_types = {}
+        for statement in body:
+            if not isinstance(statement, (VariableDeclaration, ConstantDeclaration)):
+                continue
+            declared = statement.variable.name if isinstance(statement, VariableDeclaration) else statement.name
+            if declared not in substituted_names:
+                self.declarations.append(statement)
+                if isinstance(statement, VariableDeclaration):
+                    locals_types[declared] = statement.variable.var_type
+
+        result = None
+        if is_function:
+            result = names[callee.name.value]
+            self.declarations.append(VariableDeclaration(Variable(result, callee.func_type)))
+            locals_types[result] = callee.func_type
+
+        resets = []
+        for name, symbol_id in scope.names.items():
+            symbol = self.symbols[symbol_id]
+            if symbol.kind not in (VARIABLE, RESULT) or names[name] not in locals_types:
+                continue
+            if self.assignment is not None and not self.assignment.needs_zero(symbol_id):
+                continue
+            resets.extend(self.reset(names[name], locals_types[names[name]]))
+
+        copy_in = []
+        copy_out = []
+        for param, arg in zip(params, call.params):
+            if param.name in substituted:
+                continue
+            local = names[param.name]
+            if not is_function and param.name in changed_in_body and self.is_copied_out(arg, param):
+                if isinstance(arg, ArrayIndex):
+                    # the element is the one the index pointed to when the procedure was called
+                    arg.index_dim = [self.capture(index, copy_in) for index in arg.index_dim]
+                copy_out.append(VariableAssignement(arg.name, Variable(local, None), None,
+                    copy.deepcopy(arg.index_dim) if isinstance(arg, ArrayIndex) else []))
+            copy_in.append(VariableAssignement(local, arg))
+
+        statements = [s for s in body if not isinstance(s, DECLARATIONS)]
+        return copy_in + resets + statements + copy_out, result
+
+
+    def reset(self, name: str, var_type) -> _List[Statement]:
+        """
+        Sets the variable to 0, an array with a ΓΙΑ for every dimension.
+        """
+        if not isinstance(var_type, ArrayType):
+            return [VariableAssignement(name, ZERO_LITERALS[var_type]())]
+        counters = []
+        for dimension in range(len(var_type.val_dim)):
+            counter = f"{name}_zero{dimension}"
+            self.declarations.append(VariableDeclaration(Variable(counter, IntType)))
+            counters.append(counter)
+        loop = [VariableAssignement(name, ZERO_LITERALS[var_type.val_type](), None,
+                                    [Variable(counter, None) for counter in counters])]
+        for counter, dim in reversed(list(zip(counters, var_type.val_dim))):
+            loop = [For(Variable(counter, None), Number("1"), copy.deepcopy(dim), Number("1"), Block(loop))]
+        return loop
+
+
+    def is_copied_out(self, arg: Expression, param) -> bool:
+        if not isinstance(arg, (Variable, ArrayIndex)) or arg.symbol_id is None:
+            return False
+        arg_symbol = self.symbols[arg.symbol_id]
+        if arg_symbol.kind == CONSTANT:
+            return False
+        arg_type = arg_symbol.var_type
+        if isinstance(arg, ArrayIndex):
+            arg_type = arg_type.val_type if isinstance(arg_type, ArrayType) else None
+        elif isinstance(arg.var_type, ArrayType): # an element, from ΔΙΑΒΑΣΕ
+            return False
+        # the backend only copies in an argument of another type, keep the same meaning
+        return same_type(arg_type, param.var_type)
+
+
+    def capture(self, index: Expression, copy_in: list) -> Expression:
+        """
+        Keeps the value of an index in a new variable, so the copy-out writes the same element.
+        """
+        if literal_value(index) is not NOT_A_LITERAL:
+            return index
+        name = f"{INLINE_PREFIX}{self.count}_index{len(copy_in)}"
+        self.declarations.append(VariableDeclaration(Variable(name, IntType)))
+        copy_in.append(VariableAssignement(name, index))
+        return Variable(name, None)
+
+
+def inline_calls(program: Program, symbols: SymbolTable, graph: CallGraph,
+                 threshold: int = INLINE_THRESHOLD, assignment: _Optional[AssignmentTable] = None) -> bool:
+    """
+    Returns True if any call was inlined. The names change, so the symbol table must be built again.
+    Without the assignment every local is set to 0 at every inlined call.
+    """
+    return Inliner(symbols, graph, threshold, assignment=assignment).inline(program)
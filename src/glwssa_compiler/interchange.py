@@ -0,0 +1,261 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import Counter
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, BUILTIN, CONSTANT, VARIABLE
+from .type_inference import TypeTable
+from .ranges import RangeTable
+from .constant_folding import literal_value, NOT_A_LITERAL
+
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+
+
+# The fields of ΓΙΑ that are swapped, the body stays where it is.
+HEADER = ("counter", "from_expr", "to_expr", "step")
+
+
+def read_names(nodes) -> Counter:
+    """
+    How many times every name is read. The counter of ΓΙΑ and the variables of ΔΙΑΒΑΣΕ are written, not read.
+    """
+    written = set()
+    for node in nodes:
+        for child in walk(node):
+            if isinstance(child, For):
+                written.add(id(child.counter))
+            elif isinstance(child, Read):
+                written.update(id(variable) for variable in child.variable_list)
+    reads = Counter()
+    for node in nodes:
+        for child in walk(node):
+            if isinstance(child, (Variable, ArrayIndex)) and id(child) not in written:
+                reads[child.name] += 1
+    return reads
+
+
+class LoopInterchange:
+    """
+    Swaps the two ΓΙΑ of a nest whose inner loop is the only statement of the outer one, when the elements of the
+    arrays are walked column by column (the counter of the outer loop is the last index). The C++ arrays are
+    row-major, after the swap the inner loop walks the elements that are next to each other in memory.
+
+    The swap changes the order of the repetitions, so it is done only when that order can not be seen:
+        the bounds are literals or variables the body does not change (so they can be found in either order),
+        the body has no ΓΡΑΨΕ/ΔΙΑΒΑΣΕ/ΚΑΛΕΣΕ/ΣΥΝΑΡΤΗΣΗ of the program and every index in it is proven in bounds,
+        every element of an array that is written has the same indexes in the body, each one a counter or without
+        the counters (the repetitions that share an element keep their order),
+        the only variables the body writes are ΑΚΕΡΑΙΕΣ sums (Σ <- Σ + ...), their value does not depend on the order.
+    The counters end with other values if a loop repeats zero times, so they must not be read after the nest,
+    unless the literal bounds show that both loops repeat.
+    """
+    def __init__(self, symbols: SymbolTable, types: TypeTable, ranges: RangeTable) -> None:
+        self.symbols = symbols
+        self.types = types
+        self.ranges = ranges
+        self.changed = False
+
+
+    def interchange(self, program: Program) -> bool:
+        for owner in [program] + program.procedures + program.functions:
+            self.scope = self.symbols.scope_of(owner)
+            self.reads = read_names(owner.body)
+            self.visit_body(owner.body)
+        return self.changed
+
+
+    def visit_body(self, body: list) -> None:
+        for statement in body:
+            for child in iter_child_nodes(statement):
+                if isinstance(child, Block):
+                    self.visit_body(child.body)
+                elif isinstance(child, Branch):
+                    self.visit_body(child.body.body)
+            if isinstance(statement, For) and self.is_profitable(statement) and self.is_legal(statement):
+                outer, inner = statement, statement.body.body[0]
+                for field_name in HEADER:
+                    outer_value, inner_value = getattr(outer, field_name), getattr(inner, field_name)
+                    setattr(outer, field_name, inner_value)
+                    setattr(inner, field_name, outer_value)
+                self.changed = True
+                log(f"From visit_body (interchange.py): Swapped the loops of {inner.counter.name} and {outer.counter.name}", tags=["lix"])
+
+    # Which nests ___________________________________________________________________________________________
+
+    def is_profitable(self, outer: For) -> bool:
+        """
+        More elements have the outer counter as their last index than the inner one.
+        """
+        if len(outer.body.body) != 1 or not isinstance(outer.body.body[0], For):
+            return False
+        inner = outer.body.body[0]
+        score = 0
+        for child in walk(inner.body):
+            if isinstance(child, ArrayIndex):
+                indexes = child.index_dim
+            elif isinstance(child, VariableAssignement):
+                indexes = child.target_index
+            else:
+                continue
+            if len(indexes) > 1 and type(indexes[-1]) is Variable:
+                last = indexes[-1].name
+                score += (last == outer.counter.name) - (last == inner.counter.name)
+        return score > 0
+
+
+    def is_legal(self, outer: For) -> bool:
+        inner = outer.body.body[0]
+        body = inner.body.body
+        counters = {outer.counter.name, inner.counter.name}
+        changed = assigned_names(body)
+        if counters & changed or len(counters) != 2:
+            return False
+        for name in counters:
+            symbol = self.symbol_of(name)
+            if symbol is None or symbol.kind != VARIABLE:
+                return False # a parameter is copied back with its last value
+
+        for loop in (outer, inner):
+            if type(literal_value(loop.step)) is not int or literal_value(loop.step) == 0:
+                return False
+            for bound in (loop.from_expr, loop.to_expr):
+                if literal_value(bound) is not NOT_A_LITERAL:
+                    continue
+                if type(bound) is not Variable or isinstance(bound.var_type, ArrayType):
+                    return False
+                if bound.name in changed or bound.name in counters:
+                    return False
+
+        # the counters keep the values they end with, only if both loops repeat
+        inside = read_names([outer])
+        if any(self.reads[name] > inside[name] for name in counters):
+            if not self.trip_count(outer) or not self.trip_count(inner):
+                return False
+
+        sums = self.sums(body)
+        if sums is None or changed - sums - self.written_arrays(body):
+            return False
+        return all(self.is_safe(statement) for statement in body) and self.same_elements(body, counters)
+
+
+    def symbol_of(self, name: str):
+        symbol_id = self.scope.names.get(name)
+        return None if symbol_id is None else self.symbols[symbol_id]
+
+
+    def value_of(self, node):
+        """
+        The value of a literal or of a ΣΤΑΘΕΡΑ with a literal value.
+        """
+        if type(node) is Variable:
+            symbol = self.symbol_of(node.name)
+            if symbol is not None and symbol.kind == CONSTANT and isinstance(symbol.node, ConstantDeclaration):
+                node = symbol.node.expr
+        return literal_value(node)
+
+
+    def trip_count(self, loop: For) -> _Optional[int]:
+        start, end, step = self.value_of(loop.from_expr), self.value_of(loop.to_expr), literal_value(loop.step)
+        if type(start) is not int or type(end) is not int or type(step) is not int or step == 0:
+            return None
+        return max(0, (end - start) // step + 1)
+
+
+    def written_arrays(self, body: list) -> _Set[str]:
+        return {child.target for statement in body for child in walk(statement)
+                if isinstance(child, VariableAssignement) and child.target_index}
+
+
+    def sums(self, body: list) -> _Optional[_Set[str]]:
+        """
+        The variables the body only adds to, None if one of them is read in any other place of the body.
+        """
+        sums = set()
+        parts = []
+        for statement in body:
+            for child in walk(statement):
+                if not isinstance(child, VariableAssignement) or child.target_index:
+                    continue
+                expr = child.expr
+                if not (isinstance(expr, BinaryOperation) and expr.operator == "PLUS"
+                        and self.types.type_of(expr) is IntType):
+                    return None
+                if type(expr.left) is Variable and expr.left.name == child.target:
+                    parts.append(expr.right)
+                elif type(expr.right) is Variable and expr.right.name == child.target:
+                    parts.append(expr.left)
+                else:
+                    return None
+                sums.add(child.target)
+        if any(used_names(part) & sums for part in parts):
+            return None
+        # every sum is read once by each of its own assignments, and nowhere else
+        reads = read_names(body)
+        assignments = Counter(child.target for statement in body for child in walk(statement)
+                              if isinstance(child, VariableAssignement) and not child.target_index)
+        if any(reads[name] != assignments[name] for name in sums):
+            return None
+        return sums
+
+
+    def is_safe(self, statement) -> bool:
+        """
+        The body has nothing that can be seen while the loops run, and no index that can stop the program.
+        """
+        for child in walk(statement):
+            if isinstance(child, (Write, Read, CallProcedure)):
+                return False
+            if isinstance(child, CallFunction):
+                if child.symbol_id is None or self.symbols[child.symbol_id].kind != BUILTIN:
+                    return False
+            if isinstance(child, ArrayIndex) and not all(self.ranges.is_proven(index) for index in child.index_dim):
+                return False
+            if isinstance(child, VariableAssignement) and child.target_index:
+                if not all(self.ranges.is_proven(index) for index in child.target_index):
+                    return False
+        return True
+
+
+    def same_elements(self, body: list, counters: _Set[str]) -> bool:
+        """
+        Every element of a written array has the same indexes, each a counter or an expression without the counters.
+        """
+        elements = {}
+        for statement in body:
+            for child in walk(statement):
+                if isinstance(child, VariableAssignement) and child.target_index:
+                    elements.setdefault(child.target, []).append(child.target_index)
+                elif isinstance(child, ArrayIndex):
+                    elements.setdefault(child.name, []).append(child.index_dim)
+
+        for name in self.written_arrays(body):
+            first = elements[name][0]
+            if any(indexes != first for indexes in elements[name]):
+                return False
+            plain = [index for index in first if type(index) is Variable and index.name in counters]
+            if not plain:
+                return False
+            if any(used_names(index) & counters for index in first if index not in plain):
+                return False
+        return True
+
+
+def interchange_loops(program: Program, symbols: SymbolTable, types: TypeTable, ranges: RangeTable) -> bool:
+    """
+    Returns True if any nest was swapped. The nodes stay the same, only the headers of the loops move.
+    """
+    return LoopInterchange(symbols, types, ranges).interchange(program)
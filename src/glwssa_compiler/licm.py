@@ -0,0 +1,271 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, BUILTIN
+from .type_inference import TypeTable
+from .constant_folding import literal_value, NOT_A_LITERAL
+
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+from typing import Tuple as _Tuple
+
+
+# The temporaries start with this, the lexer only makes names that start with gr_/en_.
+LICM_PREFIX = "licm"
+
+LOOPS = (For, While, Do)
+# The nodes that compute something, a Variable or a literal is not worth a temporary.
+COMPUTED = (BinaryOperation, UnaryOperator, CallFunction, ArrayIndex, Parentheses)
+
+
+def is_trivial(node) -> bool:
+    while isinstance(node, Parentheses):
+        node = node.exrpession
+    return not isinstance(node, COMPUTED)
+
+
+class Hoister(NodeTransformer):
+    """
+    Replaces the invariant expressions of one loop with temporaries.
+    The biggest invariant expression is taken, its parts are not looked at.
+    """
+    def __init__(self, motion: "LoopInvariantMotion", defs: _Set[str]) -> None:
+        super().__init__()
+        self.motion = motion
+        self.defs = defs
+        self.hoisted: _List[_Tuple[Expression, str]] = [] # (expression, temporary), in the order they are found
+
+
+    def visit(self, node):
+        if isinstance(node, COMPUTED) and not is_trivial(node) and self.motion.is_movable(node, self.defs):
+            return self.temporary(node)
+        return super().visit(node)
+
+
+    def temporary(self, node: Expression) -> Expression:
+        for expression, name in self.hoisted:
+            if expression == node:
+                return Variable(name, None)
+        name = self.motion.declare(node)
+        if name is None:
+            return super().visit(node)
+        self.hoisted.append((node, name))
+        return Variable(name, None)
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> CallProcedure:
+        # an argument is passed with copy-in/copy-out, a temporary in its place would be changed by the procedure
+        for arg in node.params:
+            self.generic_visit(arg)
+        return node
+
+
+    def visit_Switch(self, node: Switch) -> Switch:
+        node.expr = self.visit(node.expr)
+        for branch in node.branches:
+            cases = []
+            for case in branch.condition:
+                if isinstance(case, UnaryOperator) and case.operator in {"GT", "LT", "GTE", "LTE"}:
+                    self.generic_visit(case) # ΠΕΡΙΠΤΩΣΗ > x, only the bound is an expression
+                elif isinstance(case, BinaryOperation) and case.operator == "PERIOD":
+                    self.generic_visit(case)
+                else:
+                    case = self.visit(case)
+                cases.append(case)
+            branch.condition = cases
+            self.generic_visit(branch.body)
+        if node.else_branch is not None:
+            self.generic_visit(node.else_branch)
+        return node
+
+
+    def visit_VariableDeclaration(self, node: VariableDeclaration) -> VariableDeclaration:
+        return node
+
+
+    def visit_ConstantDeclaration(self, node: ConstantDeclaration) -> ConstantDeclaration:
+        return node
+
+
+class LoopInvariantMotion:
+    """
+    Moves the expressions that give the same value in every repetition of a ΓΙΑ/ΟΣΟ/ΜΕΧΡΙΣ_ΟΤΟΥ
+    into temporaries that are assigned right before the loop.
+
+    An expression is invariant if no variable it reads is changed in the loop (assignment, ΔΙΑΒΑΣΕ,
+    argument of ΚΑΛΕΣΕ, counter of ΓΙΑ). A ΓΙΑ or ΟΣΟ might not repeat at all and the expression might be
+    inside an ΑΝ, so only the expressions that can not stop the program are moved (no DIV/MOD by a variable,
+    no ΣΥΝΑΡΤΗΣΗ of the program, no element of an array that might be out of bounds). The ΜΕΧΡΙ/ΜΕ_ΒΗΜΑ
+    of ΓΙΑ are found once before the loop anyway, so they are always moved if they are not a variable.
+
+    The inner loops are done first, the assignments of their temporaries are then moved out of the outer loops too.
+    """
+    def __init__(self, symbols: SymbolTable, types: TypeTable) -> None:
+        self.symbols = symbols
+        self.types = types
+        self.count = 0
+        self.names: _Set[str] = set()
+        self.declarations: _List[Statement] = []
+        self.temporaries: _Set[str] = set()
+        self.changed = False
+
+
+    def move(self, program: Program) -> bool:
+        for owner in [program] + program.procedures + program.functions:
+            self.names = set(self.symbols.scope_of(owner).names)
+            self.declarations = []
+            self.visit_body(owner.body)
+            insert_declarations(owner.body, self.declarations)
+        return self.changed
+
+
+    def declare(self, node: Expression) -> _Optional[str]:
+        var_type = self.types.type_of(node)
+        if var_type is None or isinstance(var_type, ArrayType):
+            return None
+        self.count += 1
+        while f"{LICM_PREFIX}{self.count}" in self.names:
+            self.count += 1
+        name = f"{LICM_PREFIX}{self.count}"
+        self.declarations.append(VariableDeclaration(Variable(name, var_type)))
+        self.temporaries.add(name)
+        self.changed = True
+        return name
+
+    # Which expressions _____________________________________________________________________________________
+
+    def is_movable(self, node: Expression, defs: _Set[str]) -> bool:
+        return not (used_names(node) & defs) and self.is_safe(node)
+
+
+    def is_safe(self, node: Expression) -> bool:
+        """
+        False if evaluating the expression could stop the program (or never end), when it would not have run.
+        """
+        for child in walk(node):
+            if isinstance(child, CallFunction):
+                if child.symbol_id is None or self.symbols[child.symbol_id].kind != BUILTIN:
+                    return False
+            elif isinstance(child, BinaryOperation) and child.operator in {"IDIV", "MOD"}:
+                if literal_value(child.right) in (NOT_A_LITERAL, 0):
+                    return False
+            elif isinstance(child, ArrayIndex) and not self.in_bounds(child):
+                return False
+            elif isinstance(child, Variable) and isinstance(child.var_type, ArrayType):
+                return False # an element in ΔΙΑΒΑΣΕ
+        return True
+
+
+    def in_bounds(self, node: ArrayIndex) -> bool:
+        """
+        Only the literal indexes inside literal dimensions are known to be in the array.
+        """
+        if node.symbol_id is None:
+            return False
+        array_type = self.symbols[node.symbol_id].var_type
+        if not isinstance(array_type, ArrayType) or len(array_type.val_dim) != len(node.index_dim):
+            return False
+        for index, dim in zip(node.index_dim, array_type.val_dim):
+            index, dim = literal_value(index), literal_value(dim)
+            if type(index) is not int or type(dim) is not int or not 1 <= index <= dim:
+                return False
+        return True
+
+    # Moving ________________________________________________________________________________________________
+
+    def visit_body(self, body: list) -> None:
+        new_body = []
+        for statement in body:
+            self.visit_nested(statement)
+            if isinstance(statement, LOOPS):
+                new_body.extend(self.hoist(statement))
+            new_body.append(statement)
+        body[:] = new_body
+
+
+    def visit_nested(self, statement) -> None:
+        for child in iter_child_nodes(statement):
+            if isinstance(child, Block):
+                self.visit_body(child.body)
+            elif isinstance(child, Branch):
+                self.visit_body(child.body.body)
+
+
+    def hoist(self, loop) -> _List[Statement]:
+        """
+        Returns the assignments that go before the loop.
+        """
+        before = self.move_temporaries(loop)
+
+        defs = assigned_names(loop.body.body)
+        if isinstance(loop, For):
+            defs.add(loop.counter.name)
+            before.extend(self.hoist_bounds(loop, defs))
+
+        hoister = Hoister(self, defs)
+        hoister.generic_visit(loop.body)
+        if not isinstance(loop, For):
+            loop.condition = hoister.visit(loop.condition)
+
+        for expression, name in hoister.hoisted:
+            before.append(VariableAssignement(name, expression))
+        if hoister.hoisted:
+            log(f"From hoist (licm.py): Moved {len(hoister.hoisted)} expressions out of a {type(loop).__name__}", tags=["licm"])
+        return before
+
+
+    def move_temporaries(self, loop) -> _List[Statement]:
+        """
+        The temporaries of an inner loop are assigned at the top level of this loop's body,
+        if their expression is invariant here too the whole assignment goes out.
+        """
+        moved = []
+        kept = []
+        for statement in loop.body.body:
+            if (isinstance(statement, VariableAssignement) and statement.target in self.temporaries
+                    and not statement.target_index):
+                defs = assigned_names([s for s in loop.body.body if s is not statement])
+                if isinstance(loop, For):
+                    defs.add(loop.counter.name)
+                if self.is_movable(statement.expr, defs):
+                    moved.append(statement)
+                    continue
+            kept.append(statement)
+        loop.body.body[:] = kept
+        return moved
+
+
+    def hoist_bounds(self, loop: For, defs: _Set[str]) -> _List[Statement]:
+        before = []
+        for field_name in ("to_expr", "step"):
+            bound = getattr(loop, field_name)
+            if literal_value(bound) is not NOT_A_LITERAL:
+                continue
+            if type(bound) is Variable and not isinstance(bound.var_type, ArrayType) and bound.name not in defs:
+                continue # the backend reads it directly, nothing in the loop changes it
+            name = self.declare(bound)
+            if name is None:
+                continue
+            before.append(VariableAssignement(name, bound))
+            setattr(loop, field_name, Variable(name, None))
+        return before
+
+
+def move_loop_invariants(program: Program, symbols: SymbolTable, types: TypeTable) -> bool:
+    """
+    Returns True if anything was moved. The new temporaries are declared, so the symbol table must be built again.
+    """
+    return LoopInvariantMotion(symbols, types).move(program)
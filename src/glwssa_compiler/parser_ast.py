@@ -139,11 +139,11 @@ class ParserAST:
         self.program_tokens = tokens
         self.tokens = token
 
-        self.program = Program([])
-
         self.procedures: _List[Callable] = []
         self.functions: _List[Callable] = []
 
+        self.program = Program([], self.procedures, self.functions)
+
         self.program_name = Token("nn","nn","nn",-1,-1,-1,-1)
         self.code: _List[str] = []
 
@@ -249,10 +249,13 @@ class ParserAST:
                 log(f"From create tree(parser_ast.py): Found PROCEDURE in line {self.current_line}", tags=["debug", "ct"])
                 token = self.current_token()
                 self.last_scope.expect_empty(token)
-                self.last_scope.append(Scope("PROCEDURE", token))
+                procedure_scope = Scope("PROCEDURE", token)
+                self.last_scope.append(procedure_scope)
                 
                 procedure: Procedure = self.parse_procedure()
                 self.procedures.append(procedure)
+
+                self.last_scope.expect_pop(procedure_scope)
                 
             elif token_type == "FUNCTION":
                 log(f"From create tree(parser_ast.py): Found FUNCTION in line {self.current_line}", tags=["debug", "ct"])
@@ -281,8 +284,7 @@ class ParserAST:
 
             self.expect_token_alone("CONSTANTS")
             self.next_line()
-            self.parse_constant_declaration(branch)
-            self.next_line()
+            self.parse_constant_declaration(branch) # stops at the line after the last constant
             if self.soft_match("VARIABLES") or self.soft_match("START"):
                 self.last_scope.expect_pop(Scope("CONSTANTS", self.current_token()))
 
@@ -595,8 +597,8 @@ class ParserAST:
             self.expect("BOOLEAN")
             return Boolean(token_value)
 
-        elif token_type == "IDENTIFIER":
-            self.expect("IDENTIFIER")
+        elif token_type in {"IDENTIFIER", "BUILTIN_FUNCTION"}:
+            self.expect(token_type)
  
             if self.soft_match("LBRACKET") or self.soft_match("LPAREN"):
                 token = self.current_token().kind
@@ -943,6 +945,22 @@ class ParserAST:
         var_name = token.value
         self.next_token()  # Skip variable
 
+        index: _List[Expression] = []
+        if self.soft_match("LBRACKET"): # Π[i, j] <- ...
+            self.expect("LBRACKET")
+            while True:
+                index.append(self.parse_expression())
+
+                if self.soft_match("COMMA"):
+                    self.next_token()
+                    continue
+
+                if self.soft_match("RBRACKET"):
+                    break
+
+                raise SyntaxError(f"Expected COMMA or RBRACKET, but found {self.current_token().kind} in line {self.get_current_line()}")
+            self.next_token()
+
         self.expect("ASSIGN")
 
         expression = self.parse_expression()
@@ -953,7 +971,7 @@ class ParserAST:
         
         self.expect_eol()
 
-        node = VariableAssignement(target=var_name, expr=expression)
+        node = VariableAssignement(target=var_name, expr=expression, target_index=index)
         branch.body.append(node)
 
 
@@ -1270,6 +1288,11 @@ class ParserAST:
         self.parse_block(body, END_TOKENS_FOR_BLOCK, function_block_dict)
         log(f"From parse_function (parser_ast.py): Done with the parsing of the main block of the function", tags=["pf"])
 
+        # the FUNCTION scope is popped in create_tree
+        if self.current_token().kind in END_TOKENS_FOR_SCOPE:
+            self.match("END_FUNCTION")
+            self.next_line()
+
 
         func = Function(
             name=name,
@@ -1290,13 +1313,17 @@ class ParserAST:
         self.expect("LPAREN")
         params = self._identifier_list(at_least_one_var=True, inside_paren=True)
         self.expect("RPAREN")
-        self.next_line()
 
         body = Block([])
-        self.parse_variables_block(body)
+        self.parse_variables_block(body) # parse_variables_block does a self.next_line() first thing.
 
         self.parse_block(body, END_TOKENS_FOR_BLOCK, self.parse_block_dict)
 
+        # the PROCEDURE scope is popped in create_tree
+        if self.current_token().kind in END_TOKENS_FOR_SCOPE:
+            self.match("END_PROCEDURE")
+            self.next_line()
+
         proc = Procedure(
             name=name,
             params=params,
@@ -0,0 +1,461 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+
+from dataclasses import dataclass
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, CONSTANT, BUILTIN
+
+from typing import Dict as _Dict
+from typing import Optional as _Optional
+from typing import Set as _Set
+from typing import Union as _Union
+
+
+Bound = _Union[int, float] # an int, or -inf/inf
+
+
+@dataclass(frozen=True)
+class Interval:
+    """
+    The values an ΑΚΕΡΑΙΑ can have, low and high included.
+    """
+    low: Bound
+    high: Bound
+
+
+    def __add__(self, other: "Interval") -> "Interval":
+        return Interval(self.low + other.low, self.high + other.high)
+
+
+    def __sub__(self, other: "Interval") -> "Interval":
+        return Interval(self.low - other.high, self.high - other.low)
+
+
+    def __neg__(self) -> "Interval":
+        return Interval(-self.high, -self.low)
+
+
+    def __mul__(self, other: "Interval") -> "Interval":
+        products = [_times(a, b) for a in (self.low, self.high) for b in (other.low, other.high)]
+        return Interval(min(products), max(products))
+
+
+    def hull(self, other: "Interval") -> "Interval":
+        return Interval(min(self.low, other.low), max(self.high, other.high))
+
+
+    def within(self, low: Bound, high: Bound) -> bool:
+        return low <= self.low and self.high <= high
+
+
+TOP = Interval(-math.inf, math.inf)
+
+
+def _times(a: Bound, b: Bound) -> Bound:
+    # 0 * inf is nan for floats, here it is 0
+    return 0 if a == 0 or b == 0 else a * b
+
+
+def _truncate(value: Bound, divisor: int) -> Bound:
+    if math.isinf(value):
+        return value
+    quotient = abs(value) // divisor
+    return quotient if value >= 0 else -quotient
+
+
+# NOT (a < b) is a >= b ...
+NEGATED = {"LT": "GTE", "LTE": "GT", "GT": "LTE", "GTE": "LT", "EQ": "NEQ", "NEQ": "EQ"}
+# a < b is b > a ...
+MIRRORED = {"LT": "GT", "LTE": "GTE", "GT": "LT", "GTE": "LTE", "EQ": "EQ", "NEQ": "NEQ"}
+
+Env = _Dict[str, Interval] # the ΑΚΕΡΑΙΕΣ with a known range, a missing name can have any value
+
+# The rounds loop_head() makes a loop's ranges wider, if they still change after them the loop's variables are forgotten.
+MAX_WIDENING = 5
+
+
+ZERO = Interval(0, 0)
+
+
+class RangeTable:
+    """
+    The result of the analysis: the indexes that are known to be inside the dimension of their array,
+    and the values that can be in the elements of the ΑΚΕΡΑΙΕΣ arrays.
+    """
+    def __init__(self) -> None:
+        self.proven: _Set[int] = set() # id of the index expression
+        self.total = 0
+        self.stored: _Dict[int, Interval] = {} # symbol id of an array -> the values written to its elements
+
+
+    def is_proven(self, index: Expression) -> bool:
+        return id(index) in self.proven
+
+
+    def element_range(self, symbol_id: int) -> Interval:
+        """
+        The elements start as 0, then they only get the values that were stored.
+        """
+        return self.stored.get(symbol_id, ZERO).hull(ZERO)
+
+
+class RangeAnalysis:
+    """
+    Finds the range of every ΑΚΕΡΑΙΑ expression that is used as the index of an array, walking the statements in order
+    with the known ranges of the variables (constants, the counter of ΓΙΑ, assignments, the conditions of ΑΝ/ΟΣΟ).
+    An index is proven if its range is inside 1..dimension, then the backend does not check it.
+
+    A loop is repeated with wider ranges until they cover every repetition (loop_head), so Κ <- 1 before a loop
+    that only adds to Κ keeps Κ >= 1. The counter of a ΓΙΑ that the body does not change is between the ΑΠΟ
+    and the ΜΕΧΡΙ it had before the loop. After ΑΝ/ΕΠΙΛΕΞΕ a variable keeps the range that covers all the branches.
+
+    The ranges of the values stored in the elements of every array are kept too, the backend declares an ΑΚΕΡΑΙΕΣ
+    array with the narrowest C++ type they fit in. An array that is read with ΔΙΑΒΑΣΕ, passed whole or has an
+    element passed to ΚΑΛΕΣΕ can have any value.
+    """
+    def __init__(self, symbols: SymbolTable) -> None:
+        self.symbols = symbols
+        self.table = RangeTable()
+        self.recording = True
+
+
+    def analyze(self, program: Program) -> RangeTable:
+        for owner in [program] + program.procedures + program.functions:
+            self.constants: Env = {}
+            scope = self.symbols.scope_of(owner)
+            for symbol_id in scope.names.values():
+                symbol = self.symbols[symbol_id]
+                if symbol.kind == CONSTANT and isinstance(symbol.node, ConstantDeclaration):
+                    self.constants[symbol.name] = self.interval(symbol.node.expr, self.constants)
+            self.body(owner.body, dict(self.constants))
+        log(f"From analyze (ranges.py): {len(self.table.proven)} of {self.table.total} indexes are in bounds", tags=["rng"])
+        return self.table
+
+
+    def is_integer(self, symbol_id: _Optional[int]) -> bool:
+        return symbol_id is not None and self.symbols[symbol_id].var_type is IntType
+
+
+    def is_array(self, symbol_id: _Optional[int]) -> bool:
+        return symbol_id is not None and isinstance(self.symbols[symbol_id].var_type, ArrayType)
+
+
+    def store(self, symbol_id: _Optional[int], value: Interval) -> None:
+        if not self.recording or not self.is_array(symbol_id):
+            return # the rounds of loop_head() have narrower ranges than the last one
+        previous = self.table.stored.get(symbol_id)
+        self.table.stored[symbol_id] = value if previous is None else previous.hull(value)
+
+    # Expressions ___________________________________________________________________________________________
+
+    def interval(self, node, env: Env) -> Interval:
+        """
+        The range of the expression. The indexes it has are checked on the way.
+        """
+        node_type = type(node)
+        if node_type is Number:
+            value = int(node.value)
+            return Interval(value, value)
+        if node_type is Parentheses:
+            return self.interval(node.exrpession, env)
+        if node_type is Variable:
+            if isinstance(node.var_type, ArrayType): # ΔΙΑΒΑΣΕ Π[i]
+                self.indexes(node.symbol_id, node.var_type.val_dim, env)
+                return TOP
+            if self.is_array(node.symbol_id):
+                self.store(node.symbol_id, TOP) # the whole array is passed or assigned, anything can be written to it
+            return env.get(node.name, TOP)
+        if node_type is ArrayIndex:
+            self.indexes(node.symbol_id, node.index_dim, env)
+            return TOP
+
+        if node_type is UnaryOperator:
+            operand = self.interval(node.operand, env)
+            return -operand if node.operator == "MINUS" else TOP
+
+        if node_type is BinaryOperation:
+            return self.binary(node, env)
+
+        if node_type is CallFunction:
+            args = [self.interval(arg, env) for arg in node.params]
+            symbol = self.symbols[node.symbol_id] if node.symbol_id is not None else None
+            if symbol is not None and symbol.kind == BUILTIN and symbol.name == "Α_Τ" and args:
+                arg = args[0]
+                if arg.low >= 0:
+                    return arg
+                return Interval(0, max(-arg.low, arg.high))
+            return TOP
+
+        return TOP
+
+
+    def binary(self, node: BinaryOperation, env: Env) -> Interval:
+        op = node.operator
+        left = self.interval(node.left, env)
+        if op == "AND":
+            self.interval(node.right, self.refine(env, node.left, True))
+            return TOP
+        if op == "OR":
+            self.interval(node.right, self.refine(env, node.left, False))
+            return TOP
+        right = self.interval(node.right, env)
+
+        if op == "PLUS":
+            return left + right
+        if op == "MINUS":
+            return left - right
+        if op == "MUL":
+            return left * right
+        if op == "IDIV" and right.low == right.high and type(right.low) is int and right.low > 0:
+            return Interval(_truncate(left.low, right.low), _truncate(left.high, right.low))
+        if op == "MOD" and right.low >= 1:
+            # the sign of the result is the sign of the left side, as in C++
+            largest = right.high - 1
+            if left.low >= 0:
+                return Interval(0, min(left.high, largest))
+            if left.high <= 0:
+                return Interval(max(left.low, -largest), 0)
+            return Interval(-largest, largest)
+        return TOP
+
+
+    def indexes(self, symbol_id: _Optional[int], indexes: list, env: Env) -> None:
+        array_type = self.symbols[symbol_id].var_type if symbol_id is not None else None
+        dims = array_type.val_dim if isinstance(array_type, ArrayType) else []
+        for position, index in enumerate(indexes):
+            interval = self.interval(index, env)
+            if not self.recording or position >= len(dims):
+                continue
+            self.table.total += 1
+            dim = self.interval(dims[position], self.constants)
+            if interval.within(1, dim.low):
+                self.table.proven.add(id(index))
+
+    # Conditions ____________________________________________________________________________________________
+
+    def refine(self, env: Env, condition, truth: bool) -> Env:
+        """
+        The ranges that hold where the condition is `truth`.
+        """
+        while isinstance(condition, Parentheses):
+            condition = condition.exrpession
+        if isinstance(condition, UnaryOperator) and condition.operator == "NOT":
+            return self.refine(env, condition.operand, not truth)
+        if not isinstance(condition, BinaryOperation):
+            return env
+
+        op = condition.operator
+        if (op == "AND" and truth) or (op == "OR" and not truth):
+            return self.refine(self.refine(env, condition.left, truth), condition.right, truth)
+        if op not in NEGATED:
+            return env
+
+        op = op if truth else NEGATED[op]
+        env = dict(env)
+        for variable, other, variable_op in ((condition.left, condition.right, op),
+                                             (condition.right, condition.left, MIRRORED[op])):
+            if type(variable) is Variable and self.is_integer(variable.symbol_id) \
+                    and self.symbols[variable.symbol_id].kind != CONSTANT:
+                bound = self.quiet_interval(other, env)
+                current = env.get(variable.name, TOP)
+                env[variable.name] = self.narrow(current, variable_op, bound)
+        return env
+
+
+    def quiet_interval(self, node, env: Env) -> Interval:
+        """
+        interval() without looking at the indexes again, they were looked at when the condition was evaluated.
+        """
+        recording, self.recording = self.recording, False
+        try:
+            return self.interval(node, env)
+        finally:
+            self.recording = recording
+
+
+    def narrow(self, current: Interval, op: str, bound: Interval) -> Interval:
+        if op == "LT":
+            return Interval(current.low, min(current.high, bound.high - 1))
+        if op == "LTE":
+            return Interval(current.low, min(current.high, bound.high))
+        if op == "GT":
+            return Interval(max(current.low, bound.low + 1), current.high)
+        if op == "GTE":
+            return Interval(max(current.low, bound.low), current.high)
+        if op == "EQ":
+            return Interval(max(current.low, bound.low), min(current.high, bound.high))
+        return current
+
+    # Statements ____________________________________________________________________________________________
+
+    def body(self, statements: list, env: Env) -> Env:
+        for statement in statements:
+            env = self.statement(statement, env)
+        return env
+
+
+    def forget(self, env: Env, names: set) -> Env:
+        return {name: interval for name, interval in env.items() if name not in names}
+
+
+    def join(self, envs: list) -> Env:
+        first, *rest = envs
+        joined = dict(first)
+        for env in rest:
+            joined = {name: interval.hull(env[name]) for name, interval in joined.items() if name in env}
+        return joined
+
+
+    def statement(self, node, env: Env) -> Env:
+        if isinstance(node, VariableAssignement):
+            self.indexes(node.target_id, node.target_index, env)
+            value = self.interval(node.expr, env)
+            if node.target_index or self.is_array(node.target_id):
+                self.store(node.target_id, value if node.target_index else TOP)
+                return env
+            env = dict(env)
+            if self.is_integer(node.target_id):
+                env[node.target] = value
+            else:
+                env.pop(node.target, None)
+            return env
+
+        if isinstance(node, Write):
+            for expression in node.expression:
+                self.interval(expression, env)
+            return env
+
+        if isinstance(node, Read):
+            for variable in node.variable_list:
+                self.interval(variable, env)
+                if isinstance(variable.var_type, ArrayType):
+                    self.store(variable.symbol_id, TOP)
+                else:
+                    env = self.forget(env, {variable.name})
+            return env
+
+        if isinstance(node, CallProcedure):
+            for arg in node.params:
+                self.interval(arg, env)
+                if isinstance(arg, ArrayIndex):
+                    self.store(arg.symbol_id, TOP) # the procedure writes the element back
+            return self.forget(env, {arg.name for arg in node.params if type(arg) is Variable})
+
+        if isinstance(node, If):
+            exits = []
+            for branch in node.branches:
+                self.interval(branch.condition, env)
+                exits.append(self.body(branch.body.body, self.refine(env, branch.condition, True)))
+                env = self.refine(env, branch.condition, False)
+            exits.append(self.body(node.else_branch.body, env) if node.else_branch is not None else env)
+            return self.join(exits)
+
+        if isinstance(node, Switch):
+            self.interval(node.expr, env)
+            exits = []
+            for branch in node.branches:
+                for case in branch.condition:
+                    self.interval(case, env)
+                exits.append(self.body(branch.body.body, env))
+            exits.append(self.body(node.else_branch.body, env) if node.else_branch is not None else env)
+            return self.join(exits)
+
+        if isinstance(node, While):
+            def repetition(head: Env) -> Env:
+                return self.body(node.body.body, self.refine(head, node.condition, True))
+            head = self.loop_head(env, assigned_names(node.body.body), repetition)
+            self.interval(node.condition, head)
+            repetition(head)
+            return self.refine(head, node.condition, False)
+
+        if isinstance(node, Do):
+            # the body runs again when the condition is false
+            def repetition(head: Env) -> Env:
+                return self.refine(self.body(node.body.body, head), node.condition, False)
+            head = self.loop_head(env, assigned_names(node.body.body), repetition)
+            exit_env = self.body(node.body.body, head)
+            self.interval(node.condition, exit_env)
+            return self.refine(exit_env, node.condition, True)
+
+        if isinstance(node, For):
+            return self.for_loop(node, env)
+
+        return env
+
+
+    def for_loop(self, node: For, env: Env) -> Env:
+        start = self.interval(node.from_expr, env)
+        end = self.interval(node.to_expr, env)
+        self.interval(node.step, env)
+
+        changed = assigned_names(node.body.body)
+        counter = node.counter.name
+        counter_range = None
+        if counter not in changed and self.is_integer(node.counter.symbol_id):
+            # the body runs only for the values between ΑΠΟ and ΜΕΧΡΙ, whichever the direction
+            counter_range = Interval(min(start.low, end.low), max(start.high, end.high))
+            step = node.step
+            if type(step) is Number and int(step.value) >= 0:
+                counter_range = Interval(start.low, end.high)
+            elif type(step) is Number or (type(step) is UnaryOperator and step.operator == "MINUS"
+                                          and type(step.operand) is Number):
+                counter_range = Interval(end.low, start.high)
+
+        def repetition(head: Env) -> Env:
+            head = self.forget(head, {counter})
+            if counter_range is not None:
+                head[counter] = counter_range
+            return self.body(node.body.body, head)
+
+        head = self.loop_head(self.forget(env, {counter}), changed | {counter}, repetition)
+        repetition(head)
+        return self.forget(head, {counter})
+
+
+    def loop_head(self, env: Env, changed: set, repetition) -> Env:
+        """
+        The ranges that hold every time the loop starts a repetition: the ones before the loop, made wider
+        until one more repetition does not change them. A bound that keeps moving becomes infinite, so it ends
+        in a few rounds. The indexes are not looked at in these rounds, the caller runs the body once more with the result.
+        """
+        recording, self.recording = self.recording, False
+        try:
+            head = env
+            for _ in range(MAX_WIDENING):
+                wider = self.widen(head, self.join([head, repetition(head)]))
+                if wider == head:
+                    return head
+                head = wider
+            return self.forget(env, changed)
+        finally:
+            self.recording = recording
+
+
+    def widen(self, old: Env, new: Env) -> Env:
+        widened = {}
+        for name, interval in new.items():
+            previous = old.get(name)
+            if previous is None:
+                continue
+            low = previous.low if interval.low >= previous.low else -math.inf
+            high = previous.high if interval.high <= previous.high else math.inf
+            widened[name] = Interval(low, high)
+        return widened
+
+
+def analyze_ranges(program: Program, symbols: SymbolTable) -> RangeTable:
+    return RangeAnalysis(symbols).analyze(program)
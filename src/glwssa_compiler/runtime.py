@@ -0,0 +1,107 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import re
+import subprocess
+import tempfile
+
+from .log import log
+
+from typing import Dict as _Dict
+from typing import Sequence as _Sequence
+
+
+# The runtime of the generated code (builtins, index checks, arrays) is one header next to this file.
+RUNTIME_HEADER = "glwssa_runtime.hpp"
+RUNTIME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), RUNTIME_HEADER)
+
+# inline: the header is pasted at the top of the code, the code compiles on its own
+# include: the code starts with #include of the header, the compiler finds it (or its .gch) with -I
+RUNTIME_MODES = ("inline", "include")
+
+with open(RUNTIME_PATH, encoding="utf-8") as _file:
+    RUNTIME_SOURCE = _file.read()
+
+RUNTIME_VERSION = int(re.search(r"#define GLWSSA_RUNTIME_VERSION (\d+)", RUNTIME_SOURCE).group(1))
+
+_compiler_versions: _Dict[str, str] = {}
+
+
+def runtime_code(mode: str) -> str:
+    """
+    What the backend writes before the code of the program.
+    """
+    if mode not in RUNTIME_MODES:
+        raise ValueError(f"Unknown runtime mode '{mode}', expected one of {RUNTIME_MODES}")
+    return RUNTIME_SOURCE if mode == "inline" else f'#include "{RUNTIME_HEADER}"\n'
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "glwssa-compiler")
+
+
+def compiler_version(compiler: str) -> str:
+    """
+    The first line of `compiler --version`, a .gch only works with the compiler that made it.
+    """
+    if compiler not in _compiler_versions:
+        output = subprocess.run([compiler, "--version"], capture_output=True, text=True, check=True).stdout
+        _compiler_versions[compiler] = output.splitlines()[0] if output else ""
+    return _compiler_versions[compiler]
+
+
+def replace_file(path: str, write) -> None:
+    """
+    Makes the file under a temporary name and then renames it, so a run that compiles at the same time
+    sees the old file or the new one, never half of it.
+    """
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    os.close(descriptor)
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def precompiled_header(cache_dir: str, compiler: str = "g++", flags: _Sequence[str] = ()) -> str:
+    """
+    Returns the directory with the header and its precompiled .gch, to give to the compiler with -I.
+    The .gch is made once for every version of the runtime, compiler and flags, and used from then on.
+    The flags must be the ones the program is compiled with, or g++ ignores the .gch and reads the header.
+    """
+    key = hashlib.sha256("\0".join([RUNTIME_SOURCE, compiler, compiler_version(compiler), *flags]).encode()).hexdigest()
+    directory = os.path.join(cache_dir, f"runtime-v{RUNTIME_VERSION}-{key[:16]}")
+    header = os.path.join(directory, RUNTIME_HEADER)
+    gch = header + ".gch"
+    if os.path.exists(gch):
+        log(f"From precompiled_header (runtime.py): Using {gch}", tags=["rt"])
+        return directory
+
+    os.makedirs(directory, exist_ok=True)
+    if not os.path.exists(header):
+        def write_header(path: str) -> None:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(RUNTIME_SOURCE)
+        replace_file(header, write_header)
+
+    def compile_header(path: str) -> None:
+        subprocess.run([compiler, *flags, "-x", "c++-header", header, "-o", path], check=True)
+    replace_file(gch, compile_header)
+    log(f"From precompiled_header (runtime.py): Made {gch}", tags=["rt"])
+    return directory
@@ -0,0 +1,167 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import copy
+import math
+
+from .log import log
+from .ast_nodes import *
+from .type_inference import TypeTable
+from .constant_folding import literal_value, NOT_A_LITERAL
+
+from typing import Optional as _Optional
+
+
+# Χ^n of ΑΚΕΡΑΙΕΣ becomes n-1 multiplications up to this n, above it glwssa_ipow is faster.
+MAX_POWER = 4
+
+
+def is_simple(node) -> bool:
+    """
+    Cheap enough to write twice: a variable, a literal, or an element with such indexes.
+    """
+    while isinstance(node, Parentheses):
+        node = node.exrpession
+    if isinstance(node, ArrayIndex):
+        return all(isinstance(index, (Variable, Literal)) for index in node.index_dim)
+    if isinstance(node, Variable):
+        return not isinstance(node.var_type, ArrayType)
+    return isinstance(node, Literal)
+
+
+def power_of_two(value) -> _Optional[int]:
+    """
+    k if |value| is 2^k (k can be negative), else None. Dividing by it is the same as multiplying by 1/value, exactly.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value == 0 or not math.isfinite(value):
+        return None
+    mantissa, exponent = math.frexp(abs(value))
+    if mantissa != 0.5 or not -1000 <= exponent - 1 <= 1000:
+        return None
+    return exponent - 1
+
+
+class StrengthReducer(NodeTransformer):
+    """
+    Replaces the expensive operators with cheaper ones that give exactly the same value:
+
+        Χ^2, Χ^3 ... of ΑΚΕΡΑΙΕΣ    -> Χ*Χ, Χ*Χ*Χ (the generated code calls glwssa_ipow)
+        Χ^2 of ΠΡΑΓΜΑΤΙΚΕΣ          -> Χ*Χ (std::pow(x, 2) is rounded the same as x*x)
+        Χ^0, Χ^1                    -> 1, Χ
+        Χ / 2^k                     -> Χ * 2^-k (the reciprocal of a power of two is exact)
+        Χ * 2 of ΠΡΑΓΜΑΤΙΚΕΣ        -> Χ + Χ
+        Χ DIV 1, Χ DIV -1, Χ MOD ±1 -> Χ, -Χ, 0
+        Χ * 1, Χ + 0, Χ - 0         -> Χ, where the type stays the same
+
+    DIV and MOD by other literals are left alone, g++ turns them into shifts and multiplications even
+    without -O, and it keeps the truncation towards zero that ΓΛΩΣΣΑ has.
+    """
+    def __init__(self, types: TypeTable) -> None:
+        super().__init__()
+        self.types = types
+        self.changed = False
+
+
+    def reduced(self, node: BinaryOperation, replacement: Expression) -> Expression:
+        self.changed = True
+        log(f"From reduced (strength_reduction.py): '{node.operator}' became {type(replacement).__name__}", tags=["sr"])
+        return replacement
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> CallProcedure:
+        # a whole argument is left as it is, Χ * 1 must not become the variable Χ that the procedure writes back to
+        for arg in node.params:
+            self.generic_visit(arg)
+        return node
+
+
+    def visit_BinaryOperation(self, node: BinaryOperation) -> Expression:
+        self.generic_visit(node)
+        node_type = self.types.type_of(node)
+        if node_type not in (IntType, RealType):
+            return node
+
+        left, right, op = node.left, node.right, node.operator
+        left_value, right_value = literal_value(left), literal_value(right)
+        left_type = self.types.type_of(left)
+
+        if op == "POW":
+            return self.power(node, node_type, left_type)
+
+        if op == "FDIV":
+            k = power_of_two(right_value)
+            if k is not None:
+                reciprocal = Float(repr(math.copysign(2.0 ** -k, right_value)))
+                return self.reduced(node, BinaryOperation(left, "MUL", reciprocal))
+            return node
+
+        if op == "IDIV" and right_value in (1, -1) and type(right_value) is int:
+            return self.reduced(node, left if right_value == 1 else UnaryOperator("MINUS", left))
+
+        if op == "MOD" and right_value in (1, -1) and type(right_value) is int:
+            return self.reduced(node, Number("0"))
+
+        if op == "MUL":
+            for this, value in ((left, right_value), (right, left_value)):
+                if value == 1 and type(value) is not bool and self.types.type_of(this) is node_type:
+                    return self.reduced(node, this)
+                if value == 2 and type(value) is not bool and node_type is RealType \
+                        and self.types.type_of(this) is RealType and is_simple(this):
+                    return self.reduced(node, BinaryOperation(this, "PLUS", copy.deepcopy(this)))
+            return node
+
+        if op in {"PLUS", "MINUS"} and right_value == 0 and type(right_value) is not bool and left_type is node_type:
+            # Χ + 0.0 is not Χ when Χ is -0.0, Χ - 0.0 always is
+            if node_type is IntType or op == "MINUS":
+                return self.reduced(node, left)
+
+        if op == "PLUS" and left_value == 0 and type(left_value) is int and self.types.type_of(right) is IntType:
+            return self.reduced(node, right)
+
+        return node
+
+
+    def power(self, node: BinaryOperation, node_type, base_type) -> Expression:
+        exponent = literal_value(node.right)
+        if isinstance(exponent, bool) or not isinstance(exponent, (int, float)) \
+                or not math.isfinite(exponent) or exponent != int(exponent):
+            return node
+        exponent = int(exponent)
+        base = node.left
+
+        if node_type is IntType:
+            if not 0 <= exponent <= MAX_POWER:
+                return node
+        elif base_type is not RealType or exponent not in (0, 1, 2):
+            return node # Χ*Χ*Χ rounds twice, std::pow once
+
+        if exponent == 0: # glwssa_ipow(0, 0) and std::pow(0, 0) are 1 too
+            return self.reduced(node, Number("1") if node_type is IntType else Float("1.0"))
+        if exponent == 1:
+            return self.reduced(node, base) if base_type is node_type else node
+        if not is_simple(base):
+            return node
+
+        product = base
+        for _ in range(exponent - 1):
+            product = BinaryOperation(product, "MUL", copy.deepcopy(base))
+        return self.reduced(node, product)
+
+
+def reduce_strength(program: Program, types: TypeTable) -> bool:
+    """
+    Returns True if any operator was replaced.
+    """
+    reducer = StrengthReducer(types)
+    reducer.generic_visit(program)
+    return reducer.changed
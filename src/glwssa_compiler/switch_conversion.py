@@ -0,0 +1,161 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .ast_nodes import *
+from .symbol_table import SymbolTable, BUILTIN
+from .type_inference import TypeTable
+from .dispatch import plan_dispatch, constant_value
+
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+
+
+# Χ op c and c op Χ test the same thing with the operator turned around.
+FLIPPED = {"EQ": "EQ", "GT": "LT", "LT": "GT", "GTE": "LTE", "LTE": "GTE"}
+
+
+def unwrap(node):
+    while type(node) is Parentheses:
+        node = node.exrpession
+    return node
+
+
+class SwitchConversion(NodeTransformer):
+    """
+    Rewrites the chains of ΑΝ ... ΑΛΛΙΩΣ_ΑΝ that compare the same expression with constants into an ΕΠΙΛΕΞΕ,
+    so the backend writes them as a C++ switch or a decision tree (dispatch.py):
+
+        ΑΝ Χ = 1 Ή Χ = 3 ΤΟΤΕ           ΕΠΙΛΕΞΕ Χ
+        ΑΛΛΙΩΣ_ΑΝ Χ >= 5 ΚΑΙ Χ <= 9       ΠΕΡΙΠΤΩΣΗ 1, 3
+        ΑΛΛΙΩΣ_ΑΝ 20 < Χ ΤΟΤΕ      ->     ΠΕΡΙΠΤΩΣΗ 5..9
+                                           ΠΕΡΙΠΤΩΣΗ > 20
+
+    Every condition must be Χ = c, Χ </<=/>/>= c, a range (two of them joined with ΚΑΙ) or such tests joined with Ή.
+    Χ is an ΑΚΕΡΑΙΑ without calls of the program (it is found once, not once for every test), the first branch whose
+    condition is true still runs. A chain that the backend would write as tests in order is left as it is.
+    """
+    def __init__(self, symbols: SymbolTable, types: TypeTable) -> None:
+        super().__init__()
+        self.symbols = symbols
+        self.types = types
+        self.changed = False
+
+
+    def convert(self, program: Program) -> bool:
+        for owner in [program] + program.procedures + program.functions:
+            owner.body[:] = [self.visit(statement) for statement in owner.body]
+        return self.changed
+
+
+    def visit_If(self, node: If):
+        self.generic_visit(node)
+        subject = None
+        branches = []
+        for branch in node.branches:
+            tests = self.tests(branch.condition)
+            if tests is None:
+                return node
+            cases = []
+            for expr, case in tests:
+                if subject is None:
+                    subject = expr
+                elif expr != subject:
+                    return node
+                cases.append(case)
+            branches.append(Branch(cases, branch.body))
+
+        if subject is None or not self.is_pure(subject):
+            return node
+        switch = Switch(subject, branches, node.else_branch)
+        if plan_dispatch(switch, self.symbols, self.types) is None:
+            return node
+        self.changed = True
+        log(f"From visit_If (switch_conversion.py): An ΑΝ of {len(branches)} branches is now an ΕΠΙΛΕΞΕ", tags=["swc"])
+        return switch
+
+    # Conditions ____________________________________________________________________________________________
+
+    def tests(self, condition) -> _Optional[_List[_Tuple[Expression, Expression]]]:
+        """
+        The (Χ, case) of every test the condition joins with Ή, None if it is not such a condition.
+        """
+        condition = unwrap(condition)
+        if type(condition) is not BinaryOperation:
+            return None
+        if condition.operator == "OR":
+            left, right = self.tests(condition.left), self.tests(condition.right)
+            return None if left is None or right is None else left + right
+        if condition.operator == "AND":
+            test = self.range_test(condition)
+            return None if test is None else [test]
+        test = self.comparison(condition)
+        if test is None:
+            return None
+        expr, operator, value = test
+        return [(expr, value if operator == "EQ" else UnaryOperator(operator, value))]
+
+
+    def comparison(self, node) -> _Optional[_Tuple[Expression, str, Expression]]:
+        """
+        Χ op c as (Χ, op, c), c is a constant and Χ is not.
+        """
+        node = unwrap(node)
+        if type(node) is not BinaryOperation or node.operator not in FLIPPED:
+            return None
+        if self.is_constant(node.right) and not self.is_constant(node.left):
+            return unwrap(node.left), node.operator, node.right
+        if self.is_constant(node.left) and not self.is_constant(node.right):
+            return unwrap(node.right), FLIPPED[node.operator], node.left
+        return None
+
+
+    def range_test(self, node: BinaryOperation) -> _Optional[_Tuple[Expression, Expression]]:
+        """
+        Χ >= a ΚΑΙ Χ <= b (in any order, > and < too) as (Χ, a..b).
+        """
+        left, right = self.comparison(node.left), self.comparison(node.right)
+        if left is None or right is None or left[0] != right[0]:
+            return None
+        if left[1] in ("LT", "LTE"):
+            left, right = right, left
+        if left[1] not in ("GT", "GTE") or right[1] not in ("LT", "LTE"):
+            return None
+        low = constant_value(left[2], self.symbols) + (left[1] == "GT")
+        high = constant_value(right[2], self.symbols) - (right[1] == "LT")
+        return left[0], BinaryOperation(Number(str(low)), "PERIOD", Number(str(high)))
+
+
+    def is_constant(self, node) -> bool:
+        return constant_value(node, self.symbols) is not None
+
+
+    def is_pure(self, node) -> bool:
+        """
+        An ΑΚΕΡΑΙΑ that has the same value in every test: no ΣΥΝΑΡΤΗΣΗ of the program is called.
+        """
+        if self.types.type_of(node) is not IntType:
+            return False
+        for child in walk(node):
+            if isinstance(child, CallFunction):
+                if child.symbol_id is None or self.symbols[child.symbol_id].kind != BUILTIN:
+                    return False
+        return True
+
+
+def convert_if_chains(program: Program, symbols: SymbolTable, types: TypeTable) -> bool:
+    """
+    Returns True if any ΑΝ became an ΕΠΙΛΕΞΕ.
+    """
+    return SwitchConversion(symbols, types).convert(program)
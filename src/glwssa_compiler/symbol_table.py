@@ -0,0 +1,251 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+
+from dataclasses import dataclass, field
+
+from .log import log
+from .data import UndefinedVariable
+from .error import ErrorStack
+from .ast_nodes import *
+
+from typing import Any as _Any
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Union as _Union
+
+
+# Symbol kinds
+PROGRAM = "PROGRAM"
+PROCEDURE = "PROCEDURE"
+FUNCTION = "FUNCTION"
+BUILTIN = "BUILTIN"
+CONSTANT = "CONSTANT"
+VARIABLE = "VARIABLE"
+PARAMETER = "PARAMETER"
+RESULT = "RESULT" # the name of a function inside its body, assigning to it returns the value
+
+SUBPROGRAM_KINDS = {PROCEDURE, FUNCTION, BUILTIN}
+
+# The names are the ones the lexer gives. Α_Μ, Α_Τ and Τ_Ρ are BUILTIN_FUNCTION tokens so they keep their value,
+# the rest are plain identifiers.
+BUILTIN_FUNCTIONS = ("Α_Μ", "Α_Τ", "Τ_Ρ", "gr_HM", "gr_SYN", "gr_EF", "gr_E", "gr_LOG")
+
+
+@dataclass
+class Symbol:
+    id: int
+    name: str
+    kind: str
+    var_type: _Any # IntType/RealType/CharType/BoolType, an ArrayType or None if it is not known yet
+    scope: "SymbolScope"
+    node: _Any = None # the declaration (VariableDeclaration, ConstantDeclaration, Procedure, Function)
+    param_index: _Optional[int] = None
+
+
+@dataclass
+class SymbolScope:
+    """
+    The scope of the program or of a subprogram. In ΓΛΩΣΣΑ the scopes do not nest,
+    the only parent is the global scope with the subprograms and the builtin functions.
+    """
+    name: str
+    kind: str
+    parent: _Optional["SymbolScope"] = None
+    names: _Dict[str, int] = field(default_factory=dict)
+    params: _List[int] = field(default_factory=list)
+
+
+    def lookup(self, name: str) -> _Optional[int]:
+        scope = self
+        while scope is not None:
+            symbol_id = scope.names.get(name)
+            if symbol_id is not None:
+                return symbol_id
+            scope = scope.parent
+        return None
+
+
+class SymbolTable:
+    """
+    Every declaration gets a dense id (0, 1, 2 ...) so the passes and the backend can keep
+    their per-variable data in lists indexed by the id, instead of dicts of names.
+    """
+    def __init__(self) -> None:
+        self.symbols: _List[Symbol] = []
+        self.global_scope = SymbolScope("", "GLOBAL")
+        self.scopes: _List[SymbolScope] = []
+        self._scope_of_owner: _Dict[int, SymbolScope] = {}
+
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+    def __getitem__(self, symbol_id: int) -> Symbol:
+        return self.symbols[symbol_id]
+
+
+    def new_scope(self, owner, name: str, kind: str) -> SymbolScope:
+        scope = SymbolScope(sys.intern(name), kind, self.global_scope)
+        self.scopes.append(scope)
+        self._scope_of_owner[id(owner)] = scope
+        return scope
+
+
+    def scope_of(self, owner: _Union[Program, Callable]) -> SymbolScope:
+        """
+        The scope of the Program, Procedure or Function node.
+        """
+        return self._scope_of_owner[id(owner)]
+
+
+    def declare(self, scope: SymbolScope, name: str, kind: str, var_type=None, node=None) -> int:
+        """
+        Adds the name to the scope. If it is already declared in the same scope, the first declaration is kept.
+        """
+        name = sys.intern(name)
+        symbol_id = scope.names.get(name)
+        if symbol_id is not None:
+            log(f"From declare (symbol_table.py): '{name}' is declared again in '{scope.name}'", tags=["st"])
+            return symbol_id
+
+        symbol_id = len(self.symbols)
+        self.symbols.append(Symbol(symbol_id, name, kind, var_type, scope, node))
+        scope.names[name] = symbol_id
+        return symbol_id
+
+
+    def lookup(self, scope: SymbolScope, name: str) -> _Optional[Symbol]:
+        symbol_id = scope.lookup(name)
+        return None if symbol_id is None else self.symbols[symbol_id]
+
+
+class SymbolTableBuilder(NodeVisitor):
+    """
+    Declares everything in the ΣΤΑΘΕΡΕΣ/ΜΕΤΑΒΛΗΤΕΣ of the program and of every subprogram,
+    then resolves every name that is used and writes the id on the node.
+    """
+    def __init__(self, error_stack: ErrorStack) -> None:
+        super().__init__()
+        self.error_stack = error_stack
+        self.table = SymbolTable()
+        self.scope = self.table.global_scope
+
+
+    def build(self, program: Program) -> SymbolTable:
+        for name in BUILTIN_FUNCTIONS:
+            self.table.declare(self.table.global_scope, name, BUILTIN)
+        for procedure in program.procedures:
+            self.table.declare(self.table.global_scope, procedure.name.value, PROCEDURE, None, procedure)
+        for function in program.functions:
+            self.table.declare(self.table.global_scope, function.name.value, FUNCTION, function.func_type, function)
+
+        program_name = program.body[0].name if program.body and isinstance(program.body[0], ProgramName) else ""
+        self.table.declare(self.table.global_scope, program_name, PROGRAM, None, program)
+
+        self.scope = self.table.new_scope(program, program_name, PROGRAM)
+        self.visit_scope(program.body)
+
+        for subprogram in program.procedures + program.functions:
+            kind = FUNCTION if isinstance(subprogram, Function) else PROCEDURE
+            self.scope = self.table.new_scope(subprogram, subprogram.name.value, kind)
+            if kind == FUNCTION:
+                self.table.declare(self.scope, subprogram.name.value, RESULT, subprogram.func_type, subprogram)
+
+            self.declare_all(subprogram.body)
+            self.declare_params(subprogram)
+            self.visit_body(subprogram.body)
+
+        log(f"From build (symbol_table.py): {len(self.table)} symbols in {len(self.table.scopes)} scopes", tags=["st"])
+        return self.table
+
+
+    def visit_scope(self, body: _List[Statement]) -> None:
+        self.declare_all(body)
+        self.visit_body(body)
+
+
+    def declare_all(self, body: _List[Statement]) -> None:
+        for node in body:
+            if isinstance(node, VariableDeclaration):
+                variable = node.variable
+                variable.symbol_id = self.table.declare(self.scope, variable.name, VARIABLE, variable.var_type, node)
+            elif isinstance(node, ConstantDeclaration):
+                self.table.declare(self.scope, node.name, CONSTANT, None, node)
+
+
+    def declare_params(self, subprogram: Callable) -> None:
+        """
+        The parameters must also be declared in the ΜΕΤΑΒΛΗΤΕΣ of the subprogram, that is where their type is.
+        """
+        for index, param in enumerate(subprogram.params):
+            symbol_id = self.scope.names.get(param.name)
+            if symbol_id is None:
+                self.error_stack.push(UndefinedVariable(param.name, self.scope.name))
+                symbol_id = self.table.declare(self.scope, param.name, PARAMETER)
+
+            symbol = self.table[symbol_id]
+            symbol.kind = PARAMETER
+            symbol.param_index = index
+            param.symbol_id = symbol_id
+            self.scope.params.append(symbol_id)
+
+
+    def visit_body(self, body: _List[Statement]) -> None:
+        for node in body:
+            if isinstance(node, VariableDeclaration):
+                # only the array dimensions need resolving
+                if isinstance(node.variable.var_type, ArrayType):
+                    for dim in node.variable.var_type.val_dim:
+                        self.visit(dim)
+            else:
+                self.visit(node)
+
+
+    def resolve(self, name: str) -> _Optional[int]:
+        symbol_id = self.scope.lookup(name)
+        if symbol_id is None:
+            self.error_stack.push(UndefinedVariable(name, self.scope.name))
+        return symbol_id
+
+
+    def visit_Variable(self, node: Variable) -> None:
+        node.symbol_id = self.resolve(node.name)
+        self.generic_visit(node) # the index of ΔΙΑΒΑΣΕ Π[i] is stored in an ArrayType
+
+
+    def visit_ArrayIndex(self, node: ArrayIndex) -> None:
+        node.symbol_id = self.resolve(node.name)
+        self.generic_visit(node)
+
+
+    def visit_VariableAssignement(self, node: VariableAssignement) -> None:
+        node.target_id = self.resolve(node.target)
+        self.generic_visit(node)
+
+
+    def visit_CallFunction(self, node: CallFunction) -> None:
+        node.symbol_id = self.resolve(node.name)
+        self.generic_visit(node)
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> None:
+        node.symbol_id = self.resolve(node.name)
+        self.generic_visit(node)
+
+
+def build_symbol_table(program: Program, error_stack: ErrorStack) -> SymbolTable:
+    return SymbolTableBuilder(error_stack).build(program)
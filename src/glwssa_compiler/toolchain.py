@@ -0,0 +1,184 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, asdict
+
+from .log import log
+from .runtime import compiler_version, replace_file
+
+from typing import Callable as _Callable
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Sequence as _Sequence
+from typing import TextIO as _TextIO
+
+
+PROBE_VERSION = 1 # a cached probe of an older version is made again
+
+COMPILERS = ("g++", "clang++") # the first one that is installed is used
+if os.name == "nt": # https://github.com/niXman/mingw-builds-binaries?tab=readme-ov-file
+    COMPILERS = ("/mingw64/bin/g++.exe",) + COMPILERS
+
+PROBE_PROGRAM = "int main() { return 0; }\n"
+
+# profile -> the flags it always has, the ones a compiler may not have are added by profile_flags()
+PROFILES: _Dict[str, _List[str]] = {
+    "fast-compile": ["-O0"],    # the quickest g++, for checking and grading
+    "debug": ["-Og", "-g"],     # for gdb
+    "release": ["-O2"],
+    "release-native": ["-O3"],  # only for the machine that compiles it, with -march=native (and -flto for units)
+}
+DEFAULT_PROFILE = "fast-compile"
+# the profiles where the C++ compiler does not inline the small subprograms itself, -O2 inlines them only for these
+INLINING_PROFILES = ("fast-compile", "debug")
+
+
+@dataclass
+class Toolchain:
+    """
+    A compiler and what it can do, found once by probe_toolchain().
+    """
+    compiler: str
+    version: str
+    clang: bool
+    native: bool # -march=native
+    lto: bool    # -flto, with the linker
+    pipe: bool   # -pipe, no temporary files between cc1plus and as
+
+
+def compile_piped(write: _Callable[[_TextIO], object], executable: str, compiler: str = "g++",
+                  flags: _Sequence[str] = ()) -> None:
+    """
+    Compiles the C++ code that write(stream) writes, without a .cpp file: the stream is the stdin of
+    `compiler -x c++ -`, g++ starts while the backend still writes (TranspilerBackend_cpp.write_tree gives it the
+    lines in groups of FLUSH_LINES).
+
+    g++ writes the executable under a unique name next to it, which is renamed when g++ succeeds, so runs that compile
+    in the same directory at the same time never write the same file. Raises subprocess.CalledProcessError if g++ fails.
+    """
+    def compile_to(path: str) -> None:
+        os.remove(path) # the linker makes it again, with the permissions of an executable
+        command = [compiler, *flags, "-x", "c++", "-", "-o", path]
+        log(f"From compile_piped (toolchain.py): Running {command}", tags=["tc"])
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, encoding="utf-8")
+        try:
+            write(process.stdin)
+            process.stdin.close()
+        except BrokenPipeError:
+            # g++ stopped reading, its error is reported with its exit code
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        returncode = process.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    replace_file(os.path.abspath(executable), compile_to)
+
+
+def accepts(compiler: str, flags: _Sequence[str], link: bool = False) -> bool:
+    """
+    True if the compiler builds PROBE_PROGRAM with the flags (only checks it without link).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output = ["-o", os.path.join(directory, "probe.out")] if link else ["-fsyntax-only"]
+        try:
+            result = subprocess.run([compiler, *flags, "-x", "c++", "-", *output], input=PROBE_PROGRAM, text=True,
+                                    capture_output=True)
+        except OSError:
+            return False
+    return result.returncode == 0
+
+
+def probe_compiler(compiler: str) -> Toolchain:
+    version = compiler_version(compiler)
+    return Toolchain(
+        compiler=compiler,
+        version=version,
+        clang="clang" in version.lower(),
+        native=accepts(compiler, ["-march=native"]),
+        lto=accepts(compiler, ["-flto"], link=True),
+        pipe=accepts(compiler, ["-pipe"]),
+    )
+
+
+_toolchains: _Dict[str, Toolchain] = {}
+
+
+def probe_toolchain(cache_dir: _Optional[str] = None, compilers: _Sequence[str] = COMPILERS) -> Toolchain:
+    """
+    The Toolchain of the first of the compilers that is installed. Raises FileNotFoundError if none is.
+
+    Probing compiles a few empty programs, the result is kept in <cache_dir>/toolchain-<hash>.json. The hash is of the
+    path, size and time of the compiler's file, a compiler that is installed again or updated is probed again.
+    """
+    for compiler in compilers:
+        path = shutil.which(compiler)
+        if path is not None:
+            break
+    else:
+        raise FileNotFoundError(f"none of the compilers {', '.join(compilers)} is installed")
+
+    info = os.stat(path)
+    key = hashlib.sha256(f"{PROBE_VERSION}\0{compiler}\0{path}\0{info.st_size}\0{info.st_mtime_ns}".encode()).hexdigest()
+    if key in _toolchains:
+        return _toolchains[key]
+
+    cached = None if cache_dir is None else os.path.join(cache_dir, f"toolchain-{key[:16]}.json")
+    if cached is not None and os.path.exists(cached):
+        with open(cached, encoding="utf-8") as file:
+            toolchain = Toolchain(**json.load(file))
+        log(f"From probe_toolchain (toolchain.py): Using the probe of {compiler} in {cached}", tags=["tc"])
+    else:
+        toolchain = probe_compiler(compiler)
+        log(f"From probe_toolchain (toolchain.py): Probed {toolchain}", tags=["tc"])
+        if cached is not None:
+            def write_probe(path: str) -> None:
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(asdict(toolchain), file)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                replace_file(cached, write_probe)
+            except OSError as e:
+                log(f"From probe_toolchain (toolchain.py): Could not keep the probe, see error:\n{e}", tags=["tc"])
+    _toolchains[key] = toolchain
+    return toolchain
+
+
+def profile_flags(toolchain: Toolchain, profile: str = DEFAULT_PROFILE, units: bool = False) -> _List[str]:
+    """
+    The flags of one of the PROFILES for the toolchain. Raises KeyError for an unknown profile.
+    units is True when the program is compiled in translation units (compile_units), -flto then lets the linker
+    inline the subprograms into the units that call them. With one .cpp it only makes the link slower.
+    """
+    flags = list(PROFILES[profile])
+    if profile == "release-native":
+        if toolchain.native:
+            flags.append("-march=native")
+        if toolchain.lto and units:
+            flags.append("-flto")
+    if toolchain.pipe:
+        flags.append("-pipe")
+    return flags
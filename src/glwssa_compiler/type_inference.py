@@ -0,0 +1,405 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from .log import log
+from .data import WrongType, WrongArgumentCount
+from .error import ErrorStack, tokens_to_greek
+from .ast_nodes import *
+from .symbol_table import SymbolTable, CONSTANT, BUILTIN, RESULT
+
+from typing import Any as _Any
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+
+
+NUMERIC_TYPES = (IntType, RealType)
+
+ARITHMETIC_OPERATORS = {"PLUS", "MINUS", "MUL", "POW"}
+INTEGER_OPERATORS = {"IDIV", "MOD"}
+COMPARISON_OPERATORS = {"GT", "LT", "GTE", "LTE", "EQ", "NEQ"}
+LOGICAL_OPERATORS = {"AND", "OR"}
+
+TYPE_NAMES = {
+    IntType: "ΑΚΕΡΑΙΑ",
+    RealType: "ΠΡΑΓΜΑΤΙΚΗ",
+    CharType: "ΧΑΡΑΚΤΗΡΑΣ",
+    BoolType: "ΛΟΓΙΚΗ",
+}
+
+# name -> (type of the argument, type of the result). None as the result means "same as the argument".
+BUILTIN_SIGNATURES = {
+    "Α_Μ": (RealType, IntType),
+    "Α_Τ": (RealType, None),
+    "Τ_Ρ": (RealType, RealType),
+    "gr_HM": (RealType, RealType),
+    "gr_SYN": (RealType, RealType),
+    "gr_EF": (RealType, RealType),
+    "gr_E": (RealType, RealType),
+    "gr_LOG": (RealType, RealType),
+}
+
+
+def type_name(var_type) -> str:
+    if isinstance(var_type, str): # for things that are not a type, e.g. "ΣΤΑΘΕΡΑ"
+        return var_type
+    if isinstance(var_type, ArrayType):
+        return f"ΠΙΝΑΚΑΣ {TYPE_NAMES.get(var_type.val_type, '?')}"
+    return TYPE_NAMES.get(var_type, "?")
+
+
+def is_assignable(target, value) -> bool:
+    """
+    An ΑΚΕΡΑΙΑ can be assigned to a ΠΡΑΓΜΑΤΙΚΗ, everything else must be the same type.
+    """
+    if target is None or value is None:
+        return True # the error was already reported
+    if target is RealType and value is IntType:
+        return True
+    if isinstance(target, ArrayType) and isinstance(value, ArrayType):
+        return is_assignable(target.val_type, value.val_type) and len(target.val_dim) == len(value.val_dim)
+    return target is value
+
+
+class TypeTable:
+    """
+    The type of every expression node, computed once and kept in a side table keyed by the node.
+    Shared subtrees are typed once. Nodes made after the analysis (by a pass) are typed the first time they are asked.
+    """
+    def __init__(self, symbols: SymbolTable, error_stack: ErrorStack) -> None:
+        self.symbols = symbols
+        self.error_stack = error_stack
+        self.scope_name = ""
+
+        self._types: _Dict[int, _Any] = {}
+        self._nodes: _List[Node] = [] # keeps the typed nodes alive, so their id() stays theirs
+        self._constant_types: _Dict[int, _Any] = {}
+
+        self._dispatch = {
+            Number: self._literal_type,
+            Float: self._literal_type,
+            Boolean: self._literal_type,
+            String: self._literal_type,
+            Variable: self._variable_type,
+            ArrayIndex: self._array_index_type,
+            BinaryOperation: self._binary_type,
+            UnaryOperator: self._unary_type,
+            Parentheses: lambda node: self.type_of(node.exrpession),
+            CallFunction: self._call_type,
+        }
+
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+
+    def type_of(self, node: Expression):
+        """
+        Returns IntType/RealType/CharType/BoolType, an ArrayType for a whole array, or None if the type
+        could not be found (there is an error for it already).
+        """
+        key = id(node)
+        if key in self._types:
+            return self._types[key]
+
+        method = self._dispatch.get(type(node))
+        result = method(node) if method is not None else None
+
+        self._types[key] = result
+        self._nodes.append(node)
+        return result
+
+
+    def symbol_type(self, symbol_id: _Optional[int]):
+        if symbol_id is None:
+            return None
+        symbol = self.symbols[symbol_id]
+        if symbol.kind == CONSTANT:
+            if symbol_id not in self._constant_types:
+                self._constant_types[symbol_id] = None # in case the constant uses itself
+                self._constant_types[symbol_id] = self.type_of(symbol.node.expr)
+            return self._constant_types[symbol_id]
+        return symbol.var_type
+
+
+    def wrong_type(self, expected: str, got, context: str) -> None:
+        self.error_stack.push(WrongType(expected, type_name(got), context, self.scope_name))
+
+    # __________________________________________________________________________________________________
+
+    def _literal_type(self, node: Literal):
+        return {Number: IntType, Float: RealType, Boolean: BoolType, String: CharType}[type(node)]
+
+
+    def _variable_type(self, node: Variable):
+        var_type = self.symbol_type(node.symbol_id)
+        if isinstance(node.var_type, ArrayType) and isinstance(var_type, ArrayType):
+            # ΔΙΑΒΑΣΕ Π[i] keeps the index in the var_type of the Variable
+            self.check_indexes(node.name, node.var_type.val_dim)
+            return var_type.val_type
+        return var_type
+
+
+    def _array_index_type(self, node: ArrayIndex):
+        var_type = self.symbol_type(node.symbol_id)
+        self.check_indexes(node.name, node.index_dim)
+        if var_type is None:
+            return None
+        if not isinstance(var_type, ArrayType):
+            self.wrong_type("ΠΙΝΑΚΑΣ", var_type, f"'{node.name}'")
+            return None
+        return var_type.val_type
+
+
+    def check_indexes(self, name: str, indexes: _List[Expression]) -> None:
+        for index in indexes:
+            index_type = self.type_of(index)
+            if index_type is not None and index_type is not IntType:
+                self.wrong_type(TYPE_NAMES[IntType], index_type, f"δείκτης του πίνακα '{name}'")
+
+
+    def _binary_type(self, node: BinaryOperation):
+        left = self.type_of(node.left)
+        right = self.type_of(node.right)
+        op = node.operator
+
+        if left is None or right is None:
+            return None
+
+        if op in ARITHMETIC_OPERATORS or op == "FDIV" or op == "PERIOD":
+            for side in (left, right):
+                if side not in NUMERIC_TYPES:
+                    self.wrong_type("ΑΚΕΡΑΙΑ/ΠΡΑΓΜΑΤΙΚΗ", side, f"τελεστής '{tokens_to_greek.get(op, op)}'")
+                    return None
+            if op == "FDIV":
+                return RealType
+            return IntType if left is IntType and right is IntType else RealType
+
+        if op in INTEGER_OPERATORS:
+            for side in (left, right):
+                if side is not IntType:
+                    self.wrong_type(TYPE_NAMES[IntType], side, f"τελεστής '{tokens_to_greek.get(op, op)}'")
+                    return None
+            return IntType
+
+        if op in COMPARISON_OPERATORS:
+            if not (left in NUMERIC_TYPES and right in NUMERIC_TYPES) and left is not right:
+                self.wrong_type(type_name(left), right, f"σύγκριση '{tokens_to_greek.get(op, op)}'")
+                return None
+            if left is BoolType and op not in {"EQ", "NEQ"}:
+                self.wrong_type("ΑΚΕΡΑΙΑ/ΠΡΑΓΜΑΤΙΚΗ/ΧΑΡΑΚΤΗΡΑΣ", left, f"σύγκριση '{tokens_to_greek.get(op, op)}'")
+                return None
+            return BoolType
+
+        if op in LOGICAL_OPERATORS:
+            for side in (left, right):
+                if side is not BoolType:
+                    self.wrong_type(TYPE_NAMES[BoolType], side, f"τελεστής '{tokens_to_greek.get(op, op)}'")
+                    return None
+            return BoolType
+
+        log(f"From _binary_type (type_inference.py): Unknown operator {op}", tags=["ti"])
+        return None
+
+
+    def _unary_type(self, node: UnaryOperator):
+        operand = self.type_of(node.operand)
+        if operand is None:
+            return None
+
+        if node.operator == "NOT":
+            if operand is not BoolType:
+                self.wrong_type(TYPE_NAMES[BoolType], operand, "τελεστής 'ΟΧΙ'")
+                return None
+            return BoolType
+
+        if node.operator == "MINUS":
+            if operand not in NUMERIC_TYPES:
+                self.wrong_type("ΑΚΕΡΑΙΑ/ΠΡΑΓΜΑΤΙΚΗ", operand, "τελεστής '-'")
+                return None
+            return operand
+
+        # ΠΕΡΙΠΤΩΣΗ >10, the operand is compared with the expression of ΕΠΙΛΕΞΕ
+        return BoolType
+
+
+    def _call_type(self, node: CallFunction):
+        arg_types = [self.type_of(arg) for arg in node.params]
+        if node.symbol_id is None:
+            return None
+
+        symbol = self.symbols[node.symbol_id]
+        if symbol.kind == BUILTIN:
+            param_type, result = BUILTIN_SIGNATURES[symbol.name]
+            self.check_arguments(node.name, [param_type], arg_types)
+            if result is None:
+                return arg_types[0] if arg_types and arg_types[0] in NUMERIC_TYPES else param_type
+            return result
+
+        if symbol.kind == RESULT: # recursive call, the name inside the function is the result
+            symbol = self.symbols[self.symbols.global_scope.names[symbol.name]]
+
+        if not isinstance(symbol.node, Function):
+            self.wrong_type("ΣΥΝΑΡΤΗΣΗ", symbol.kind, f"'{node.name}'")
+            return None
+
+        self.check_call(symbol.node, arg_types)
+        return symbol.var_type
+
+
+    def check_call(self, subprogram: Callable, arg_types: list) -> None:
+        scope = self.symbols.scope_of(subprogram)
+        self.check_arguments(subprogram.name.value, [self.symbols[i].var_type for i in scope.params], arg_types)
+
+
+    def check_arguments(self, name: str, param_types: list, arg_types: list) -> None:
+        if len(param_types) != len(arg_types):
+            self.error_stack.push(WrongArgumentCount(name, len(param_types), len(arg_types), self.scope_name))
+            return
+
+        for index, (param, arg) in enumerate(zip(param_types, arg_types)):
+            if param is RealType and arg in NUMERIC_TYPES:
+                continue
+            if not is_assignable(param, arg):
+                self.wrong_type(type_name(param), arg, f"όρισμα {index + 1} της '{name}'")
+
+
+class TypeChecker(NodeVisitor):
+    """
+    Types every expression of the program and checks that the statements get the types they need.
+    """
+    def __init__(self, table: TypeTable) -> None:
+        super().__init__()
+        self.table = table
+
+
+    def check(self, program: Program) -> TypeTable:
+        symbols = self.table.symbols
+        for owner in [program] + program.procedures + program.functions:
+            self.table.scope_name = symbols.scope_of(owner).name
+            for node in owner.body:
+                self.visit(node)
+        return self.table
+
+
+    def expect_bool(self, condition: Expression, context: str) -> None:
+        condition_type = self.table.type_of(condition)
+        if condition_type is not None and condition_type is not BoolType:
+            self.table.wrong_type(TYPE_NAMES[BoolType], condition_type, context)
+
+
+    def visit_VariableDeclaration(self, node: VariableDeclaration) -> None:
+        if isinstance(node.variable.var_type, ArrayType):
+            self.table.check_indexes(node.variable.name, node.variable.var_type.val_dim)
+
+
+    def visit_ConstantDeclaration(self, node: ConstantDeclaration) -> None:
+        self.table.type_of(node.expr)
+
+
+    def visit_VariableAssignement(self, node: VariableAssignement) -> None:
+        value = self.table.type_of(node.expr)
+        target = self.table.symbol_type(node.target_id)
+
+        if node.target_index:
+            self.table.check_indexes(node.target, node.target_index)
+            if not isinstance(target, ArrayType):
+                if target is not None:
+                    self.table.wrong_type("ΠΙΝΑΚΑΣ", target, f"'{node.target}'")
+                return
+            target = target.val_type
+
+        if node.target_id is not None and self.table.symbols[node.target_id].kind == CONSTANT:
+            self.table.wrong_type("ΜΕΤΑΒΛΗΤΗ", "ΣΤΑΘΕΡΑ", f"εκχώρηση στην '{node.target}'")
+            return
+
+        if not is_assignable(target, value):
+            self.table.wrong_type(type_name(target), value, f"εκχώρηση στην '{node.target}'")
+
+
+    def visit_If(self, node: If) -> None:
+        for branch in node.branches:
+            self.expect_bool(branch.condition, "συνθήκη της ΑΝ")
+            self.visit(branch.body)
+        if node.else_branch is not None:
+            self.visit(node.else_branch)
+
+
+    def visit_While(self, node: While) -> None:
+        self.expect_bool(node.condition, "συνθήκη της ΟΣΟ")
+        self.visit(node.body)
+
+
+    def visit_Do(self, node: Do) -> None:
+        self.visit(node.body)
+        self.expect_bool(node.condition, "συνθήκη της ΜΕΧΡΙΣ_ΟΤΟΥ")
+
+
+    def visit_For(self, node: For) -> None:
+        for expr, context in (
+            (node.counter, "μετρητής της ΓΙΑ"),
+            (node.from_expr, "ΑΠΟ της ΓΙΑ"),
+            (node.to_expr, "ΜΕΧΡΙ της ΓΙΑ"),
+            (node.step, "ΜΕ_ΒΗΜΑ της ΓΙΑ"),
+        ):
+            expr_type = self.table.type_of(expr)
+            if expr_type is not None and expr_type not in NUMERIC_TYPES:
+                self.table.wrong_type("ΑΚΕΡΑΙΑ/ΠΡΑΓΜΑΤΙΚΗ", expr_type, context)
+        self.visit(node.body)
+
+
+    def visit_Switch(self, node: Switch) -> None:
+        switch_type = self.table.type_of(node.expr)
+        for branch in node.branches:
+            for case in branch.condition:
+                operand = case.operand if isinstance(case, UnaryOperator) and case.operator != "MINUS" else case
+                case_type = self.table.type_of(operand)
+                if switch_type is None or case_type is None:
+                    continue
+                if not (switch_type in NUMERIC_TYPES and case_type in NUMERIC_TYPES) and switch_type is not case_type:
+                    self.table.wrong_type(type_name(switch_type), case_type, "ΠΕΡΙΠΤΩΣΗ της ΕΠΙΛΕΞΕ")
+            self.visit(branch.body)
+        if node.else_branch is not None:
+            self.visit(node.else_branch)
+
+
+    def visit_CallProcedure(self, node: CallProcedure) -> None:
+        arg_types = [self.table.type_of(arg) for arg in node.params]
+        if node.symbol_id is None:
+            return
+        symbol = self.table.symbols[node.symbol_id]
+        if not isinstance(symbol.node, Procedure):
+            self.table.wrong_type("ΔΙΑΔΙΚΑΣΙΑ", symbol.kind, f"ΚΑΛΕΣΕ '{node.name}'")
+            return
+        self.table.check_call(symbol.node, arg_types)
+
+
+    def visit_Write(self, node: Write) -> None:
+        for expr in node.expression:
+            self.table.type_of(expr)
+
+
+    def visit_Read(self, node: Read) -> None:
+        for variable in node.variable_list:
+            self.table.type_of(variable)
+
+
+    def generic_visit(self, node) -> None:
+        if isinstance(node, Expression):
+            self.table.type_of(node)
+            return
+        super().generic_visit(node)
+
+
+def infer_types(program: Program, symbols: SymbolTable, error_stack: ErrorStack) -> TypeTable:
+    return TypeChecker(TypeTable(symbols, error_stack)).check(program)
@@ -0,0 +1,98 @@
+# This file is part of: glwssa-compiler 
+# Copyright (C) 2025  @theolaos
+# glwssa-compiler is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .log import log
+from .build_cache import BuildCache, build_key
+from .runtime import RUNTIME_HEADER
+
+from typing import Dict as _Dict
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Sequence as _Sequence
+
+
+OBJECT_SUFFIX = ".o"
+
+
+def write_units(units: _Dict[str, str], directory: str) -> int:
+    """
+    Writes the files of TranspilerBackend_cpp.translate_units() to the directory, only the ones whose code changed.
+    Returns how many were written.
+    A runtime header of an earlier build that pasted the runtime is removed, the units look for their includes in
+    the directory first and the precompiled one would not be used.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if RUNTIME_HEADER not in units and os.path.exists(os.path.join(directory, RUNTIME_HEADER)):
+        os.remove(os.path.join(directory, RUNTIME_HEADER))
+    written = 0
+    for name, code in units.items():
+        path = os.path.join(directory, name)
+        try:
+            with open(path, encoding="utf-8") as file:
+                if file.read() == code:
+                    continue
+        except FileNotFoundError:
+            pass
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(code)
+        written += 1
+    log(f"From write_units (units.py): Wrote {written} of {len(units)} files to {directory}", tags=["tu"])
+    return written
+
+
+def compile_units(units: _Dict[str, str], directory: str, executable: str, cache: _Optional[BuildCache],
+                  compiler: str = "g++", flags: _Sequence[str] = (), jobs: _Optional[int] = None) -> _List[str]:
+    """
+    Compiles every .cpp of the units (written by write_units) to an object file and links them into the executable.
+    Returns the names of the units that were compiled.
+
+    The object of a unit is found in the cache by the hash of its code, the headers, the compiler and the flags, so
+    after an edit only the units whose code changed are compiled (all of them if a signature changed, it is in the
+    header). They are compiled at the same time, at most jobs (by default os.cpu_count()) of them.
+    Raises subprocess.CalledProcessError if g++ fails, after the other units finished.
+    """
+    headers = "\0".join(f"{name}\0{code}" for name, code in sorted(units.items()) if not name.endswith(".cpp"))
+    compile_flags = [*flags, "-c"]
+    objects = []
+    missing = []
+    for name, code in units.items():
+        if not name.endswith(".cpp"):
+            continue
+        obj = os.path.join(directory, name[:-len(".cpp")] + OBJECT_SUFFIX)
+        objects.append(obj)
+        key = build_key(f"{headers}\0{code}", compiler, compile_flags)
+        if cache is None or not cache.fetch(key, obj):
+            missing.append((name, obj, key))
+
+    def compile_unit(name: str, obj: str, key: str) -> None:
+        subprocess.run([compiler, *compile_flags, os.path.join(directory, name), "-o", obj], check=True)
+        if cache is not None:
+            cache.store(key, obj)
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        for future in [pool.submit(compile_unit, *unit) for unit in missing]:
+            try:
+                future.result()
+            except subprocess.CalledProcessError as e:
+                errors.append(e)
+    if errors:
+        raise errors[0]
+    log(f"From compile_units (units.py): Compiled {len(missing)} of {len(objects)} units", tags=["tu"])
+
+    subprocess.run([compiler, *flags, *objects, "-o", executable], check=True)
+    return [name for name, _, _ in missing]
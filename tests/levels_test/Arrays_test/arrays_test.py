@@ -0,0 +1,94 @@
+from glwssa_compiler import *
+
+from conftest import requires_gxx, transpile_source
+
+logs_dir = "tests/levels_test/Arrays_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΠΙΝΑΚΕΣ
+ΣΤΑΘΕΡΕΣ
+    Ν = 4
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Λ, Α[Ν, 3], Β[4, 3], Τ[2, 3, 4], ΟΝ[1, 2, 3, 4, 5, 6]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            Α[Ι, Κ] <- 10 * Ι + Κ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Β <- Α
+    ΚΑΛΕΣΕ ΔΙΠΛΑΣΙΑΣΕ(Β)
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 2
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            ΓΙΑ Λ ΑΠΟ 1 ΜΕΧΡΙ 4
+                Τ[Ι, Κ, Λ] <- 100 * Ι + 10 * Κ + Λ
+            ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΟΝ[1, 2, 3, 4, 5, 6] <- 7
+    ΟΝ[1, 1, 1, 1, 1, 1] <- ΟΝ[1, 2, 3, 4, 5, 6] + 1
+    ΓΡΑΨΕ Α[4, 3], Β[4, 3], Α[2, 1], Β[2, 1], ΑΘΡΟΙΣΜΑ(Α), ΑΛΛΑΓΗ(Α), Α[1, 1]
+    ΓΡΑΨΕ Τ[2, 3, 4], Τ[1, 2, 3], ΟΝ[1, 1, 1, 1, 1, 1], ΟΝ[1, 2, 1, 4, 5, 6]
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΔΙΠΛΑΣΙΑΣΕ(Π)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Π[4, 3]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 4
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            Π[Ι, Κ] <- 2 * Π[Ι, Κ]
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΑΘΡΟΙΣΜΑ(Π): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Π[4, 3]
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 4
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            Σ <- Σ + Π[Ι, Κ]
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΘΡΟΙΣΜΑ <- Σ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΣΥΝΑΡΤΗΣΗ ΑΛΛΑΓΗ(Π): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Π[4, 3]
+ΑΡΧΗ
+    Π[1, 1] <- 1000
+    ΑΛΛΑΓΗ <- Π[1, 1]
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_flat_arrays():
+    func_name = "test_flat_arrays"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        code = transpile_source(CODE, ir=ir, bounds_checks="off")
+        log(code, tags=["pytest"])
+        # one block of elements for every array, the static storage of the main program has no - 1 per dimension
+        assert "static int64_t gr_A_elements_[12];" in code and "glwssa_array<int64_t, 2> gr_A(gr_A_elements_, {gr_N, 3});" in code
+        assert "static int64_t gr_ON_elements_[720];" in code and "glwssa_array<int64_t, 6> gr_ON(" in code
+        assert "gr_ON(1, 2, 3, 4, 5, 6)" in code
+        # a function that does not change its array gets it by reference, one that does gets a copy
+        assert "int64_t gr_ATHROISMA(const glwssa_array<int64_t, 2>& gr_P)" in code
+        assert "int64_t gr_ALLAGH(glwssa_array<int64_t, 2> gr_P)" in code
+        assert "std::vector" not in code
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    expected = "43 86 21 42 324 1000 11\n234 123 8 0\n"
+    for opt_level in (0, 2):
+        for ir in ("ast", "cfg"):
+            for bounds_checks in ("on", "all"):
+                assert run(CODE, opt_level, ir=ir, bounds_checks=bounds_checks) == expected
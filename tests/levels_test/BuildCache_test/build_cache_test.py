@@ -0,0 +1,91 @@
+import os
+import threading
+
+from glwssa_compiler import *
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/BuildCache_test/logs/"
+
+
+def make_executable(path, size: int, fill: bytes = b"x"):
+    path.write_bytes(fill * size)
+    os.chmod(path, 0o755)
+    return str(path)
+
+# ________________________________________________ TESTS ________________________________________________
+
+@requires_gxx
+def test_build_key():
+    func_name = "test_build_key"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    key = build_key("int main() {}\n", "g++")
+    assert key == build_key("int main() {}\n", "g++")
+    assert key != build_key("int main() { return 1; }\n", "g++")
+    assert key != build_key("int main() {}\n", "g++", ["-O2"])
+
+
+@requires_gxx
+def test_fetch_and_store(tmp_path):
+    func_name = "test_fetch_and_store"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    cache = BuildCache(str(tmp_path / "cache"))
+    key = build_key("int main() {}\n", "g++")
+    executable = str(tmp_path / "program.out")
+    assert not cache.fetch(key, executable)
+
+    make_executable(tmp_path / "program.out", 1000)
+    cache.store(key, executable)
+    os.remove(executable)
+    assert cache.fetch(key, executable)
+    assert open(executable, "rb").read() == b"x" * 1000 and os.access(executable, os.X_OK)
+    # a fetch over an executable that is there replaces it
+    assert cache.fetch(key, executable)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["entries"], stats["bytes"]) == (2, 1, 1, 1, 1000)
+    assert "2 hits, 1 misses" in cache.report()
+    assert not [name for name in os.listdir(cache.directory) if name.startswith(".tmp-")]
+
+
+def test_eviction(tmp_path):
+    func_name = "test_eviction"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    cache = BuildCache(str(tmp_path / "cache"), max_bytes=3000)
+    executable = make_executable(tmp_path / "program.out", 1000)
+    for number, key in enumerate("abc"):
+        cache.store(key, executable)
+        os.utime(cache.entry(key), (number, number)) # a, b, c from the least recently used
+    assert cache.stats()["entries"] == 3
+
+    os.utime(cache.entry("a"), (10, 10)) # used again
+    cache.max_bytes = 2000
+    assert cache.evict() == 1
+    assert sorted(os.listdir(cache.directory)) == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_concurrent_stores(tmp_path):
+    func_name = "test_concurrent_stores"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    directory = str(tmp_path / "cache")
+    sources = [make_executable(tmp_path / f"program{number}.out", 100000, bytes([65 + number])) for number in range(4)]
+
+    def store(source: str) -> None:
+        cache = BuildCache(directory)
+        for _ in range(5):
+            cache.store("same", source)
+
+    threads = [threading.Thread(target=store, args=(source,)) for source in sources]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # one whole executable of one of the runs, never parts of two
+    content = open(BuildCache(directory).entry("same"), "rb").read()
+    assert len(content) == 100000 and len(set(content)) == 1
+    assert BuildCache(directory).stats()["stores"] == 20 # no count is lost
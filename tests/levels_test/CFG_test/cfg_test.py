@@ -0,0 +1,201 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+from glwssa_compiler.cfg import CondJump, Jump, Return
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/CFG_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 5
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Π[Ν]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ
+    ΛΟΓΙΚΕΣ: Λ
+    ΧΑΡΑΚΤΗΡΕΣ: Ο
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ Ν ΜΕΧΡΙ 1 ΜΕ_ΒΗΜΑ -1
+        Π[Ι] <- Ι * Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Κ <- 2
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν ΜΕ_ΒΗΜΑ Κ
+        Σ <- Σ + Π[Ι]
+        Κ <- 1
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Ι <- 0
+    ΟΣΟ Ι < Ν ΚΑΙ Π[Ι + 1] < 20 ΕΠΑΝΑΛΑΒΕ
+        Ι <- Ι + 1
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΡΧΗ_ΕΠΑΝΑΛΗΨΗΣ
+        Ι <- Ι - 1
+    ΜΕΧΡΙΣ_ΟΤΟΥ Ι < 2 Ή Π[Ι] MOD 2 = 0
+    ΓΡΑΨΕ Σ, Ι
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 7
+        ΕΠΙΛΕΞΕ Ι
+            ΠΕΡΙΠΤΩΣΗ 1, 3
+                Ο <- "ΠΕΡΙΤΤΟΣ"
+            ΠΕΡΙΠΤΩΣΗ 4..5
+                Ο <- "ΜΕΣΑΙΟΣ"
+            ΠΕΡΙΠΤΩΣΗ > 5
+                Ο <- "ΜΕΓΑΛΟΣ"
+            ΠΕΡΙΠΤΩΣΗ ΑΛΛΙΩΣ
+                Ο <- "ΑΛΛΟΣ"
+        ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ
+        ΓΡΑΨΕ Ι, Ο
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Χ <- Σ / 4
+    Λ <- Σ > 0
+    Λ <- Χ > 10 Ή ΟΧΙ Λ
+    ΑΝ Λ ΤΟΤΕ
+        ΓΡΑΨΕ "ΝΑΙ", Χ, Λ
+    ΑΛΛΙΩΣ_ΑΝ Σ > 0 ΤΟΤΕ
+        ΓΡΑΨΕ "ΟΧΙ", Σ ^ 2
+    ΑΛΛΙΩΣ
+        ΓΡΑΨΕ "ΤΙΠΟΤΑ"
+    ΤΕΛΟΣ_ΑΝ
+    ΚΑΛΕΣΕ ΑΛΛΑΞΕ(Σ, Π[2])
+    ΚΑΛΕΣΕ ΑΛΛΑΞΕ(Ι + 1, Π[3])
+    ΓΡΑΨΕ Σ, Π[2], Π[3], ΠΑΡ(6), Α_Τ(-Χ)
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΛΛΑΞΕ(Α, Β)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Τ
+ΑΡΧΗ
+    Τ <- Α
+    Α <- Β
+    Β <- Τ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΠΑΡ(Μ): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Μ
+ΑΡΧΗ
+    ΑΝ Μ <= 1 ΤΟΤΕ
+        ΠΑΡ <- 1
+    ΑΛΛΙΩΣ
+        ΠΑΡ <- Μ * ΠΑΡ(Μ - 1)
+    ΤΕΛΟΣ_ΑΝ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+LOOP = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Α, Β
+ΑΡΧΗ
+    Α <- 1
+    ΔΙΑΒΑΣΕ Β
+    ΟΣΟ Α < Β ΕΠΑΝΑΛΑΒΕ
+        ΑΝ Α MOD 2 = 0 ΤΟΤΕ
+            Α <- Α * 3
+        ΑΛΛΙΩΣ
+            Α <- Α + 1
+        ΤΕΛΟΣ_ΑΝ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Α
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def build(parse, code: str):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    types = infer_types(program, symbols, error_stack)
+    assert error_stack.errors_stack == []
+    return build_cfgs(program, symbols, types)
+
+
+def block_of(cfg, text: str) -> int:
+    """
+    The label of the block with an instruction that is printed as `text`.
+    """
+    for block in cfg.blocks:
+        if any(str(instruction) == text for instruction in block.instructions):
+            return block.label
+    raise AssertionError(f"No instruction '{text}' in\n{format_cfg(cfg)}")
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_dominators(parse):
+    func_name = "test_dominators"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    cfg = build(parse, LOOP)[0]
+    log(format_cfg(cfg), tags=["pytest"])
+    idom = immediate_dominators(cfg)
+
+    condition = block_of(cfg, "t1 = gr_A < gr_B")
+    then_block = block_of(cfg, "gr_A = t4")
+    else_block = block_of(cfg, "gr_A = t5")
+    write = block_of(cfg, "ΓΡΑΨΕ gr_A")
+
+    # the header of ΟΣΟ runs before the body and before the statements after the loop
+    assert dominates(idom, condition, then_block)
+    assert dominates(idom, condition, else_block)
+    assert dominates(idom, condition, write)
+    # only one of the branches runs, the block after ΑΝ has the ΑΝ test as idom
+    assert not dominates(idom, then_block, else_block)
+    join = cfg.blocks[then_block].terminator.target
+    assert join == cfg.blocks[else_block].terminator.target
+    assert idom[join] == idom[then_block] == idom[else_block]
+    assert idom[0] == 0
+
+
+def test_liveness(parse):
+    func_name = "test_liveness"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    graphs = build(parse, LOOP + CODE.split("ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ\n", 1)[1])
+    cfg = graphs[0]
+    live_in, live_out = liveness(cfg)
+    log(format_cfg(cfg, live=True), tags=["pytest"])
+
+    header = block_of(cfg, "t1 = gr_A < gr_B")
+    # Α and Β are read again in every repetition, Ι is never read
+    assert live_in[header] == {"gr_A", "gr_B"}
+    assert live_in[0] == frozenset()
+    assert "gr_B" not in live_in[block_of(cfg, "ΓΡΑΨΕ gr_A")]
+
+    # the parameters of a procedure are copied back to the caller, a function returns its result
+    procedure, function = graphs[1], graphs[2]
+    exit_block = next(b for b in procedure.blocks if isinstance(b.terminator, Return))
+    assert liveness(procedure)[1][exit_block.label] == {"gr_A", "gr_B"}
+    assert "gr_T" not in liveness(procedure)[0][0]
+    assert all("gr_PAR" in out for label, out in liveness(function)[1].items()
+               if isinstance(function.blocks[label].terminator, Return))
+
+
+def test_pretty_printer(parse):
+    func_name = "test_pretty_printer"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    cfg = build(parse, LOOP)[0]
+    text = format_cfg(cfg)
+    log(text, tags=["pytest"])
+    lines = text.splitlines()
+    assert lines[:5] == [
+        "main()",
+        "L0:",
+        "    gr_A = 1",
+        "    ΔΙΑΒΑΣΕ gr_B",
+        "    goto L1",
+    ]
+    assert "    if t1 goto L2 else L3" in lines
+    # ΚΑΙ/Ή never become an instruction, they jump over their right side
+    graphs = build(parse, CODE)
+    assert all(getattr(i, "op", None) not in {"AND", "OR"} for g in graphs for b in g.blocks for i in b.instructions)
+    assert all(isinstance(b.terminator, (Jump, CondJump, Return)) for g in graphs for b in g.blocks)
+    assert [g.name for g in graphs] == ["main", "gr_ALLAXE", "gr_PAR"]
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for opt_level in (0, 2):
+        expected = run(CODE, opt_level)
+        assert run(CODE, opt_level, ir="cfg") == expected
+    assert run(LOOP, 0, "40", ir="cfg") == run(LOOP, 0, "40") == "54\n"
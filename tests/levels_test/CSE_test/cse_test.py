@@ -0,0 +1,120 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/CSE_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, ΠΙΝ[3, 3], Σ
+    ΠΡΑΓΜΑΤΙΚΕΣ: ΑΓ, Φ, Υ
+ΑΡΧΗ
+    ΑΓ <- 1500
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 3
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            ΠΙΝ[Ι, Κ] <- Ι * Κ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 3
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            Σ <- Σ + ΠΙΝ[Ι, Κ] * ΠΙΝ[Ι, Κ] + ΠΙΝ[Ι, Κ]
+            ΑΝ Σ > 2 ΚΑΙ (Ι + Κ) * 2 > 7 ΤΟΤΕ
+                Σ <- Σ + (Κ + Ι) * 2
+            ΤΕΛΟΣ_ΑΝ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Φ <- (ΑΓ - 900) * (0.6 / 100)
+    Υ <- ΑΓ + (ΑΓ - 900) * (0.6 / 100)
+    ΑΓ <- ΑΓ + 1
+    Υ <- Υ + (ΑΓ - 900) * (0.6 / 100)
+    ΓΡΑΨΕ Σ, Φ, Υ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def eliminate(parse, code: str):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    fold_constants(program, symbols) # as in the -O2 pipeline, 0.6 / 100 is one literal
+    changed = eliminate_common_subexpressions(program, symbols, infer_types(program, symbols, error_stack))
+    # the temporaries must resolve when the table is built again
+    build_symbol_table(program, error_stack)
+    assert error_stack.errors_stack == []
+    return program, changed
+
+
+def uses(node, name):
+    return sum(1 for n in walk(node) if isinstance(n, Variable) and n.name == name)
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_repeated_expression_until_write(parse):
+    func_name = "test_repeated_expression_until_write"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = eliminate(parse, CODE)
+    assert changed
+    statements = [n for n in program.body if isinstance(n, (VariableAssignement, Write))]
+    definition = next(n for n in statements if n.target.startswith("cse"))
+    assert [n.operator for n in walk(definition.expr) if isinstance(n, BinaryOperation)] == ["MUL", "MINUS"]
+    # ΑΓ is written before the third (ΑΓ - 900) * (0.6 / 100), that one is another value
+    assert sum(uses(n, definition.target) for n in statements) == 2
+    assert uses(statements[-2], definition.target) == 0
+    log(f"End", tags=["pytest"])
+
+
+def test_elements_and_conditions(parse):
+    func_name = "test_elements_and_conditions"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = eliminate(parse, CODE)
+    loops = [n for n in program.body if isinstance(n, For)]
+    inner = loops[1].body.body[0].body.body
+    # ΠΙΝ[Ι, Κ] three times becomes one temporary, (Ι + Κ) * 2 is only evaluated on the right of ΚΑΙ
+    assert isinstance(inner[0], VariableAssignement) and isinstance(inner[0].expr, ArrayIndex)
+    assert uses(inner[1], inner[0].target) == 3
+    assert len(inner) == 3
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    assert run(CODE, 2) == run(CODE, 0) == "288 3.6 1507.21\n"
+    log(f"End", tags=["pytest"])
+
+
+def test_impure_calls_are_not_merged(parse):
+    func_name = "test_impure_calls_are_not_merged"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = eliminate(parse, """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    Α <- ΦΩΝΑΞΕ(1) + ΦΩΝΑΞΕ(1)
+    ΓΡΑΨΕ Α
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΣΥΝΑΡΤΗΣΗ ΦΩΝΑΞΕ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν
+ΑΡΧΗ
+    ΚΑΛΕΣΕ ΤΥΠΩΣΕ(Ν)
+    ΦΩΝΑΞΕ <- Ν
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΤΥΠΩΣΕ(Χ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Χ
+ΑΡΧΗ
+    ΓΡΑΨΕ Χ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+""")
+    # ΦΩΝΑΞΕ writes through ΤΥΠΩΣΕ, both calls must run
+    assert not changed
+    log(f"End", tags=["pytest"])
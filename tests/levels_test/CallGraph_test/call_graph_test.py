@@ -0,0 +1,92 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+logs_dir = "tests/levels_test/CallGraph_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    Α <- ΠΑΡ(5)
+    ΑΝ ΨΕΥΔΗΣ ΤΟΤΕ
+        ΚΑΛΕΣΕ ΝΕΚΡΗ(Α)
+    ΤΕΛΟΣ_ΑΝ
+    ΓΡΑΨΕ Α
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΣΥΝΑΡΤΗΣΗ ΠΑΡ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν
+ΑΡΧΗ
+    ΑΝ Ν <= 1 ΤΟΤΕ
+        ΠΑΡ <- 1
+    ΑΛΛΙΩΣ
+        ΠΑΡ <- Ν * ΠΑΡ(Ν - 1)
+    ΤΕΛΟΣ_ΑΝ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΝΕΚΡΗ(Χ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Χ
+ΑΡΧΗ
+    Χ <- ΕΠΟΜΕΝΟ(Χ)
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΕΠΟΜΕΝΟ(Χ): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Χ
+ΑΡΧΗ
+    ΕΠΟΜΕΝΟ <- Χ + 1
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+
+def names(program):
+    return [s.name.value for s in program.procedures + program.functions]
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_graph(parse):
+    func_name = "test_graph"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE)
+    symbols = build_symbol_table(program, error_stack)
+    graph = build_call_graph(program, symbols)
+    ids = {name: symbols.global_scope.names[name] for name in names(program)}
+
+    assert graph.callees[graph.program_id] == {ids["gr_PAR"], ids["gr_NEKRH"]}
+    assert graph.callees[ids["gr_NEKRH"]] == {ids["gr_EPOMENO"]}
+    assert graph.is_recursive(ids["gr_PAR"]) and not graph.is_recursive(ids["gr_NEKRH"])
+    # bottom-up: a subprogram comes after the ones it calls
+    order = [member for component in graph.components() for member in component]
+    assert order.index(ids["gr_EPOMENO"]) < order.index(ids["gr_NEKRH"]) < order.index(graph.program_id)
+    log(f"End", tags=["pytest"])
+
+
+def test_backend_writes_reachable_only(parse):
+    func_name = "test_backend_writes_reachable_only"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE.replace("ΑΝ ΨΕΥΔΗΣ ΤΟΤΕ\n        ΚΑΛΕΣΕ ΝΕΚΡΗ(Α)\n    ΤΕΛΟΣ_ΑΝ\n", ""))
+    analyzer = TreeAnalyzer(0)
+    analyzer.analyze_types_tree(program, error_stack)
+    assert error_stack.errors_stack == []
+
+    cpp = TranspilerBackend_cpp().translate_tree(program, analyzer.manager)
+    assert "gr_PAR(" in cpp
+    assert "gr_NEKRH" not in cpp and "gr_EPOMENO" not in cpp
+    assert len(names(program)) == 3 # -O0 does not change the tree
+    log(f"End", tags=["pytest"])
+
+
+def test_unused_after_dead_code(parse):
+    func_name = "test_unused_after_dead_code"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE)
+    TreeAnalyzer(1).analyze_types_tree(program, error_stack)
+    assert error_stack.errors_stack == []
+    # the only call to ΝΕΚΡΗ was in a branch that can not run
+    assert names(program) == ["gr_PAR"]
+    log(f"End", tags=["pytest"])
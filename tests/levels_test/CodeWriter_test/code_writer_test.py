@@ -0,0 +1,70 @@
+import io
+
+from glwssa_compiler import *
+
+from conftest import parse_source, transpile_source
+
+logs_dir = "tests/levels_test/CodeWriter_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 10
+        ΕΠΙΛΕΞΕ Ι MOD 3
+            ΠΕΡΙΠΤΩΣΗ 0
+                Σ <- Σ + Ι
+            ΠΕΡΙΠΤΩΣΗ ΑΛΛΙΩΣ
+                ΚΑΛΕΣΕ ΑΥΞΗΣΕ(Σ)
+        ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΥΞΗΣΕ(Α)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    Α <- Α + 1
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_writer():
+    func_name = "test_writer"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    stream = io.StringIO()
+    out = CodeWriter(stream)
+    out.raw("// start\n")
+    out.line("{")
+    with out.indented():
+        out.line("a;")
+        out.label("L1:")
+        with out.indented():
+            out.line("b;")
+        out.line()
+    out.line("}")
+    assert stream.getvalue() == "" # nothing until the group is full or flush()
+    out.flush()
+    assert stream.getvalue() == "// start\n{\n    a;\nL1:\n        b;\n\n}\n"
+    assert out.line_count == 7 and out.depth == 0
+
+
+def test_write_tree():
+    func_name = "test_write_tree"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        program, error_stack = parse_source(CODE)
+        analyzer = TreeAnalyzer(0)
+        analyzer.analyze_types_tree(program, error_stack)
+        stream = io.StringIO()
+        lines = TranspilerBackend_cpp().write_tree(program, analyzer.manager, stream, ir)
+        code = stream.getvalue()
+        assert code == transpile_source(CODE, ir=ir)
+        assert lines == code.count("\n")
+        # the writer keeps the depth of the nested blocks
+        assert "\n                gr_S = (gr_S + gr_I);\n" in code or ir == "cfg"
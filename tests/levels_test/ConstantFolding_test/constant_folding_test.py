@@ -0,0 +1,96 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+from glwssa_compiler.constant_folding import glwssa_div, glwssa_mod
+
+logs_dir = "tests/levels_test/ConstantFolding_test/logs/"
+
+HEADER = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 5 * 2
+    Μ = Ν + 1
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Π[Ν]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ
+    ΛΟΓΙΚΕΣ: Λ
+ΑΡΧΗ
+"""
+
+
+def fold(parse, body: str):
+    program, error_stack = parse(HEADER + body + "ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ\n")
+    changed = fold_constants(program, build_symbol_table(program, error_stack))
+    assert error_stack.errors_stack == []
+    return program, changed
+
+
+def statements(program):
+    return [n for n in program.body if not isinstance(n, (ProgramName, VariableDeclaration, ConstantDeclaration))]
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_fold_arithmetic(parse):
+    func_name = "test_fold_arithmetic"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = fold(parse,
+        "    Α <- 2 + 3 * 4\n"
+        "    Χ <- 1 + 900 * 0.8 / 100 + (Α - 900) * (0.6 / 100)\n"
+        "    Λ <- 2 ^ 10 > 1000\n"
+        "    Α <- 7 DIV 0\n"
+        "    Α <- 2 ^ -1\n"
+    )
+    assert changed
+    exprs = [s.expr for s in statements(program)]
+    assert exprs[0] == Number("14")
+    assert exprs[1] == BinaryOperation(Float("8.2"), "PLUS",
+        BinaryOperation(BinaryOperation(Variable("gr_A", None), "MINUS", Number("900")), "MUL", Float("0.006")))
+    assert exprs[2] == Boolean("true")
+    assert exprs[3] == BinaryOperation(Number("7"), "IDIV", Number("0")) # left for the run time
+    assert exprs[4] == BinaryOperation(Number("2"), "POW", Number("-1")) # not an ΑΚΕΡΑΙΑ, an error at the run time
+    log(f"End", tags=["pytest"])
+
+
+def test_div_mod_negative():
+    func_name = "test_div_mod_negative"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    assert [glwssa_div(-7, 2), glwssa_mod(-7, 2)] == [-3, -1]
+    assert [glwssa_div(7, -2), glwssa_mod(7, -2)] == [-3, 1]
+    assert [glwssa_div(-7, -2), glwssa_mod(-7, -2)] == [3, -1]
+    log(f"End", tags=["pytest"])
+
+
+def test_propagate_constants(parse):
+    func_name = "test_propagate_constants"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = fold(parse,
+        "    ΓΙΑ Α ΑΠΟ 1 ΜΕΧΡΙ Μ ΜΕ_ΒΗΜΑ 5 + 6\n"
+        "        Π[Α] <- Ν * 2\n"
+        "    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ\n"
+        "    ΔΙΑΒΑΣΕ Π[Ν - 1]\n"
+    )
+    declaration = next(n for n in program.body if isinstance(n, VariableDeclaration) and n.variable.name == "gr_P")
+    assert declaration.variable.var_type.val_dim == [Number("10")]
+
+    loop, read = statements(program)
+    assert (loop.to_expr, loop.step) == (Number("11"), Number("11"))
+    assert loop.body.body[0].expr == Number("20")
+    assert read.variable_list[0].var_type.val_dim == [Number("9")]
+    log(f"End", tags=["pytest"])
+
+
+def test_short_circuit(parse):
+    func_name = "test_short_circuit"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = fold(parse,
+        "    Λ <- ΑΛΗΘΗΣ Ή Α > 1\n"
+        "    Λ <- Α > 1 ΚΑΙ ΑΛΗΘΗΣ\n"
+        "    Λ <- Α > 1 ΚΑΙ ΨΕΥΔΗΣ\n"
+    )
+    exprs = [s.expr for s in statements(program)]
+    assert exprs[0] == Boolean("true")
+    assert exprs[1] == BinaryOperation(Variable("gr_A", None), "GT", Number("1"))
+    assert exprs[2].operator == "AND" # the left side is kept, it is evaluated first
+    log(f"End", tags=["pytest"])
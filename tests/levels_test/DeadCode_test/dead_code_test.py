@@ -0,0 +1,182 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/DeadCode_test/logs/"
+
+HEADER = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    ΜΕΓΕΘΟΣ = 3
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Γ, Π[5]
+ΑΡΧΗ
+"""
+
+
+def eliminate(parse, body: str, tail: str = ""):
+    program, error_stack = parse(HEADER + body + "ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ\n" + tail)
+    symbols = build_symbol_table(program, error_stack)
+    fold_constants(program, symbols)
+    changed = eliminate_dead_code(program, symbols)
+    assert error_stack.errors_stack == []
+    return program, changed
+
+
+def statements(body):
+    return [n for n in body if not isinstance(n, (ProgramName, VariableDeclaration, ConstantDeclaration))]
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_constant_conditions(parse):
+    func_name = "test_constant_conditions"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = eliminate(parse,
+        "    ΔΙΑΒΑΣΕ Α\n"
+        "    ΑΝ ΜΕΓΕΘΟΣ > 5 ΤΟΤΕ\n"
+        "        ΓΡΑΨΕ 1\n"
+        "    ΑΛΛΙΩΣ_ΑΝ Α > 0 ΤΟΤΕ\n"
+        "        ΓΡΑΨΕ 2\n"
+        "    ΑΛΛΙΩΣ_ΑΝ ΜΕΓΕΘΟΣ = 3 ΤΟΤΕ\n"
+        "        ΓΡΑΨΕ 3\n"
+        "    ΑΛΛΙΩΣ\n"
+        "        ΓΡΑΨΕ 4\n"
+        "    ΤΕΛΟΣ_ΑΝ\n"
+        "    ΟΣΟ ΨΕΥΔΗΣ ΕΠΑΝΑΛΑΒΕ\n"
+        "        ΓΡΑΨΕ 5\n"
+        "    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ\n"
+        "    ΑΡΧΗ_ΕΠΑΝΑΛΗΨΗΣ\n"
+        "        ΓΡΑΨΕ 6\n"
+        "    ΜΕΧΡΙΣ_ΟΤΟΥ ΑΛΗΘΗΣ\n"
+    )
+    assert changed
+    read, branch, write = statements(program.body)
+    assert [b.body.body for b in branch.branches] == [[Write([Number("2")])]]
+    assert branch.else_branch.body == [Write([Number("3")])] # the ΑΛΛΙΩΣ can not be reached
+    assert write == Write([Number("6")])
+    log(f"End", tags=["pytest"])
+
+
+def test_switch_cases(parse):
+    func_name = "test_switch_cases"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = eliminate(parse,
+        "    ΔΙΑΒΑΣΕ Α\n"
+        "    ΕΠΙΛΕΞΕ ΜΕΓΕΘΟΣ\n"
+        "        ΠΕΡΙΠΤΩΣΗ 1, 2\n"
+        "            ΓΡΑΨΕ 1\n"
+        "        ΠΕΡΙΠΤΩΣΗ > 2\n"
+        "            ΓΡΑΨΕ 2\n"
+        "        ΠΕΡΙΠΤΩΣΗ 3\n"
+        "            ΓΡΑΨΕ 3\n"
+        "    ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ\n"
+        "    ΕΠΙΛΕΞΕ Α\n"
+        "        ΠΕΡΙΠΤΩΣΗ 5..1\n"
+        "            ΓΡΑΨΕ 4\n"
+        "        ΠΕΡΙΠΤΩΣΗ 1..5, 9..7\n"
+        "            ΓΡΑΨΕ 5\n"
+        "    ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ\n"
+    )
+    read, write, switch = statements(program.body)
+    assert write == Write([Number("2")]) # only the first branch that matches runs
+    assert len(switch.branches) == 1
+    assert switch.branches[0].condition == [BinaryOperation(Number("1"), "PERIOD", Number("5"))]
+    log(f"End", tags=["pytest"])
+
+
+def test_dead_assignments(parse):
+    func_name = "test_dead_assignments"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = eliminate(parse,
+        "    Α <- 1\n"
+        "    Β <- Α * 2\n"
+        "    Γ <- 0\n"
+        "    Π[1] <- Β\n"
+        "    ΓΙΑ Α ΑΠΟ 1 ΜΕΧΡΙ 5\n"
+        "        Γ <- Γ + Α\n"
+        "        Β <- Γ\n"
+        "    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ\n"
+        "    ΓΡΑΨΕ Γ\n",
+        "ΔΙΑΔΙΚΑΣΙΑ ΑΥΞΗΣΕ(Χ)\n"
+        "ΜΕΤΑΒΛΗΤΕΣ\n"
+        "    ΑΚΕΡΑΙΕΣ: Χ, Υ\n"
+        "ΑΡΧΗ\n"
+        "    Υ <- Χ\n"
+        "    Χ <- Χ + 1\n"
+        "ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ\n"
+    )
+    # Α, Β and Π are never read before they are written again or the program ends
+    init, loop, write = statements(program.body)
+    assert init.target == "gr_G"
+    assert [s.target for s in loop.body.body] == ["gr_G"]
+    # the parameter is copied back to the caller
+    assert [s.target for s in program.procedures[0].body if isinstance(s, VariableAssignement)] == ["gr_CH"]
+    log(f"End", tags=["pytest"])
+
+
+IMPURE_CODE = """ΠΡΟΓΡΑΜΜΑ ΦΩΝΕΣ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Ι
+ΑΡΧΗ
+    Α <- ΦΩΝΑΞΕ(3)
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 3
+        Β <- ΦΩΝΑΞΕ(Ι)
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΝ ΦΩΝΑΞΕ(4) > 0 ΤΟΤΕ
+    ΤΕΛΟΣ_ΑΝ
+    Β <- ΔΙΠΛΟ(Α)
+    ΓΡΑΨΕ 0
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΣΥΝΑΡΤΗΣΗ ΦΩΝΑΞΕ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν
+ΑΡΧΗ
+    ΚΑΛΕΣΕ ΤΥΠΩΣΕ(Ν)
+    ΦΩΝΑΞΕ <- Ν
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΤΥΠΩΣΕ(Χ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Χ
+ΑΡΧΗ
+    ΓΡΑΨΕ Χ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΔΙΠΛΟ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν
+ΑΡΧΗ
+    ΔΙΠΛΟ <- 2 * Ν
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+
+def test_impure_calls_are_kept(parse):
+    func_name = "test_impure_calls_are_kept"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(IMPURE_CODE)
+    symbols = build_symbol_table(program, error_stack)
+    graph = build_call_graph(program, symbols)
+    names = {symbols[i].name for i in graph.impure}
+    # ΦΩΝΑΞΕ only reaches ΓΡΑΨΕ through ΤΥΠΩΣΕ
+    assert names == {"gr_FWNAXE", "gr_TYPWSE"}
+    eliminate_dead_code(program, symbols, graph)
+    kept = statements(program.body)
+    assert [type(s).__name__ for s in kept] == ["VariableAssignement", "For", "If", "Write"]
+    assert len(kept[1].body.body) == 1
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_impure_calls_same_output(run):
+    func_name = "test_impure_calls_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        assert run(IMPURE_CODE, 0, ir=ir) == run(IMPURE_CODE, 1, ir=ir) == run(IMPURE_CODE, 2, ir=ir) == "3\n1\n2\n3\n4\n0\n"
+    log(f"End", tags=["pytest"])
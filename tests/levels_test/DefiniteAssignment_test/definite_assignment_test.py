@@ -0,0 +1,131 @@
+from glwssa_compiler import *
+from glwssa_compiler.data import UsedBeforeAssignment
+
+from conftest import parse_source, requires_gxx, transpile_source
+
+logs_dir = "tests/levels_test/DefiniteAssignment_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 8
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Χ, Υ, Ζ, Π[Ν], Α[Ν, 3], Β[Ν], Γ[Ν], Δ[Ν]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Π[Ι] <- Ι * Ι
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ 3
+            Α[Ι, Κ] <- Ι + Κ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+        ΑΝ Ι > 1 ΤΟΤΕ
+            Β[Ι] <- Β[Ι - 1] + 1
+        ΑΛΛΙΩΣ
+            Β[Ι] <- 1
+        ΤΕΛΟΣ_ΑΝ
+        Γ[Ι] <- Γ[Ι] + Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν - 1
+        Δ[Ι] <- Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΝ Π[2] > 3 ΤΟΤΕ
+        Χ <- 1
+        Υ <- 1
+    ΑΛΛΙΩΣ
+        Χ <- 2
+    ΤΕΛΟΣ_ΑΝ
+    Σ <- 0
+    ΟΣΟ Σ < 10 ΕΠΑΝΑΛΑΒΕ
+        Σ <- Σ + Ζ
+        Ζ <- 3
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Χ, Υ, Σ, Π[Ν], Α[Ν, 3], Β[Ν], Γ[Ν], Δ[Ν]
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def analyze(code: str):
+    program, error_stack = parse_source(code)
+    symbols = build_symbol_table(program, error_stack)
+    assert error_stack.errors_stack == []
+    table = analyze_definite_assignment(program, symbols)
+    names = symbols.scope_of(program).names
+    written_first = {name for name, symbol_id in names.items() if not table.needs_zero(symbol_id)}
+    return written_first, table.warnings
+
+
+SUBPROGRAM = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Σ
+ΑΡΧΗ
+    ΚΑΛΕΣΕ ΓΕΜΙΣΕ(Σ)
+    ΓΡΑΨΕ Σ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΓΕΜΙΣΕ(Σ)
+ΣΤΑΘΕΡΕΣ
+    Ν = 1000
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ, Π[10], Μ[Ν], Ζ[10]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 10
+        Π[Ι] <- Ι
+        Ζ[Ι] <- Ζ[Ι] + 1
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Μ[Ι] <- Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Σ <- Π[10] + Μ[Ν] + Ζ[1]
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+
+def test_written_first():
+    func_name = "test_written_first"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    written_first, warnings = analyze(CODE)
+    # Β and Γ read their elements before all of them are written, Δ misses the last one
+    # Υ is assigned in one branch, Ζ is read in the first repetition of ΟΣΟ
+    assert written_first == {"gr_I", "gr_K", "gr_S", "gr_CH", "gr_P", "gr_A"}
+    assert warnings == [UsedBeforeAssignment("gr_Z", "gr_TEST"), UsedBeforeAssignment("gr_Y", "gr_TEST")]
+
+
+def test_warnings_in_check():
+    func_name = "test_warnings_in_check"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse_source(CODE)
+    TreeAnalyzer(2).analyze_types_tree(program, error_stack)
+    assert error_stack.errors_stack == []
+    # reported once, on the code before the passes
+    assert [w.name for w in error_stack.warnings_stack] == ["gr_Z", "gr_Y"]
+
+
+def test_declarations():
+    func_name = "test_declarations"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        code = transpile_source(CODE, ir=ir).split("int main")[1]
+        log(code, tags=["pytest"])
+        # the arrays of the main program are static storage, it is 0 without any code
+        assert "static int8_t gr_P_elements_[8];" in code and "static int8_t gr_A_elements_[24];" in code
+        assert "int64_t gr_CH;" in code and "int64_t gr_Y = 0;" in code
+        code = transpile_source(SUBPROGRAM, ir=ir).split("int main")[1]
+        log(code, tags=["pytest"])
+        assert "    int8_t gr_P_elements_[10];" in code and "int64_t gr_Z_elements_[10] = {};" in code
+        assert "glwssa_array<int16_t, 1> gr_M({gr_N}, glwssa_no_zero);" in code
+    code = transpile_source(SUBPROGRAM, zero_init=True).split("int main")[1]
+    assert "glwssa_no_zero" not in code and "int8_t gr_P_elements_[10] = {};" in code
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    expected = run(CODE, 0, zero_init=True)
+    assert expected == "1 1 12 64 11 8 8 0\n"
+    for opt_level in (0, 2):
+        for ir in ("ast", "cfg"):
+            assert run(CODE, opt_level, ir=ir) == expected
+            assert run(SUBPROGRAM, opt_level, ir=ir) == "1011\n"
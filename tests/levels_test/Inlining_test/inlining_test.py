@@ -0,0 +1,231 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+from glwssa_compiler.inlining import inline_calls
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/Inlining_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Ι, Π[3]
+ΑΡΧΗ
+    Α <- 1
+    Β <- ΔΙΠΛΟ(Α) + ΔΙΠΛΟ(ΔΙΠΛΟ(3))
+    ΚΑΛΕΣΕ ΑΛΛΑΞΕ(Α, Β)
+    ΓΡΑΨΕ Α, Β
+    Π[1] <- 5
+    Π[2] <- 7
+    Ι <- 1
+    ΚΑΛΕΣΕ ΑΛΛΑΞΕ(Ι, Π[Ι])
+    ΓΡΑΨΕ Ι, Π[1], Π[2]
+    ΑΝ Α > 100 ΚΑΙ ΔΙΠΛΟ(Α) > 0 ΤΟΤΕ
+        ΓΡΑΨΕ ΠΑΡ(Α)
+    ΤΕΛΟΣ_ΑΝ
+    ΓΡΑΨΕ ΠΑΡ(5)
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΣΥΝΑΡΤΗΣΗ ΔΙΠΛΟ(Χ): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Χ
+ΑΡΧΗ
+    Χ <- Χ * 2
+    ΔΙΠΛΟ <- Χ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΛΛΑΞΕ(Κ, Λ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Κ, Λ, Τ
+ΑΡΧΗ
+    Τ <- Κ
+    Κ <- Λ
+    Λ <- Τ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΠΑΡ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν
+ΑΡΧΗ
+    ΑΝ Ν <= 1 ΤΟΤΕ
+        ΠΑΡ <- 1
+    ΑΛΛΙΩΣ
+        ΠΑΡ <- Ν * ΠΑΡ(Ν - 1)
+    ΤΕΛΟΣ_ΑΝ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+
+def inline(parse, code: str, threshold: int = 60):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    changed = inline_calls(program, symbols, build_call_graph(program, symbols), threshold)
+    # the renamed locals must resolve when the table is built again
+    build_symbol_table(program, error_stack)
+    assert error_stack.errors_stack == []
+    return program, changed
+
+
+def calls(program):
+    return [n.name for s in program.body for n in walk(s) if isinstance(n, (CallFunction, CallProcedure))]
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_inline_calls(parse):
+    func_name = "test_inline_calls"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = inline(parse, CODE)
+    assert changed
+    # the call on the right of ΚΑΙ might not run and ΠΑΡ is recursive
+    assert calls(program) == ["gr_DIPLO", "gr_PAR", "gr_PAR"]
+    declared = {n.variable.name for n in program.body if isinstance(n, VariableDeclaration)}
+    assert {"inl1_gr_CH", "inl1_gr_DIPLO", "inl4_gr_T"} <= declared
+    log(f"End", tags=["pytest"])
+
+
+def test_copy_out_keeps_the_element(parse):
+    func_name = "test_copy_out_keeps_the_element"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = inline(parse, CODE)
+    copy_out = [n for n in program.body if isinstance(n, VariableAssignement) and n.target == "gr_P" and n.target_index]
+    # Π[Ι] is the element Ι pointed to when ΑΛΛΑΞΕ was called, Ι itself is changed by the call
+    assert copy_out[-1].target_index == [Variable("inl5_index0", None)] # Ι is used by reference, it is not copied in first
+    log(f"End", tags=["pytest"])
+
+
+def test_threshold(parse):
+    func_name = "test_threshold"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = inline(parse, CODE, threshold=3)
+    assert not changed
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    assert run(CODE, 2) == run(CODE, 0) == "14 1\n5 1 7\n120\n"
+    log(f"End", tags=["pytest"])
+
+
+LOOP_CODE = """ΠΡΟΓΡΑΜΜΑ ΕΠΑΝΑΛΗΨΗ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 3
+        ΓΡΑΨΕ ΜΕΤΡΑ(1), ΔΥΟ(Ι) + ΔΥΟ(Ι)
+        ΚΑΛΕΣΕ ΓΕΜΙΣΕ(Ι, Σ)
+        ΓΡΑΨΕ Σ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΣΥΝΑΡΤΗΣΗ ΜΕΤΡΑ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν, Κ
+ΑΡΧΗ
+    Κ <- Κ + Ν
+    ΜΕΤΡΑ <- Κ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΣΥΝΑΡΤΗΣΗ ΔΥΟ(Ν): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν
+ΑΡΧΗ
+    ΑΝ Ν > 1 ΤΟΤΕ
+        ΔΥΟ <- ΔΥΟ + ΜΕΤΡΑ(Ν)
+    ΤΕΛΟΣ_ΑΝ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΓΕΜΙΣΕ(Ν, Σ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ν, Σ, Ι, Π[3]
+ΑΡΧΗ
+    Π[Ν] <- Π[Ν] + Ν
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 3
+        Σ <- Σ * 10 + Π[Ι]
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+
+def test_locals_start_at_zero(parse):
+    func_name = "test_locals_start_at_zero"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = parse(LOOP_CODE)
+    analyzer = TreeAnalyzer(0)
+    analyzer.analyze_types_tree(program, ErrorStack(LOOP_CODE.splitlines()))
+    manager = analyzer.manager
+    assert inline_calls(program, manager.get_analysis("symbols"), manager.get_analysis("calls"),
+                        assignment=manager.get_analysis("assignment"))
+    loop = [s for s in program.body if isinstance(s, For)][0]
+    resets = {s.target for s in loop.body.body if isinstance(s, VariableAssignement) and s.expr == Number("0")}
+    # ΜΕΤΡΑ assigns its result on every path, ΔΥΟ does not, Ι of ΓΕΜΙΣΕ is written before it is read
+    suffixes = {name.split("_", 1)[1] for name in resets if name.startswith("inl")}
+    assert "gr_K" in suffixes and "gr_DYO" in suffixes
+    assert "gr_METRA" not in suffixes and "gr_I" not in suffixes
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_same_output_in_loop(run):
+    func_name = "test_same_output_in_loop"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    # ΔΥΟ is inlined twice with the ΜΕΤΡΑ that was inlined into it, each with its own names
+    expected = "1 0\n100\n1 4\n20\n1 6\n3\n"
+    for ir in ("ast", "cfg"):
+        assert run(LOOP_CODE, 2, ir=ir) == run(LOOP_CODE, 0, ir=ir) == expected
+    log(f"End", tags=["pytest"])
+
+
+ALIAS_CODE = """ΠΡΟΓΡΑΜΜΑ ΑΛΙΑΣ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Π[3]
+ΑΡΧΗ
+    Α <- 1
+    ΚΑΛΕΣΕ ΑΛ(Α, Α)
+    Π[1] <- 1
+    ΚΑΛΕΣΕ ΑΛ(Π[1], Π[1])
+    Β <- 1
+    ΚΑΛΕΣΕ ΑΛ(Β, Β + 1)
+    ΓΡΑΨΕ Α, Π[1], Β
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΛ(Λ, Κ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Λ, Κ
+ΑΡΧΗ
+    Λ <- Λ + 1
+    Κ <- 5
+    Λ <- Λ + 1
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+
+def test_aliased_arguments(parse):
+    func_name = "test_aliased_arguments"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = inline(parse, ALIAS_CODE)
+    assert changed
+    # Λ and Κ are both Α, the element can not be copied in and out twice
+    assert calls(program) == ["gr_AL"]
+    assert not any(isinstance(n, VariableDeclaration) and n.variable.name == "inl1_gr_L" for n in program.body)
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_aliased_same_output(run):
+    func_name = "test_aliased_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    # the arguments of a procedure are references at every level
+    for ir in ("ast", "cfg"):
+        assert run(ALIAS_CODE, 0, ir=ir) == run(ALIAS_CODE, 1, ir=ir) == run(ALIAS_CODE, 2, ir=ir) == "6 6 3\n"
+    log(f"End", tags=["pytest"])
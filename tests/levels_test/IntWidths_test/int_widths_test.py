@@ -0,0 +1,100 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+from glwssa_compiler.ranges import Interval
+
+from conftest import requires_gxx, transpile_source
+
+logs_dir = "tests/levels_test/IntWidths_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 10
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Μ[Ν], Β[Ν], Ε[Ν], Δ[Ν], Ρ[10], Λ[Ν]
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Μ[Ι] <- Ι MOD 3 - 1
+        Β[Ι] <- Ι * 1000
+        Ε[Ι] <- Ι * 1000000
+        Ρ[Ι] <- Ι * Ι
+        ΔΙΑΒΑΣΕ Δ[Ι]
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Σ <- Σ + Μ[Ι] * 127 + Β[Ι] * 100000
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΚΑΛΕΣΕ ΔΙΠΛΑ(Ρ)
+    Κ <- 1
+    ΟΣΟ Κ < 100 ΕΠΑΝΑΛΑΒΕ
+        Λ[1] <- Κ
+        Κ <- Κ * 2
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ, Μ[1] - 200, Ε[Ν] * 1000, Δ[1], Ρ[2], Λ[1]
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΔΙΠΛΑ(Α)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Α[10]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 10
+        Α[Ι] <- Α[Ι] * 2
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+
+def analyze(parse, code: str):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    assert error_stack.errors_stack == []
+    table = analyze_ranges(program, symbols)
+    return {name: table.element_range(symbol_id) for name, symbol_id in symbols.scope_of(program).names.items()}
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_element_ranges(parse):
+    func_name = "test_element_ranges"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    ranges = analyze(parse, CODE)
+    assert ranges["gr_M"] == Interval(-1, 1)
+    assert ranges["gr_B"] == Interval(0, 10000)
+    assert ranges["gr_E"] == Interval(0, 10000000)
+    # read with ΔΙΑΒΑΣΕ, passed to a procedure
+    assert ranges["gr_D"].high == ranges["gr_R"].high == float("inf")
+    # Κ of the ΟΣΟ is widened, the condition still bounds it in the body
+    assert ranges["gr_L"] == Interval(0, 99)
+
+
+def test_declared_types(parse):
+    func_name = "test_declared_types"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        code = transpile_source(CODE, ir=ir, zero_init=True)
+        log(code, tags=["pytest"])
+        assert "glwssa_array<int8_t, 1> gr_M(" in code
+        assert "glwssa_array<int16_t, 1> gr_B(" in code
+        assert "glwssa_array<int32_t, 1> gr_E(" in code
+        assert "glwssa_array<int64_t, 1> gr_D(" in code
+        assert "glwssa_array<int64_t, 1> gr_R(" in code
+        assert "glwssa_array<int8_t, 1> gr_L(" in code
+        # the parameter keeps the type of the arrays that are passed to it
+        assert "glwssa_array<int64_t, 1>& gr_A" in code
+    assert "static_cast<int64_t>(gr_M(" in transpile_source(CODE)
+    wide = transpile_source(CODE, narrow_ints=False)
+    assert "int8_t" not in wide.replace("int64_t", "") and "static_cast" not in wide.split("int main")[1]
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    stdin = "\n".join(str(i * 100000) for i in range(10))
+    expected = run(CODE, 0, stdin, narrow_ints=False)
+    # Β[Ι] * 100000 and Ε[Ν] * 1000 do not fit in int32_t, Μ[1] - 200 is not an int8_t
+    assert expected == "5500000000 -200 10000000000 0 8 64\n"
+    for opt_level in (0, 2):
+        for ir in ("ast", "cfg"):
+            assert run(CODE, opt_level, stdin, ir=ir) == expected
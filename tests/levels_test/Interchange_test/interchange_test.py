@@ -0,0 +1,93 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx, transpile_source
+
+logs_dir = "tests/levels_test/Interchange_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 6
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Α[Ν, Ν], Β[Ν, Ν]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ, Ρ[Ν, Ν]
+ΑΡΧΗ
+    Σ <- 0
+    Χ <- 0
+    ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+            Α[Ι, Κ] <- Ι * 10 + Κ
+            Ρ[Ι, Κ] <- Ι / Κ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+            Σ <- Σ + Α[Ι, Κ] * Κ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+            Χ <- Χ + Ρ[Ι, Κ]
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν - 1
+        ΓΙΑ Ι ΑΠΟ 2 ΜΕΧΡΙ Ν
+            Α[Ι, Κ] <- Α[Ι - 1, Κ + 1] + 1
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν
+            Β[Ι, Κ] <- Α[Ι, Κ] + Α[Κ, Ι]
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν
+        ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+            ΓΡΑΨΕ Β[Ι, Κ]
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ, Χ, Ι, Κ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def nests(program) -> list:
+    return [node for node in program.body if isinstance(node, For) and isinstance(node.body.body[0], For)]
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_interchange(parse):
+    func_name = "test_interchange"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE)
+    symbols = build_symbol_table(program, error_stack)
+    types = infer_types(program, symbols, error_stack)
+    assert error_stack.errors_stack == []
+    assert interchange_loops(program, symbols, types, analyze_ranges(program, symbols))
+    # the ΠΡΑΓΜΑΤΙΚΕΣ sum is rounded in the order it is added, Α[Ι - 1, Κ + 1] is written in an earlier repetition,
+    # Β[Ι, Κ] is already walked by row, the ΓΡΑΨΕ shows the order
+    assert [nest.counter.name for nest in nests(program)] == ["gr_I", "gr_I", "gr_K", "gr_K", "gr_I", "gr_K"]
+    # only the headers moved
+    inner = nests(program)[0].body.body[0]
+    assert inner.counter.name == "gr_K" and type(inner.body.body[0]) is VariableAssignement
+
+
+def test_only_at_O2():
+    func_name = "test_only_at_O2"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    code = transpile_source(CODE, 2)
+    log(code, tags=["pytest"])
+    outer = "\n    for (gr_I = 1; gr_I <= 6; ++gr_I) {"
+    assert code.count(outer) == 3
+    assert transpile_source(CODE, 1).count(outer) == 1
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    expected = run(CODE, 0)
+    assert run(CODE, 2) == expected
+    assert run(CODE, 2, ir="cfg") == expected
@@ -0,0 +1,99 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/LICM_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Ν, Σ, Δ, Π[4]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ, Υ
+ΑΡΧΗ
+    Ν <- 5
+    Χ <- 2.5
+    Δ <- 0
+    Υ <- 0
+    Σ <- 0
+    Π[1] <- 3
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν * 2 - 1
+        Υ <- Υ + Τ_Ρ(Χ) * 3.14 + Ι
+        ΓΙΑ Κ ΑΠΟ 1 ΜΕΧΡΙ Ν + 4 ΜΕ_ΒΗΜΑ Ν - 3
+            Σ <- Σ + Ν * Ν + Π[1] + Κ
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+        ΑΝ Δ <> 0 ΤΟΤΕ
+            Σ <- Σ + Ν DIV Δ
+        ΤΕΛΟΣ_ΑΝ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Ι <- 0
+    ΟΣΟ Ι < Ν * 3 ΕΠΑΝΑΛΑΒΕ
+        Ι <- Ι + Ν - 4
+        ΚΑΛΕΣΕ ΑΥΞΗΣΕ(Σ, Ν * 2)
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΡΧΗ_ΕΠΑΝΑΛΗΨΗΣ
+        Ν <- Ν - 1
+        Υ <- Υ + Χ * Χ
+    ΜΕΧΡΙΣ_ΟΤΟΥ Ν < Χ * 2
+    ΓΡΑΨΕ Σ, Υ, Ι, Ν
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΥΞΗΣΕ(Α, Β)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β
+ΑΡΧΗ
+    Α <- Α + Β
+    Β <- 0
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+
+def move(parse, code: str):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    changed = move_loop_invariants(program, symbols, infer_types(program, symbols, error_stack))
+    # the temporaries must resolve when the table is built again
+    build_symbol_table(program, error_stack)
+    assert error_stack.errors_stack == []
+    return program, changed
+
+
+def hoisted(program):
+    return {n.target: n.expr for n in program.body if isinstance(n, VariableAssignement) and n.target.startswith("licm")}
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_hoists_invariant_expressions(parse):
+    func_name = "test_hoists_invariant_expressions"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = move(parse, CODE)
+    assert changed
+    moved = list(hoisted(program).values())
+    # the bounds of the inner ΓΙΑ and Ν * Ν went out of both loops
+    assert BinaryOperation(Variable("gr_N", None), "MUL", Variable("gr_N", None)) in moved
+    assert BinaryOperation(Variable("gr_N", None), "PLUS", Number("4")) in moved
+    assert ArrayIndex("gr_P", [Number("1")], None) in moved
+    # Ν changes in the ΜΕΧΡΙΣ_ΟΤΟΥ, Χ * Χ does not
+    assert BinaryOperation(Variable("gr_CH", None), "MUL", Variable("gr_CH", None)) in moved
+    assert not any(isinstance(n, BinaryOperation) and n.operator == "IDIV" for e in moved for n in walk(e))
+    log(f"End", tags=["pytest"])
+
+
+def test_argument_is_not_replaced(parse):
+    func_name = "test_argument_is_not_replaced"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = move(parse, CODE)
+    call = next(n for s in program.body for n in walk(s) if isinstance(n, CallProcedure))
+    # the procedure changes its second parameter, a temporary there would not be the same in the next repetition
+    assert isinstance(call.params[1], BinaryOperation)
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    assert run(CODE, 2) == run(CODE, 0)
+    log(f"End", tags=["pytest"])
@@ -0,0 +1,182 @@
+import pytest
+
+from glwssa_compiler import *
+
+logs_dir = "tests/levels_test/PassManager_test/logs/"
+
+
+class CountingAnalysis(AnalysisPass):
+    def __init__(self, name, needs=()):
+        self.name = name
+        self.needs = needs
+        self.runs = 0
+
+    def run(self, program, manager):
+        self.runs += 1
+        return [manager.get_analysis(n) for n in self.needs] + [self.runs]
+
+
+class DummyTransform(TransformPass):
+    def __init__(self, name, requires=(), invalidates=(ALL_ANALYSES,), changes=True):
+        self.name = name
+        self.requires = requires
+        self.invalidates = invalidates
+        self.changes = changes
+        self.seen = []
+
+    def run(self, program, manager):
+        self.seen = [manager.get_analysis(n) for n in self.requires]
+        return self.changes
+
+
+def make_manager(*passes):
+    manager = PassManager(ErrorStack([]), passes)
+    symbols = CountingAnalysis("symbols")
+    types = CountingAnalysis("types", needs=("symbols",))
+    manager.register_analysis(symbols)
+    manager.register_analysis(types)
+    return manager, symbols, types
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_analysis_is_cached_between_passes():
+    func_name = "test_analysis_is_cached_between_passes"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    manager, symbols, types = make_manager(
+        DummyTransform("a", requires=("types",), changes=False),
+        DummyTransform("b", requires=("types",), changes=False),
+    )
+    manager.run(Program([]))
+
+    assert symbols.runs == 1
+    assert types.runs == 1
+    log(f"End", tags=["pytest"])
+
+
+def test_invalidation_cascades_to_dependents():
+    func_name = "test_invalidation_cascades_to_dependents"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    manager, symbols, types = make_manager(
+        DummyTransform("a", requires=("types",), changes=False),
+        DummyTransform("b", invalidates=("symbols",)),
+        DummyTransform("c", requires=("types",), changes=False),
+    )
+    manager.run(Program([]))
+
+    # "types" was computed with "symbols", so dropping "symbols" drops "types" as well
+    assert symbols.runs == 2
+    assert types.runs == 2
+    log(f"End", tags=["pytest"])
+
+
+def test_unrelated_invalidation_keeps_cache():
+    func_name = "test_unrelated_invalidation_keeps_cache"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    manager, symbols, types = make_manager(
+        DummyTransform("a", requires=("types",), changes=False),
+        DummyTransform("b", invalidates=("types",)),
+        DummyTransform("c", requires=("types",), changes=False),
+    )
+    manager.run(Program([]))
+
+    assert symbols.runs == 1
+    assert types.runs == 2
+    log(f"End", tags=["pytest"])
+
+
+def test_unchanged_tree_invalidates_nothing():
+    func_name = "test_unchanged_tree_invalidates_nothing"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    manager, symbols, types = make_manager(
+        DummyTransform("a", requires=("types",), changes=False),
+        DummyTransform("b", changes=False),
+        DummyTransform("c", requires=("types",), changes=False),
+    )
+    manager.run(Program([]))
+
+    assert types.runs == 1
+    log(f"End", tags=["pytest"])
+
+
+def test_every_pass_is_timed():
+    func_name = "test_every_pass_is_timed"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    manager, symbols, types = make_manager(
+        DummyTransform("a", requires=("types",), changes=False),
+        DummyTransform("b"),
+    )
+    manager.run(Program([]))
+
+    names = [(t.name, t.kind) for t in manager.timings]
+    assert names == [("symbols", "analysis"), ("types", "analysis"), ("a", "transform"), ("b", "transform")]
+    assert all(t.seconds >= 0 for t in manager.timings)
+    assert "Total" in manager.report()
+    log(f"End", tags=["pytest"])
+
+
+def test_every_level_has_a_pipeline():
+    func_name = "test_every_level_has_a_pipeline"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for level in (0, 1, 2):
+        analyzer = TreeAnalyzer(level)
+        analyzer.analyze_types_tree(Program([]), ErrorStack([]))
+        assert analyzer.manager is not None
+    log(f"End", tags=["pytest"])
+
+
+def test_each_error_is_reported_once(parse):
+    func_name = "test_each_error_is_reported_once"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    code = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    Α <- 2 + 3
+    Α <- Α + ΑΛΗΘΗΣ
+    Β <- 1
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+    for level in (0, 1, 2):
+        program, error_stack = parse(code)
+        analyzer = TreeAnalyzer(level)
+        analyzer.analyze_types_tree(program, error_stack)
+        # the folding invalidates "types", it must not run and push the GS01 again
+        assert sorted(type(e).__name__ for e in error_stack.errors_stack) == ["UndefinedVariable", "WrongType"]
+        assert [t.name for t in analyzer.manager.timings if t.kind == "transform"] == ["check"]
+    log(f"End", tags=["pytest"])
+
+
+def test_release_profiles_do_not_inline():
+    func_name = "test_release_profiles_do_not_inline"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for inline in (True, False):
+        analyzer = TreeAnalyzer(2, inline=inline)
+        analyzer.analyze_types_tree(Program([]), ErrorStack([]))
+        assert any(p.name == "inlining" for p in analyzer.manager.passes) == inline
+    log(f"End", tags=["pytest"])
+
+
+def test_pass_without_run_is_rejected():
+    func_name = "test_pass_without_run_is_rejected"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+
+    class NoRunAnalysis(AnalysisPass):
+        name = "no-run"
+
+    class NoRunTransform(TransformPass):
+        name = "no-run"
+
+    # it fails when the pass is made, not when the pipeline gets to it
+    for pass_class in (NoRunAnalysis, NoRunTransform):
+        with pytest.raises(TypeError):
+            pass_class()
+    log(f"End", tags=["pytest"])
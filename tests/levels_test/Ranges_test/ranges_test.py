@@ -0,0 +1,136 @@
+import subprocess
+
+import pytest
+
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx, transpile_source
+
+logs_dir = "tests/levels_test/Ranges_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 10
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Μ, Π[Ν], Α[Ν, 5]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Π[Ι] <- Ι
+        ΓΙΑ Κ ΑΠΟ 5 ΜΕΧΡΙ 1 ΜΕ_ΒΗΜΑ -1
+            Α[Ι, Κ] <- Π[(Ι + Κ) MOD Ν + 1]
+        ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ Ν + 1
+        Π[Ι] <- 0
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΔΙΑΒΑΣΕ Μ
+    ΑΝ Μ >= 1 ΚΑΙ Μ <= Ν ΤΟΤΕ
+        ΓΡΑΨΕ Π[Μ]
+    ΤΕΛΟΣ_ΑΝ
+    Κ <- 1
+    ΟΣΟ Κ <= Ν ΚΑΙ Π[Κ] = 0 ΕΠΑΝΑΛΑΒΕ
+        Κ <- Κ + 1
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Π[Μ], Π[Κ]
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+OUT_OF_BOUNDS = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ, Π[5]
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 5
+        Π[Ι] <- Ι * Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΔΙΑΒΑΣΕ Ι
+    ΓΡΑΨΕ Π[Ι]
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+INCREMENT_FIRST = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ, Π[10]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 10
+        Π[Ι] <- Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Σ <- 0
+    Ι <- 0
+    ΟΣΟ Ι <= 10 ΕΠΑΝΑΛΑΒΕ
+        Ι <- Ι + 1
+        Σ <- Σ + Π[Ι]
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def analyze(parse, code: str):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    assert error_stack.errors_stack == []
+    return program, analyze_ranges(program, symbols)
+
+
+def proven(program, table, name: str):
+    """
+    For every element of the array, in the order of the code: True if all its indexes are proven.
+    """
+    result = []
+    for node in (n for s in program.body for n in walk(s)):
+        if isinstance(node, ArrayIndex) and node.name == name:
+            result.append(all(table.is_proven(i) for i in node.index_dim))
+        elif isinstance(node, VariableAssignement) and node.target == name and node.target_index:
+            result.append(all(table.is_proven(i) for i in node.target_index))
+    return result
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_proven_indexes(parse):
+    func_name = "test_proven_indexes"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, table = analyze(parse, CODE)
+    # Π[Ι] of ΓΙΑ, Π[... MOD Ν + 1], Π[Ι] up to Ν + 1, Π[Μ] after the ΑΝ, Π[Κ] after ΚΑΙ, Π[Μ] and Π[Κ] unknown
+    assert proven(program, table, "gr_P") == [True, True, False, True, True, False, False]
+    # ΓΙΑ with a negative step
+    assert proven(program, table, "gr_A") == [True]
+
+
+def test_checks_in_code(parse):
+    func_name = "test_checks_in_code"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    checked = transpile_source(CODE)
+    assert checked.count("glwssa_index(") == 3 + 1 # and the definition
+    assert "gr_P(glwssa_index(gr_I, gr_N)) = 0;" in checked
+    assert "glwssa_index(" not in transpile_source(CODE, bounds_checks="off").split("int main")[1]
+    assert transpile_source(CODE, bounds_checks="all").count("glwssa_index(") == 9 + 1
+    assert transpile_source(CODE, ir="cfg").count("glwssa_index(") == 3 + 1
+
+
+@requires_gxx
+def test_out_of_bounds(run):
+    func_name = "test_out_of_bounds"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        assert run(OUT_OF_BOUNDS, 0, "3", ir=ir) == "9\n"
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            run(OUT_OF_BOUNDS, 2, "6", ir=ir)
+        assert error.value.returncode == 1
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            run(INCREMENT_FIRST, 2, ir=ir) # Π[11] in the last repetition
+        assert error.value.returncode == 1
+
+
+def test_increment_before_use(parse):
+    func_name = "test_increment_before_use"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, table = analyze(parse, INCREMENT_FIRST)
+    # in the last repetition Ι is 11, the ranges of the first one do not hold
+    assert proven(program, table, "gr_P") == [True, False]
+    assert "gr_P(glwssa_index(gr_I, 10))" in transpile_source(INCREMENT_FIRST, 2)
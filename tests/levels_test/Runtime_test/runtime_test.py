@@ -0,0 +1,113 @@
+import os
+import subprocess
+
+import pytest
+
+from glwssa_compiler import *
+
+from conftest import requires_gxx, transpile_source, parse_source
+
+logs_dir = "tests/levels_test/Runtime_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Π[3]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 3
+        Π[Ι] <- 2 ^ Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Π[3], Α_Μ(7 / 2), Π[3] > 7
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+IO = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ
+    ΧΑΡΑΚΤΗΡΕΣ: Ο
+ΑΡΧΗ
+    ΓΡΑΨΕ "Όνομα;"
+    ΔΙΑΒΑΣΕ Ο, Α
+    ΔΙΑΒΑΣΕ Χ, Β
+    ΓΡΑΨΕ Ο, Α, Β, Χ, Χ * 1000000, Α / 8, Α < Β
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def transpile(code: str, runtime: str) -> str:
+    program, error_stack = parse_source(code)
+    analyzer = TreeAnalyzer(0)
+    analyzer.analyze_types_tree(program, error_stack)
+    return TranspilerBackend_cpp().translate_tree(program, analyzer.manager, runtime=runtime)
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_runtime_modes():
+    func_name = "test_runtime_modes"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    assert f"#define GLWSSA_RUNTIME_VERSION {RUNTIME_VERSION}\n" in runtime_code("inline")
+    pasted, included = transpile(CODE, "inline"), transpile(CODE, "include")
+    assert pasted == transpile_source(CODE)
+    # the #include is the first line, a .gch is only used for the first header of the code
+    assert included.startswith('#include "glwssa_runtime.hpp"\n')
+    assert pasted.split("#endif // GLWSSA_RUNTIME_HPP\n")[1] == included.split("\n", 1)[1]
+
+
+@requires_gxx
+def test_precompiled_header(tmp_path):
+    func_name = "test_precompiled_header"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    directory = precompiled_header(str(tmp_path / "cache"))
+    gch = os.path.join(directory, "glwssa_runtime.hpp.gch")
+    made = os.stat(gch).st_mtime_ns
+    assert precompiled_header(str(tmp_path / "cache")) == directory
+    assert os.stat(gch).st_mtime_ns == made # made once
+    assert not [name for name in os.listdir(directory) if name.startswith(".tmp-")]
+
+    source, executable = tmp_path / "program.cpp", tmp_path / "program.out"
+    source.write_text(transpile(CODE, "include"))
+    # with -H g++ prints the headers it reads, the '!' marks a .gch that was used
+    result = subprocess.run(["g++", "-H", "-Winvalid-pch", "-I", directory, str(source), "-o", str(executable)],
+                            capture_output=True, text=True, check=True)
+    assert f"! {gch}" in result.stderr
+    assert subprocess.run([str(executable)], capture_output=True, text=True, check=True).stdout == "8 3 ΑΛΗΘΗΣ\n"
+
+
+@requires_gxx
+def test_buffered_io(run):
+    func_name = "test_buffered_io"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    # the values are separated by any white space, the reals are written like std::cout writes them
+    expected = "Όνομα;\nΕλένη -9223372036854775808 12 0.125 125000 -1.15292e+18 ΑΛΗΘΗΣ\n"
+    assert run(IO, 0, "Ελένη   -9223372036854775808\n\t1.25e-1 +12") == expected
+    # nothing to read: the values are 0, like std::cin leaves them
+    assert run(IO, 0, "") == "Όνομα;\n 0 0 0 0 0 ΨΕΥΔΗΣ\n"
+
+
+NEGATIVE_POWER = """ΠΡΟΓΡΑΜΜΑ ΔΥΝΑΜΗ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Ε
+ΑΡΧΗ
+    ΔΙΑΒΑΣΕ Α, Ε
+    ΓΡΑΨΕ (-1) ^ Ε
+    ΓΡΑΨΕ Α ^ Ε
+    ΓΡΑΨΕ 2 ^ -1
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+@requires_gxx
+def test_negative_integer_power(run):
+    func_name = "test_negative_integer_power"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for level in (0, 1, 2):
+        # 2 ^ -1 is 0.5, it used to be written as 0
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            run(NEGATIVE_POWER, level, "1 -3")
+        assert error.value.returncode == 1
+        assert error.value.stdout == "-1\n1\n"
+    log(f"End", tags=["pytest"])
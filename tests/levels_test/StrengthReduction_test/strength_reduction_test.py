@@ -0,0 +1,77 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx
+
+logs_dir = "tests/levels_test/StrengthReduction_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Π[3]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ, Υ
+ΑΡΧΗ
+    Α <- -7
+    Χ <- -2.75
+    Π[2] <- 3
+    Β <- Α ^ 2 + Α ^ 3 + Π[2] ^ 4 + (Α + 1) ^ 2 + Α ^ 1 + Α ^ 0 + Α ^ 5
+    ΓΡΑΨΕ Β
+    Υ <- Χ ^ 2 + Χ ^ 3 + Χ / 4 + Α / 8 + Χ * 2 + Χ / 3
+    ΓΡΑΨΕ Υ
+    ΓΡΑΨΕ Α DIV 1, Α DIV -1, Α MOD -1, Α DIV 4, Α MOD 4, Α * 1, Α + 0, Χ - 0
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def reduce(parse, code: str):
+    program, error_stack = parse(code)
+    symbols = build_symbol_table(program, error_stack)
+    fold_constants(program, symbols) # the pass runs after the folding, -1 is a literal then
+    changed = reduce_strength(program, infer_types(program, symbols, error_stack))
+    assert error_stack.errors_stack == []
+    return program, changed
+
+
+def operators(node):
+    return [n.operator for n in walk(node) if isinstance(n, BinaryOperation)]
+
+
+def assigned(program, target):
+    return next(n.expr for n in program.body if isinstance(n, VariableAssignement) and n.target == target)
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_small_powers(parse):
+    func_name = "test_small_powers"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, changed = reduce(parse, CODE)
+    assert changed
+    # (Α + 1) ^ 2 would compute Α + 1 twice and Α ^ 5 is above MAX_POWER
+    assert operators(assigned(program, "gr_B")).count("POW") == 2
+    # a real Χ ^ 3 rounds differently as Χ*Χ*Χ
+    assert operators(assigned(program, "gr_Y")).count("POW") == 1
+    log(f"End", tags=["pytest"])
+
+
+def test_division_by_power_of_two(parse):
+    func_name = "test_division_by_power_of_two"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, _ = reduce(parse, CODE)
+    expr = assigned(program, "gr_Y")
+    assert Float("0.25") in list(walk(expr))
+    assert operators(expr).count("FDIV") == 1 # Χ / 3
+    write = next(n for n in program.body if isinstance(n, Write) and len(n.expression) > 2)
+    assert [type(e).__name__ for e in write.expression[:3]] == ["Variable", "UnaryOperator", "Number"]
+    # DIV 4 and MOD 4 keep the truncation of ΓΛΩΣΣΑ, they are left to g++
+    assert [e.operator for e in write.expression[3:5]] == ["IDIV", "MOD"]
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    assert run(CODE, 1) == run(CODE, 0) == "-16990\n-21.2135\n-7 7 0 -1 -3 -7 -7 -2.75\n"
+    log(f"End", tags=["pytest"])
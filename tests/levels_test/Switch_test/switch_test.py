@@ -0,0 +1,152 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+
+from conftest import requires_gxx, transpile_source
+
+logs_dir = "tests/levels_test/Switch_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΕΠΙΛΟΓΕΣ
+ΣΤΑΘΕΡΕΣ
+    ΤΕΣΣΕΡΑ = 4
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ, Τ
+ΑΡΧΗ
+    Σ <- 0
+    Τ <- 0
+    ΓΙΑ Ι ΑΠΟ -3 ΜΕΧΡΙ 12
+        ΕΠΙΛΕΞΕ Ι
+            ΠΕΡΙΠΤΩΣΗ 1, 3
+                Σ <- Σ + 1
+            ΠΕΡΙΠΤΩΣΗ 2, 3..5
+                Σ <- Σ + 10
+            ΠΕΡΙΠΤΩΣΗ ΤΕΣΣΕΡΑ
+                Σ <- Σ + 1000
+            ΠΕΡΙΠΤΩΣΗ 6..7
+                Σ <- Σ + 100
+            ΠΕΡΙΠΤΩΣΗ ΑΛΛΙΩΣ
+                Σ <- Σ + 10000
+        ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ
+        ΕΠΙΛΕΞΕ 10 * Ι
+            ΠΕΡΙΠΤΩΣΗ < -10
+                ΓΡΑΨΕ "Α"
+            ΠΕΡΙΠΤΩΣΗ 0, 50
+                ΓΡΑΨΕ "Β"
+            ΠΕΡΙΠΤΩΣΗ 20..30, -10
+                ΓΡΑΨΕ "Γ"
+            ΠΕΡΙΠΤΩΣΗ >= 100
+                ΓΡΑΨΕ "Δ"
+            ΠΕΡΙΠΤΩΣΗ 110
+                ΓΡΑΨΕ "Ε"
+            ΠΕΡΙΠΤΩΣΗ ΑΛΛΙΩΣ
+                ΓΡΑΨΕ "-"
+        ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ
+        ΕΠΙΛΕΞΕ Ι * Ι * Ι
+            ΠΕΡΙΠΤΩΣΗ < 0
+                Τ <- Τ + 1
+            ΠΕΡΙΠΤΩΣΗ 0..9
+                Τ <- Τ + 10
+            ΠΕΡΙΠΤΩΣΗ 10..99
+                Τ <- Τ + 100
+            ΠΕΡΙΠΤΩΣΗ >= 100
+                Τ <- Τ + 1000
+        ΤΕΛΟΣ_ΕΠΙΛΟΓΩΝ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ, Τ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+CHAIN = """ΠΡΟΓΡΑΜΜΑ ΑΛΥΣΙΔΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Κ, Σ, Τ
+ΑΡΧΗ
+    Σ <- 0
+    Τ <- 0
+    ΓΙΑ Ι ΑΠΟ 0 ΜΕΧΡΙ 30
+        Κ <- Ι MOD 12
+        ΑΝ Κ = 1 Ή Κ = 3 ΤΟΤΕ
+            Σ <- Σ + 1
+        ΑΛΛΙΩΣ_ΑΝ Κ >= 3 ΚΑΙ Κ <= 5 ΤΟΤΕ
+            Σ <- Σ + 10
+        ΑΛΛΙΩΣ_ΑΝ 9 < Κ ΤΟΤΕ
+            Σ <- Σ + 100
+        ΑΛΛΙΩΣ_ΑΝ 0 = Κ ΤΟΤΕ
+            Σ <- Σ + 1000
+        ΑΛΛΙΩΣ
+            Σ <- Σ + 10000
+        ΤΕΛΟΣ_ΑΝ
+        ΑΝ Κ = 1 ΤΟΤΕ
+            Τ <- Τ + 1
+        ΑΛΛΙΩΣ_ΑΝ Ι = 2 ΤΟΤΕ
+            Τ <- Τ + 10
+        ΑΛΛΙΩΣ_ΑΝ Κ = 3 ΤΟΤΕ
+            Τ <- Τ + 100
+        ΑΛΛΙΩΣ_ΑΝ Κ = 4 ΤΟΤΕ
+            Τ <- Τ + 1000
+        ΤΕΛΟΣ_ΑΝ
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ, Τ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_dispatch():
+    func_name = "test_dispatch"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    code = transpile_source(CODE)
+    log(code, tags=["pytest"])
+    # dense constants and ranges: a C++ switch, 3 and 4 go to the first branch that has them
+    assert "case 1:\n                case 3: {" in code and "case 4 ... 5: {" in code
+    assert "gr_S + 1000)" not in code
+    # sparse and relational cases: a decision tree, the branches that are in more than one leaf are found by their index
+    assert "if (switch2_ < 20) {" in code and "int case3_ = -1;" in code and "switch (case3_) {" in code
+    # every branch is in one leaf: the bodies are in the tree
+    assert "if (switch4_ < 10) {" in code and "switch (switch4_)" not in code
+    assert "switch4_ == " not in code
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_same_output(run):
+    func_name = "test_same_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    letters = "ΑΑΓΒ-ΓΓ-Β----ΔΔΔ"
+    expected = "".join(letter + "\n" for letter in letters) + "90232 8233\n"
+    for opt_level in (0, 2):
+        for ir in ("ast", "cfg"):
+            assert run(CODE, opt_level, ir=ir) == expected
+    log(f"End", tags=["pytest"])
+
+
+def test_if_chain(parse):
+    func_name = "test_if_chain"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CHAIN)
+    TreeAnalyzer(1).analyze_types_tree(program, error_stack)
+    assignment, switch, chain = program.body[-2].body.body
+    # every condition tests Κ: an ΕΠΙΛΕΞΕ with the same branches
+    assert isinstance(switch, Switch) and switch.expr == Variable("gr_K", None, switch.expr.symbol_id)
+    assert [branch.condition for branch in switch.branches] == [
+        [Number("1"), Number("3")],
+        [BinaryOperation(Number("3"), "PERIOD", Number("5"))],
+        [UnaryOperator("GT", Number("9"))],
+        [Number("0")],
+    ]
+    assert switch.else_branch is not None
+    # Ι = 2 compares another variable
+    assert isinstance(chain, If)
+    log(f"End", tags=["pytest"])
+
+
+@requires_gxx
+def test_if_chain_output(run):
+    func_name = "test_if_chain_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for opt_level in (0, 1, 2):
+        for ir in ("ast", "cfg"):
+            assert run(CHAIN, opt_level, ir=ir) == "123466 3313\n"
+    log(f"End", tags=["pytest"])
@@ -0,0 +1,106 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import walk, Variable, ArrayIndex, VariableAssignement
+from glwssa_compiler.data import UndefinedVariable
+from glwssa_compiler import symbol_table as st
+
+logs_dir = "tests/levels_test/SymbolTable_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    Ν = 10
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, i, Π[Ν]
+ΑΡΧΗ
+    ΓΙΑ i ΑΠΟ 1 ΜΕΧΡΙ Ν
+        Π[i] <- i
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    Α <- ΔΙΠΛΟ(Π[2])
+    ΚΑΛΕΣΕ ΑΛΛΑΞΕ(Α, i)
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΣΥΝΑΡΤΗΣΗ ΔΙΠΛΟ(Α): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α
+ΑΡΧΗ
+    ΔΙΠΛΟ <- 2*Α
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΑΛΛΑΞΕ(Κ, Λ)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Κ, Λ, Τ
+ΑΡΧΗ
+    Τ <- Κ
+    Κ <- Λ
+    Λ <- Τ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+"""
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_every_reference_is_resolved(parse):
+    func_name = "test_every_reference_is_resolved"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE)
+    table = build_symbol_table(program, error_stack)
+
+    assert error_stack.errors_stack == []
+    for node in walk(program):
+        if isinstance(node, (Variable, ArrayIndex)):
+            assert node.symbol_id is not None, node
+            assert table[node.symbol_id].name == node.name
+        if isinstance(node, VariableAssignement):
+            assert table[node.target_id].name == node.target
+    log(f"End", tags=["pytest"])
+
+
+def test_ids_are_dense_and_scopes_are_separate(parse):
+    func_name = "test_ids_are_dense_and_scopes_are_separate"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE)
+    table = build_symbol_table(program, error_stack)
+
+    assert [s.id for s in table.symbols] == list(range(len(table)))
+
+    main_a = table.lookup(table.scope_of(program), "gr_A")
+    func_a = table.lookup(table.scope_of(program.functions[0]), "gr_A")
+    assert main_a.id != func_a.id
+    assert main_a.kind == st.VARIABLE
+    assert func_a.kind == st.PARAMETER and func_a.param_index == 0
+
+    assert table.lookup(table.scope_of(program), "gr_N").kind == st.CONSTANT
+    assert table.lookup(table.scope_of(program.functions[0]), "gr_DIPLO").kind == st.RESULT
+    assert table.lookup(table.scope_of(program), "gr_DIPLO").kind == st.FUNCTION
+    log(f"End", tags=["pytest"])
+
+
+def test_procedure_params(parse):
+    func_name = "test_procedure_params"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(CODE)
+    table = build_symbol_table(program, error_stack)
+
+    scope = table.scope_of(program.procedures[0])
+    assert [table[i].name for i in scope.params] == ["gr_K", "gr_L"]
+    assert table.lookup(scope, "gr_T").kind == st.VARIABLE
+    log(f"End", tags=["pytest"])
+
+
+def test_undefined_variable(parse):
+    func_name = "test_undefined_variable"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, error_stack = parse(
+        "ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ\n"
+        "ΜΕΤΑΒΛΗΤΕΣ\n"
+        "    ΑΚΕΡΑΙΕΣ: Α\n"
+        "ΑΡΧΗ\n"
+        "    Α <- Β + 1\n"
+        "ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ\n"
+    )
+    build_symbol_table(program, error_stack)
+
+    assert error_stack.errors_stack == [UndefinedVariable("gr_B", "gr_TEST")]
+    log(f"End", tags=["pytest"])
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import threading
+
+import pytest
+
+from glwssa_compiler import *
+
+from conftest import requires_gxx, parse_source
+
+logs_dir = "tests/levels_test/Toolchain_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΣΩΛΗΝΑΣ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 10
+        Σ <- Σ + Ι * Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΓΡΑΨΕ Σ
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+"""
+
+
+def writer_of(code: str):
+    program, error_stack = parse_source(code)
+    analyzer = TreeAnalyzer(0)
+    analyzer.analyze_types_tree(program, error_stack)
+    return lambda stream: TranspilerBackend_cpp().write_tree(program, analyzer.manager, stream)
+
+# ________________________________________________ TESTS ________________________________________________
+
+@requires_gxx
+def test_compile_piped(tmp_path):
+    func_name = "test_compile_piped"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    executable = str(tmp_path / "program.out")
+    compile_piped(writer_of(CODE), executable)
+    assert os.popen(executable).read() == "385\n"
+    assert os.stat(executable).st_mode & 0o111
+    # no .cpp and no temporary file is left next to it
+    assert os.listdir(tmp_path) == ["program.out"]
+
+
+@requires_gxx
+def test_concurrent_compiles(tmp_path):
+    func_name = "test_concurrent_compiles"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    executable = str(tmp_path / "program.out")
+    write = writer_of(CODE)
+    threads = [threading.Thread(target=compile_piped, args=(write, executable)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert os.popen(executable).read() == "385\n"
+    assert os.listdir(tmp_path) == ["program.out"]
+
+
+@requires_gxx
+def test_failed_compile(tmp_path):
+    func_name = "test_failed_compile"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    executable = str(tmp_path / "program.out")
+    with pytest.raises(subprocess.CalledProcessError):
+        compile_piped(lambda stream: stream.write("int main() { return x; }\n"), executable)
+    assert os.listdir(tmp_path) == []
+
+
+@requires_gxx
+def test_probe_toolchain(tmp_path):
+    func_name = "test_probe_toolchain"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    toolchain = probe_toolchain(str(tmp_path), ["not-a-compiler++", "g++"])
+    assert toolchain.compiler == "g++" and toolchain.version and not toolchain.clang
+    cached = [name for name in os.listdir(tmp_path) if name.startswith("toolchain-")]
+    assert len(cached) == 1
+    assert probe_toolchain(str(tmp_path), ["g++"]) == toolchain
+    with pytest.raises(FileNotFoundError):
+        probe_toolchain(str(tmp_path), ["not-a-compiler++"])
+
+
+def test_profile_flags():
+    func_name = "test_profile_flags"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    toolchain = Toolchain("g++", "g++ 12", clang=False, native=True, lto=True, pipe=True)
+    assert profile_flags(toolchain) == ["-O0", "-pipe"]
+    assert profile_flags(toolchain, "release") == ["-O2", "-pipe"]
+    assert profile_flags(toolchain, "release-native") == ["-O3", "-march=native", "-pipe"]
+    assert profile_flags(toolchain, "release-native", units=True) == ["-O3", "-march=native", "-flto", "-pipe"]
+    # a compiler without them just does not get them
+    bare = Toolchain("c++", "c++ 1", clang=False, native=False, lto=False, pipe=False)
+    assert profile_flags(bare, "release-native", units=True) == ["-O3"]
+    assert set(PROFILES) == {"fast-compile", "debug", "release", "release-native"}
+
+
+@requires_gxx
+def test_profiles_output(tmp_path):
+    func_name = "test_profiles_output"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    toolchain = probe_toolchain(str(tmp_path), ["g++"])
+    for profile in PROFILES:
+        executable = str(tmp_path / f"{profile}.out")
+        compile_piped(writer_of(CODE), executable, toolchain.compiler, profile_flags(toolchain, profile))
+        assert os.popen(executable).read() == "385\n"
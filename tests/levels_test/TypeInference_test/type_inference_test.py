@@ -0,0 +1,102 @@
+from glwssa_compiler import *
+from glwssa_compiler.ast_nodes import *
+from glwssa_compiler.data import WrongType, WrongArgumentCount
+from glwssa_compiler.type_inference import TypeTable
+
+logs_dir = "tests/levels_test/TypeInference_test/logs/"
+
+HEADER = """ΠΡΟΓΡΑΜΜΑ ΤΕΣΤ
+ΣΤΑΘΕΡΕΣ
+    π = 3.14
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Α, Β, Π[10]
+    ΠΡΑΓΜΑΤΙΚΕΣ: Χ
+    ΛΟΓΙΚΕΣ: Λ
+    ΧΑΡΑΚΤΗΡΕΣ: Ο
+ΑΡΧΗ
+"""
+
+
+def check(parse, body: str, tail: str = ""):
+    program, error_stack = parse(HEADER + body + "ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ\n" + tail)
+    table = infer_types(program, build_symbol_table(program, error_stack), error_stack)
+    return program, table, error_stack.errors_stack
+
+
+def statements(program):
+    return [n for n in program.body if not isinstance(n, (ProgramName, VariableDeclaration, ConstantDeclaration))]
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_expression_types(parse):
+    func_name = "test_expression_types"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, table, errors = check(parse,
+        "    Α <- Β DIV 2 + Π[Α] MOD 3\n"
+        "    Χ <- Α / 2\n"
+        "    Χ <- π * Α ^ 2\n"
+        "    Λ <- Α > 1 ΚΑΙ ΟΧΙ Λ\n"
+    )
+    assert errors == []
+    types = [table.type_of(s.expr) for s in statements(program)]
+    assert types == [IntType, RealType, RealType, BoolType]
+    log(f"End", tags=["pytest"])
+
+
+def test_each_node_is_typed_once(parse):
+    func_name = "test_each_node_is_typed_once"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, table, errors = check(parse, "    Α <- Α + 1\n")
+    calls = []
+    shared = BinaryOperation(Variable("gr_A", None, 0), "MUL", Number("2"))
+    tree = BinaryOperation(shared, "PLUS", shared)
+
+    method = table._dispatch[BinaryOperation]
+    def counting(node):
+        calls.append(node)
+        return method(node)
+    table._dispatch[BinaryOperation] = counting
+
+    table.type_of(tree)
+    table.type_of(tree)
+    assert len(calls) == 2 # tree and shared, once each
+    log(f"End", tags=["pytest"])
+
+
+def test_wrong_types_are_reported(parse):
+    func_name = "test_wrong_types_are_reported"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, table, errors = check(parse,
+        "    Α <- Χ\n"
+        "    ΑΝ Α ΤΟΤΕ\n"
+        "        Ο <- \"ΝΑΙ\"\n"
+        "    ΤΕΛΟΣ_ΑΝ\n"
+        "    Α <- Χ MOD 2\n"
+    )
+    assert len(errors) == 3
+    assert all(isinstance(e, WrongType) for e in errors)
+    assert [e.got for e in errors] == ["ΠΡΑΓΜΑΤΙΚΗ", "ΑΚΕΡΑΙΑ", "ΠΡΑΓΜΑΤΙΚΗ"]
+    log(f"End", tags=["pytest"])
+
+
+def test_function_calls(parse):
+    func_name = "test_function_calls"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    program, table, errors = check(parse,
+        "    Α <- ΔΙΠΛΟ(Α)\n"
+        "    Α <- ΔΙΠΛΟ(Α, Β)\n"
+        "    Α <- Α_Μ(Χ)\n",
+        "ΣΥΝΑΡΤΗΣΗ ΔΙΠΛΟ(Κ): ΑΚΕΡΑΙΑ\n"
+        "ΜΕΤΑΒΛΗΤΕΣ\n"
+        "    ΑΚΕΡΑΙΕΣ: Κ\n"
+        "ΑΡΧΗ\n"
+        "    ΔΙΠΛΟ <- 2 * Κ\n"
+        "ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ\n"
+    )
+    assert errors == [WrongArgumentCount("gr_DIPLO", 1, 2, "gr_TEST")]
+    assert [table.type_of(s.expr) for s in statements(program)] == [IntType, IntType, IntType]
+    log(f"End", tags=["pytest"])
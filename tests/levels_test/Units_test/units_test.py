@@ -0,0 +1,84 @@
+import os
+
+from glwssa_compiler import *
+
+from conftest import requires_gxx, parse_source
+
+logs_dir = "tests/levels_test/Units_test/logs/"
+
+CODE = """ΠΡΟΓΡΑΜΜΑ ΜΟΝΑΔΕΣ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ, Π[5]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 5
+        Π[Ι] <- Ι
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΚΑΛΕΣΕ ΔΙΠΛΑΣΙΑΣΕ(Π)
+    Σ <- ΑΘΡΟΙΣΜΑ(Π)
+    ΓΡΑΨΕ Σ, Π[5]
+ΤΕΛΟΣ_ΠΡΟΓΡΑΜΜΑΤΟΣ
+
+ΔΙΑΔΙΚΑΣΙΑ ΔΙΠΛΑΣΙΑΣΕ(Α)
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Α[5]
+ΑΡΧΗ
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 5
+        Α[Ι] <- 2 * Α[Ι]
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+ΤΕΛΟΣ_ΔΙΑΔΙΚΑΣΙΑΣ
+
+ΣΥΝΑΡΤΗΣΗ ΑΘΡΟΙΣΜΑ(Α): ΑΚΕΡΑΙΑ
+ΜΕΤΑΒΛΗΤΕΣ
+    ΑΚΕΡΑΙΕΣ: Ι, Σ, Α[5]
+ΑΡΧΗ
+    Σ <- 0
+    ΓΙΑ Ι ΑΠΟ 1 ΜΕΧΡΙ 5
+        Σ <- Σ + Α[Ι]
+    ΤΕΛΟΣ_ΕΠΑΝΑΛΗΨΗΣ
+    ΑΘΡΟΙΣΜΑ <- Σ
+ΤΕΛΟΣ_ΣΥΝΑΡΤΗΣΗΣ
+"""
+
+
+def units_of(code: str, runtime: str = "inline", ir: str = "ast") -> dict:
+    program, error_stack = parse_source(code)
+    analyzer = TreeAnalyzer(0)
+    analyzer.analyze_types_tree(program, error_stack)
+    return TranspilerBackend_cpp().translate_units(program, analyzer.manager, ir=ir, runtime=runtime)
+
+
+def build(tmp_path, code: str, ir: str = "ast"):
+    units = units_of(code, ir=ir)
+    directory, executable = str(tmp_path / "units"), str(tmp_path / "program.out")
+    write_units(units, directory)
+    compiled = compile_units(units, directory, executable, BuildCache(str(tmp_path / "cache")))
+    return compiled, os.popen(executable).read()
+
+# ________________________________________________ TESTS ________________________________________________
+
+def test_units():
+    func_name = "test_units"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    units = units_of(CODE)
+    assert sorted(units) == ["glwssa_program.hpp", "glwssa_runtime.hpp", "gr_ATHROISMA.cpp", "gr_DIPLASIASE.cpp", "main.cpp"]
+    assert units["glwssa_runtime.hpp"] == runtime_code("inline")
+    assert "void gr_DIPLASIASE(glwssa_array<int64_t, 1>& gr_A);" in units["glwssa_program.hpp"]
+    for name in ("main.cpp", "gr_DIPLASIASE.cpp", "gr_ATHROISMA.cpp"):
+        assert units[name].startswith('#include "glwssa_runtime.hpp"\n#include "glwssa_program.hpp"\n')
+    assert "int main() {" in units["main.cpp"] and "gr_DIPLASIASE(glwssa" not in units["main.cpp"]
+    # with a precompiled runtime the compiler finds the header with -I
+    assert "glwssa_runtime.hpp" not in units_of(CODE, runtime="include")
+
+
+@requires_gxx
+def test_rebuild(tmp_path):
+    func_name = "test_rebuild"
+    update_path(logs_dir, func_name + ".log")
+    log(f"Start of '{func_name}'", tags=["pytest"])
+    for ir in ("ast", "cfg"):
+        assert build(tmp_path / ir, CODE, ir) == (["main.cpp", "gr_DIPLASIASE.cpp", "gr_ATHROISMA.cpp"], "30 10\n")
+        # nothing changed: every object is in the cache
+        assert build(tmp_path / ir, CODE, ir) == ([], "30 10\n")
+        # the body of one procedure changed, its signature did not
+        assert build(tmp_path / ir, CODE.replace("2 * Α[Ι]", "3 * Α[Ι]"), ir) == (["gr_DIPLASIASE.cpp"], "45 15\n")
@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from glwssa_compiler import *
+
+
+def parse_source(code: str):
+    """
+    Lexes and parses the code like main.py does. Returns the program tree and the error stack.
+    """
+    error_stack = ErrorStack(code.splitlines())
+    lexer = Lexer(code, error_stack)
+    tokens = lexer.tokenize_with_lines()
+    program, _ = ParserAST(tokens, lexer.token_type, error_stack).parse()
+    return program, error_stack
+
+
+def transpile_source(code: str, opt_level: int = 0, ir: str = "ast", bounds_checks: str = "on",
+                     narrow_ints: bool = True, zero_init: bool = False) -> str:
+    """
+    The C++ code of the program, after the passes of the -O level.
+    """
+    program, error_stack = parse_source(code)
+    analyzer = TreeAnalyzer(opt_level)
+    analyzer.analyze_types_tree(program, error_stack)
+    assert error_stack.errors_stack == []
+    return TranspilerBackend_cpp().translate_tree(program, analyzer.manager, ir, bounds_checks, narrow_ints, zero_init)
+
+
+def run_source(code: str, opt_level: int = 0, stdin: str = "", ir: str = "ast", bounds_checks: str = "on",
+               narrow_ints: bool = True, zero_init: bool = False) -> str:
+    """
+    Transpiles, compiles with g++ and runs the program. Returns what it wrote.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "program.cpp")
+        executable = os.path.join(directory, "program.out")
+        with open(source, "w") as file:
+            file.write(transpile_source(code, opt_level, ir, bounds_checks, narrow_ints, zero_init))
+        subprocess.run(["g++", source, "-o", executable], check=True)
+        return subprocess.run([executable], input=stdin, capture_output=True, text=True, check=True).stdout
+
+
+requires_gxx = pytest.mark.skipif(shutil.which("g++") is None, reason="g++ is needed to run the generated code")
+
+
+@pytest.fixture
+def parse():
+    return parse_source
+
+
+@pytest.fixture
+def run():
+    return run_source